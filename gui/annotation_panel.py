@@ -130,7 +130,8 @@ class AnnotationPanel:
         if messagebox.askyesno("Etiket Sil", f"'{label}' etiketini silmek istediğinize emin misiniz?"):
             # Etiket listesinden kaldır
             if label in self.main_window.labels:
-                self.main_window.labels.remove(label)
+                # Kutuların sınıf ID'leri de güncellenir
+                self.main_window.remove_label(label)
                 
                 # Etiket listesini güncelle
                 self.update_label_list(self.main_window.labels)
@@ -152,8 +153,8 @@ class AnnotationPanel:
                         "labels": self.main_window.labels,
                         "is_image_set": self.main_window.video_path is None
                     }
-                    from utils.file_utils import save_session_info
-                    save_session_info(session_info, self.main_window.output_dir, self.main_window.session_file)
+                    # Kuyruktaki eski oturum bilgisi silinen etiketi geri getirmesin
+                    self.main_window.save_session(session_info, self.main_window.output_dir)
     
     def _on_frame_configure(self, event):
         """İç frame boyutu değiştiğinde scrollbar'ı güncelle"""
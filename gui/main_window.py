@@ -1,21 +1,35 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, simpledialog, messagebox
 import os
-import cv2
-import numpy as np
-from PIL import Image, ImageTk
+import copy
+import time
+import queue
+import threading
 import json
 
 from gui.menu_bar import MenuBar
 from gui.settings_panel import SettingsPanel
 from gui.annotation_panel import AnnotationPanel
+from gui.progress_panel import ProgressPanel
 from utils.file_utils import (create_output_dirs, save_session_info, load_session_info,
                              extract_frames_from_video, load_frames_from_dir,
-                             save_annotations, load_annotations)
-from utils.image_utils import (resize_frame, create_photo_image, draw_grid,
+                             save_annotations, load_annotations, get_label_path,
+                             format_yolo_rows, write_file_atomic)
+from utils.image_utils import (Viewport, render_view, create_photo_image, draw_grid,
                               canvas_to_image_coords, image_to_canvas_coords)
-from utils.annotation_utils import (find_box_at_position, draw_boxes,
-                                   move_box, resize_box)
+from utils.annotation_utils import find_box_at_position, draw_boxes
+from utils.frame_store import FrameStore, VideoFrameStore
+from utils.image_import import import_images
+from utils.background_writer import BackgroundWriter
+from utils.box_set import BoxSet
+from utils.label_index import LabelIndex
+from utils.manifest import DatasetManifest, open_manifest
+from utils.raw_cache import build_raw_cache, open_raw_cache, remove_raw_cache
+from utils.video_utils import (get_keyframe_index, parse_frame_spec, extract_frames_sparse,
+                               open_video_frames, load_video_frames, remove_video_index)
+
+# Kaydedilmemiş değişiklik göstergesinin güncellenme aralığı (ms)
+UNSAVED_POLL_MS = 250
 
 class MainWindow:
     def __init__(self, root):
@@ -29,11 +43,19 @@ class MainWindow:
         # Uygulama durumu
         self.video_path = None
         self.output_dir = None
-        self.frames = []
+        self.frames = FrameStore()
+        self.manifest = None  # Disk üzerindeki frameler için veri seti manifesti
+        self.label_index = None  # Tüm etiket dosyalarının bellek içi indeksi
+        self.saved_box_hashes = {}  # Frame yolu -> diske en son yazılan kutuların özeti
+        self.label_write_stats = {"written": 0, "skipped": 0}
+        self.file_writer = BackgroundWriter()  # Etiket ve oturum dosyalarını arka planda yazar
+        self.label_write_failures = queue.Queue()  # Yazılamayan (frame yolu, özet); Tk iş parçacığında işlenir
+        self.unsaved_job = None
         self.current_frame_idx = 0
         self.labels = []
-        self.current_boxes = []
+        self.current_boxes = BoxSet(self.labels)  # Mevcut frame'in kutuları
         self.drawing = False
+        self.temp_box_id = None  # Çizim sırasında sürüklenen geçici kutunun canvas öğesi
         self.moving = False
         self.selected_box_idx = -1
         self.start_x, self.start_y = 0, 0
@@ -51,9 +73,28 @@ class MainWindow:
         
         # Yakınlaştırma ayarları
         self.zoom_factor = 1.0
+        
+        # Kaydırma: canvas ortasına gelen görüntü noktası (None ise görüntünün ortası)
+        self.view_center = None
+        self.pan_start = None
+        
+        # Canvas'taki görüntü katmanının anahtarı (frame, canvas boyutu, zoom, kaydırma)
+        self._view_key = None
+        self._shown_pyramid = (None, None)  # (frame yolu, ekrandaki piramit)
         self.max_zoom = 5.0
         self.min_zoom = 0.5
         
+        # Arka plan frame çıkarma durumu
+        self.extraction_thread = None
+        self.extraction_queue = None
+        self.extraction_cancel = None
+        self.extraction_poll_job = None
+        self.extraction_poll_interval = 100  # Milisaniye
+        self.extraction_start_time = 0.0
+        self.extraction_collect = True  # False ise frameler depoya eklenmez (dışa aktarma, önbellek)
+        self.extraction_written = 0
+        self.extraction_on_done = None
+        
         # Otomatik kaydetme ayarları
         self.autosave_enabled = False
         self.autosave_interval = 60000  # Milisaniye cinsinden (60 saniye)
@@ -141,9 +182,18 @@ class MainWindow:
         self.canvas = tk.Canvas(self.canvas_frame, bg="#1e1e1e")
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
-        # Durum çubuğu
-        self.status_bar = ttk.Label(self.root, text="Hazır", relief=tk.SUNKEN, anchor=tk.W)
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        # Durum çubuğu ve kaydedilmemiş değişiklik göstergesi
+        self.status_frame = ttk.Frame(self.root)
+        self.status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        self.status_bar = ttk.Label(self.status_frame, text="Hazır", relief=tk.SUNKEN, anchor=tk.W)
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.unsaved_label = ttk.Label(self.status_frame, text="", relief=tk.SUNKEN, foreground="#d08000")
+        self.unsaved_label.pack(side=tk.RIGHT)
+        
+        # Arka plan işlemleri için ilerleme paneli (sadece iş sürerken görünür)
+        self.progress_panel = ProgressPanel(self.root, self)
         
         # Canvas olayları
         self.setup_canvas_events()
@@ -270,10 +320,10 @@ class MainWindow:
         self.canvas.bind("<Button-4>", self.on_mouse_wheel)  # Linux yukarı kaydırma
         self.canvas.bind("<Button-5>", self.on_mouse_wheel)  # Linux aşağı kaydırma
         
-        # Shift ile taşıma
-        self.root.bind("<Shift-ButtonPress-1>", self.on_shift_mouse_down)
-        self.root.bind("<Shift-B1-Motion>", self.on_shift_mouse_move)
-        self.root.bind("<Shift-ButtonRelease-1>", self.on_shift_mouse_up)
+        # Shift ile sürükleyerek görüntüyü kaydırma
+        self.canvas.bind("<Shift-ButtonPress-1>", self.on_shift_mouse_down)
+        self.canvas.bind("<Shift-B1-Motion>", self.on_shift_mouse_move)
+        self.canvas.bind("<Shift-ButtonRelease-1>", self.on_shift_mouse_up)
     
     def setup_keyboard_shortcuts(self):
         """Klavye kısayollarını ayarla"""
@@ -334,8 +384,7 @@ class MainWindow:
         
         # Etiketleri hemen kaydet
         if self.frames:
-            frame_data, frame_path = self.frames[self.current_frame_idx]
-            save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir, silent=True)
+            save_result = self.save_current_annotations()
             if save_result:
                 self.status_bar.config(text="Son işlem geri alındı.")
             else:
@@ -364,8 +413,7 @@ class MainWindow:
         
         # Etiketleri hemen kaydet
         if self.frames:
-            frame_data, frame_path = self.frames[self.current_frame_idx]
-            save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir, silent=True)
+            save_result = self.save_current_annotations()
             if save_result:
                 self.status_bar.config(text="Son işlem yeniden yapıldı.")
             else:
@@ -399,6 +447,7 @@ class MainWindow:
     def on_zoom_reset(self, event=None):
         """Yakınlaştırmayı sıfırla"""
         self.zoom_factor = 1.0
+        self.view_center = None
         self.show_current_frame()
         self.status_bar.config(text="Yakınlaştırma sıfırlandı")
     
@@ -669,13 +718,15 @@ class MainWindow:
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
         
-        # Mevcut frame'i al
-        frame_data, frame_path = self.frames[self.current_frame_idx]
-        img_h, img_w = frame_data.shape[:2]
+        # Mevcut frame'in boyutlarını al
+        frame_size = self.frames.get_size(self.current_frame_idx)
+        if frame_size is None:
+            return
+        img_h, img_w = frame_size
         
         # Canvas koordinatlarını görüntü koordinatlarına dönüştür
         img_x, img_y = canvas_to_image_coords(event.x, event.y, img_w, img_h, 
-                                             canvas_width, canvas_height, self.zoom_factor)
+                                             canvas_width, canvas_height, self.zoom_factor, self.view_center)
         
         # Ctrl tuşuna basılıysa, çoklu seçim modunda
         if event.state & 0x4:  # Ctrl tuşu
@@ -731,6 +782,31 @@ class MainWindow:
             
             # Seçili kutuları temizle
             self.selected_box_indices = []
+            
+            # Seçim/hover değişikliğini bir kez çiz, sürükleme boyunca sadece geçici kutu güncellenir
+            self.show_current_frame()
+            self.update_temp_box(img_x, img_y, img_w, img_h, canvas_width, canvas_height)
+    
+    def update_temp_box(self, img_x, img_y, img_w, img_h, canvas_width, canvas_height):
+        """Çizim sırasındaki geçici kutuyu başlangıç noktasından verilen noktaya taşı"""
+        x1_canvas, y1_canvas = image_to_canvas_coords(self.start_x, self.start_y, img_w, img_h, 
+                                                    canvas_width, canvas_height, self.zoom_factor, self.view_center)
+        x2_canvas, y2_canvas = image_to_canvas_coords(img_x, img_y, img_w, img_h, 
+                                                    canvas_width, canvas_height, self.zoom_factor, self.view_center)
+        
+        # Öğe yoksa (veya canvas yeniden çizildiyse) oluştur, varsa sadece koordinatlarını güncelle
+        if self.temp_box_id is None or not self.canvas.type(self.temp_box_id):
+            self.temp_box_id = self.canvas.create_rectangle(
+                x1_canvas, y1_canvas, x2_canvas, y2_canvas,
+                outline="yellow", width=2, tags="temp_box"
+            )
+        else:
+            self.canvas.coords(self.temp_box_id, x1_canvas, y1_canvas, x2_canvas, y2_canvas)
+    
+    def clear_temp_box(self):
+        """Geçici çizim kutusunu kaldır"""
+        self.canvas.delete("temp_box")
+        self.temp_box_id = None
     
     def on_mouse_move(self, event):
         """Fare hareketi olayı"""
@@ -741,13 +817,15 @@ class MainWindow:
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
         
-        # Mevcut frame'i al
-        frame_data, frame_path = self.frames[self.current_frame_idx]
-        img_h, img_w = frame_data.shape[:2]
+        # Mevcut frame'in boyutlarını al
+        frame_size = self.frames.get_size(self.current_frame_idx)
+        if frame_size is None:
+            return
+        img_h, img_w = frame_size
         
         # Canvas koordinatlarını görüntü koordinatlarına dönüştür
         img_x, img_y = canvas_to_image_coords(event.x, event.y, img_w, img_h, 
-                                             canvas_width, canvas_height, self.zoom_factor)
+                                             canvas_width, canvas_height, self.zoom_factor, self.view_center)
         
         # Fare bir kutunun üzerinde mi kontrol et
         if not self.drawing:
@@ -767,20 +845,8 @@ class MainWindow:
         
         # Çizim modunda
         if self.drawing:
-            # Geçici kutuyu çiz
-            self.show_current_frame()  # Önce mevcut frame'i temizle
-            
-            # Görüntü koordinatlarını canvas koordinatlarına dönüştür
-            x1_canvas, y1_canvas = image_to_canvas_coords(self.start_x, self.start_y, img_w, img_h, 
-                                                        canvas_width, canvas_height, self.zoom_factor)
-            x2_canvas, y2_canvas = image_to_canvas_coords(img_x, img_y, img_w, img_h, 
-                                                        canvas_width, canvas_height, self.zoom_factor)
-            
-            # Geçici kutuyu çiz
-            self.canvas.create_rectangle(
-                x1_canvas, y1_canvas, x2_canvas, y2_canvas,
-                outline="yellow", width=2, tags="temp_box"
-            )
+            # Sadece geçici kutunun koordinatlarını güncelle (frame yeniden çizilmez)
+            self.update_temp_box(img_x, img_y, img_w, img_h, canvas_width, canvas_height)
             
             # Durum çubuğunu güncelle
             width = abs(img_x - self.start_x)
@@ -793,18 +859,21 @@ class MainWindow:
             return
         
         self.drawing = False
+        self.clear_temp_box()
         
         # Canvas boyutlarını al
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
         
-        # Mevcut frame'i al
-        frame_data, frame_path = self.frames[self.current_frame_idx]
-        img_h, img_w = frame_data.shape[:2]
+        # Mevcut frame'in boyutlarını al
+        frame_size = self.frames.get_size(self.current_frame_idx)
+        if frame_size is None:
+            return
+        img_h, img_w = frame_size
         
         # Canvas koordinatlarını görüntü koordinatlarına dönüştür
         img_x, img_y = canvas_to_image_coords(event.x, event.y, img_w, img_h, 
-                                             canvas_width, canvas_height, self.zoom_factor)
+                                             canvas_width, canvas_height, self.zoom_factor, self.view_center)
         
         # Kutu boyutlarını hesapla
         x1 = min(self.start_x, img_x)
@@ -838,14 +907,11 @@ class MainWindow:
                 self.show_current_frame()
                 return
         
-        # Yeni kutuyu ekle
-        new_box = (x1, y1, x2, y2, label)
-        self.current_boxes.append(new_box)
+        # İşlem geçmişine ekle (geri alma için, diziler kopyalanmaz)
+        self.action_history.append(("add", self.current_boxes.copy(), self.selected_box_indices.copy()))
         
-        # İşlem geçmişine ekle (geri alma için)
-        self.action_history.append(("add", 
-                                   [b for b in self.current_boxes if b != new_box], 
-                                   self.selected_box_indices.copy()))
+        # Yeni kutuyu ekle
+        self.current_boxes.append((x1, y1, x2, y2, label))
         
         # undone_actions listesini temizle (yeni bir işlem yapıldığında)
         if hasattr(self, 'undone_actions'):
@@ -864,8 +930,7 @@ class MainWindow:
         
         # Etiketleri hemen kaydet
         if self.frames:
-            frame_data, frame_path = self.frames[self.current_frame_idx]
-            save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir, silent=True)
+            save_result = self.save_current_annotations()
             if not save_result:
                 self.status_bar.config(text="Etiketler kaydedilemedi.")
     
@@ -880,8 +945,8 @@ class MainWindow:
         
         # Mevcut frame için etiketleri kaydet
         if self.current_boxes:
-            frame_data, frame_path = self.frames[self.current_frame_idx]
-            save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir)
+            frame_path = self.frames.get_path(self.current_frame_idx)
+            save_result = self.save_current_annotations()
             if not save_result:
                 print(f"Etiketler kaydedilemedi (önceki frame'e geçiş): {frame_path}")
             else:
@@ -903,11 +968,14 @@ class MainWindow:
                 "labels": self.labels,
                 "is_image_set": self.video_path is None
             }
-            save_session_info(session_info, self.output_dir, self.session_file)
+            self.save_session(session_info, self.output_dir)
             
             # Yeni frame'i göster
             self.show_current_frame()
             
+            # Geri yöndeki komşu frameleri arka planda hazırla
+            self.frames.prefetch(self.current_frame_idx, -1)
+            
             # Seçili kutuları temizle
             self.selected_box_indices = []
             
@@ -921,8 +989,8 @@ class MainWindow:
         
         # Mevcut frame için etiketleri kaydet
         if self.current_boxes:
-            frame_data, frame_path = self.frames[self.current_frame_idx]
-            save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir)
+            frame_path = self.frames.get_path(self.current_frame_idx)
+            save_result = self.save_current_annotations()
             if not save_result:
                 print(f"Etiketler kaydedilemedi (sonraki frame'e geçiş): {frame_path}")
             else:
@@ -944,30 +1012,49 @@ class MainWindow:
                 "labels": self.labels,
                 "is_image_set": self.video_path is None
             }
-            save_session_info(session_info, self.output_dir, self.session_file)
+            self.save_session(session_info, self.output_dir)
             
             # Yeni frame'i göster
             self.show_current_frame()
             
+            # İleri yöndeki komşu frameleri arka planda hazırla
+            self.frames.prefetch(self.current_frame_idx, 1)
+            
             # Seçili kutuları temizle
             self.selected_box_indices = []
             
             # İşlem geçmişini temizle (farklı frame'de geri alma yapılmamalı)
             self.action_history = []
     
+    def get_viewport(self):
+        """Mevcut frame için görünümü (ölçek, kaydırma) döndür"""
+        frame_size = self.frames.get_size(self.current_frame_idx) if self.frames else None
+        if frame_size is None:
+            return None
+        img_h, img_w = frame_size
+        return Viewport(img_w, img_h, self.canvas.winfo_width(), self.canvas.winfo_height(),
+                        self.zoom_factor, self.view_center)
+    
     def on_shift_mouse_down(self, event):
-        """Shift tuşuna basıldığında yapılacak işlemler"""
-        pass
+        """Shift ile sürüklemeye başlandığında görünümün başlangıç durumunu kaydet"""
+        viewport = self.get_viewport()
+        if viewport is None:
+            return
+        self.pan_start = (event.x, event.y, viewport)
     
     def on_shift_mouse_move(self, event):
-        """Shift tuşuna basılı tutularak fare hareketi"""
-        dx = event.x - self.start_x
-        dy = event.y - self.start_y
-        self.canvas.scan_dragto(dx, dy, gain=1)
+        """Shift tuşuna basılı tutularak sürükleme: yakınlaştırılmış görüntüyü kaydır"""
+        if self.pan_start is None:
+            return
+        start_x, start_y, viewport = self.pan_start
+        
+        # Merkez show_current_frame içinde kenarlara göre sınırlandırılır
+        self.view_center = viewport.panned(event.x - start_x, event.y - start_y)
+        self.show_current_frame()
     
     def on_shift_mouse_up(self, event):
-        """Shift tuşundan kalkıldığında yapılacak işlemler"""
-        pass
+        """Shift ile sürükleme bittiğinde"""
+        self.pan_start = None
     
     def on_mouse_wheel(self, event):
         """Fare tekerleği ile yakınlaştırma/uzaklaştırma"""
@@ -980,13 +1067,11 @@ class MainWindow:
     def on_mouse_hover(self, event):
         """Fare hareketi izleme"""
         # Fare imleci bir kutunun üzerinde ise, hover indeksini güncelle
-        x, y = event.x, event.y
-        for idx, (x1, y1, x2, y2, _) in enumerate(self.current_boxes):
-            if x1 <= x <= x2 and y1 <= y <= y2:
-                self.hover_box_idx = idx
-                break
-        else:
-            self.hover_box_idx = -1
+        viewport = self.get_viewport()
+        if viewport is None:
+            return
+        x, y = viewport.to_image(event.x, event.y)
+        self.hover_box_idx = find_box_at_position(x, y, self.current_boxes)
     
     def update_label_select_menu(self):
         """Sağ tık menüsündeki etiket seçim alt menüsünü güncelle"""
@@ -1015,8 +1100,8 @@ class MainWindow:
         
         # Mevcut frame için etiketleri kaydet
         if self.current_boxes:
-            frame_data, frame_path = self.frames[self.current_frame_idx]
-            save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir)
+            frame_path = self.frames.get_path(self.current_frame_idx)
+            save_result = self.save_current_annotations()
             if not save_result:
                 print(f"Etiketler kaydedilemedi (önceki sayfaya geçiş): {frame_path}")
             else:
@@ -1039,11 +1124,14 @@ class MainWindow:
                 "labels": self.labels,
                 "is_image_set": self.video_path is None
             }
-            save_session_info(session_info, self.output_dir, self.session_file)
+            self.save_session(session_info, self.output_dir)
             
             # Yeni frame'i göster
             self.show_current_frame()
             
+            # Geri yöndeki komşuları ve bir sayfa gerisini arka planda hazırla
+            self.frames.prefetch(self.current_frame_idx, -1, page_size)
+            
             # Seçili kutuları temizle
             self.selected_box_indices = []
             
@@ -1060,8 +1148,8 @@ class MainWindow:
         
         # Mevcut frame için etiketleri kaydet
         if self.current_boxes:
-            frame_data, frame_path = self.frames[self.current_frame_idx]
-            save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir)
+            frame_path = self.frames.get_path(self.current_frame_idx)
+            save_result = self.save_current_annotations()
             if not save_result:
                 print(f"Etiketler kaydedilemedi (sonraki sayfaya geçiş): {frame_path}")
             else:
@@ -1084,11 +1172,14 @@ class MainWindow:
                 "labels": self.labels,
                 "is_image_set": self.video_path is None
             }
-            save_session_info(session_info, self.output_dir, self.session_file)
+            self.save_session(session_info, self.output_dir)
             
             # Yeni frame'i göster
             self.show_current_frame()
             
+            # İleri yöndeki komşuları ve bir sayfa ilerisini arka planda hazırla
+            self.frames.prefetch(self.current_frame_idx, 1, page_size)
+            
             # Seçili kutuları temizle
             self.selected_box_indices = []
             
@@ -1099,7 +1190,7 @@ class MainWindow:
         """Fotoğraf dosyalarını yükle"""
         image_paths = filedialog.askopenfilenames(
             title="Fotoğraf Dosyalarını Seç",
-            filetypes=[("Görüntü Dosyaları", "*.jpg *.jpeg *.png *.bmp"), ("Tüm Dosyalar", "*.*")]
+            filetypes=[("Görüntü Dosyaları", "*.jpg *.jpeg *.png *.bmp *.tif *.tiff"), ("Tüm Dosyalar", "*.*")]
         )
         
         if not image_paths:
@@ -1122,66 +1213,10 @@ class MainWindow:
             messagebox.showerror("Hata", "Çıktı klasörleri oluşturulamadı.")
             return
         
-        # Frameleri temizle
-        self.frames = []
-        
-        # Fotoğrafları yükle ve frames klasörüne kopyala
-        for i, img_path in enumerate(image_paths):
-            try:
-                # Görüntüyü oku
-                img = cv2.imread(img_path)
-                if img is None:
-                    print(f"Görüntü okunamadı: {img_path}")
-                    continue
-                
-                # RGB'ye dönüştür
-                rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                
-                # Frame dosya adını oluştur
-                frame_filename = f"frame_{i:06d}.jpg"
-                frame_path = os.path.join(output_dir, "frames", frame_filename)
-                
-                # Görüntüyü kaydet
-                if not cv2.imwrite(frame_path, img):
-                    print(f"Görüntü kaydedilemedi: {frame_path}")
-                    continue
-                
-                # Frames listesine ekle
-                self.frames.append((rgb_img, frame_path))
-            except Exception as e:
-                print(f"Hata: {e}")
-        
-        if not self.frames:
-            messagebox.showerror("Hata", "Fotoğraflar yüklenemedi.")
-            return
-        
-        # İlk frame'i göster
-        self.current_frame_idx = 0
-        
-        # Son yüklenen frame'i sıfırla
-        if hasattr(self, '_last_loaded_frame'):
-            self._last_loaded_frame = None
-        
-        self.show_current_frame()
-        
-        # Frame bilgisini güncelle
-        self.annotation_panel.update_frame_info(self.current_frame_idx, len(self.frames))
-        
-        # Oturum bilgilerini kaydet
-        session_info = {
-            "video_path": None,
-            "output_dir": output_dir,
-            "current_frame_idx": 0,
-            "labels": self.labels,
-            "is_image_set": True
-        }
-        save_session_info(session_info, output_dir, self.session_file)
-        
-        # Kullanıcıya bilgi ver
-        messagebox.showinfo("Bilgi", f"{len(self.frames)} fotoğraf yüklendi.")
-        
-        # Durum çubuğunu güncelle
-        self.status_bar.config(text=f"Fotoğraflar yüklendi: {len(self.frames)} fotoğraf")
+        # JPEG'ler yeniden kodlanmadan, diğerleri dönüştürülerek arka planda aktarılır
+        self.start_background_extraction(
+            "Fotoğraflar içe aktarılıyor:",
+            lambda **callbacks: import_images(image_paths, output_dir, **callbacks))
     
     def load_video(self):
         """Video dosyasını yükle"""
@@ -1217,24 +1252,162 @@ class MainWindow:
         if not interval:
             return
         
-        # Frameleri çıkar
-        self.frames = extract_frames_from_video(video_path, output_dir, interval)
+        # Frameleri arka planda çıkar (ilk frame gelir gelmez etiketlemeye başlanabilir)
+        self.start_background_extraction(
+            "Frameler çıkarılıyor:",
+            lambda **callbacks: extract_frames_from_video(video_path, output_dir, interval,
+                                                          workers=os.cpu_count() or 1,
+                                                          **callbacks))
+    
+    def extract_frames(self):
+        """Video dosyasından frameleri çıkar"""
+        if not self.video_path or not self.output_dir:
+            messagebox.showerror("Hata", "Önce bir video dosyası yüklemelisiniz.")
+            return
         
-        if not self.frames:
-            messagebox.showerror("Hata", "Frameler çıkarılamadı.")
+        # Frame aralığını sor
+        interval = simpledialog.askinteger("Frame Aralığı", 
+                                          "Kaç frame'de bir çıkarılsın? (1-100):", 
+                                          minvalue=1, maxvalue=100, initialvalue=30)
+        if not interval:
+            return
+        
+        # Frameleri arka planda çıkar
+        video_path, output_dir = self.video_path, self.output_dir
+        self.start_background_extraction(
+            "Frameler çıkarılıyor:",
+            lambda **callbacks: extract_frames_from_video(video_path, output_dir, interval,
+                                                          workers=os.cpu_count() or 1,
+                                                          **callbacks))
+    
+    def extract_sample_frames(self):
+        """Belirli frameleri veya eşit aralıklı/rastgele örnekleri çıkar"""
+        if not self.video_path or not self.output_dir:
+            messagebox.showerror("Hata", "Önce bir video dosyası yüklemelisiniz.")
+            return
+        
+        # Frame sayısı, fps ve zaman damgaları kalıcı keyframe indeksinden alınır;
+        # indeks ilk seferde videonun taranmasını gerektirir, arka planda okunur
+        video_path, output_dir = self.video_path, self.output_dir
+        result = {}
+        
+        def read_info(**callbacks):
+            result["video_info"] = get_keyframe_index(video_path, output_dir)
+        
+        self.start_background_extraction(
+            "Video bilgileri okunuyor:", read_info, collect_frames=False,
+            on_done=lambda cancelled, _: self._ask_sample_frames(result.get("video_info"), cancelled))
+    
+    def _ask_sample_frames(self, video_info, cancelled):
+        """Video bilgileri okunduktan sonra çıkarılacak frameleri sor ve çıkarmayı başlat"""
+        if cancelled:
+            self.status_bar.config(text="Frame çıkarma iptal edildi.")
+            return
+        if not video_info:
+            messagebox.showerror("Hata", "Video bilgileri okunamadı.")
+            return
+        
+        # Frame numaraları veya zaman damgaları
+        spec = simpledialog.askstring("Frame Seçimi",
+                                      "Frame numaraları veya zamanlar (örn: 120, 45s, 1:30).\n"
+                                      "Boş bırakılırsa örnek sayısı sorulur:")
+        if spec is None:
+            return
+        
+        frame_indices = None
+        count = None
+        random_sample = False
+        
+        if spec.strip():
+            frame_indices = parse_frame_spec(spec, video_info["fps"], video_info["timestamps"])
+            if not frame_indices:
+                messagebox.showerror("Hata", "Geçerli bir frame numarası bulunamadı.")
+                return
+        else:
+            count = simpledialog.askinteger("Örnek Sayısı",
+                                            f"Kaç frame çıkarılsın? (1-{video_info['frame_count']}):",
+                                            minvalue=1, maxvalue=max(1, video_info["frame_count"]),
+                                            initialvalue=min(100, max(1, video_info["frame_count"])))
+            if not count:
+                return
+            random_sample = messagebox.askyesno("Örnekleme",
+                                                "Frameler rastgele seçilsin mi?\n(Hayır: eşit aralıklı)")
+        
+        # Frameleri arka planda çıkar
+        video_path, output_dir = self.video_path, self.output_dir
+        self.start_background_extraction(
+            "Örnek frameler çıkarılıyor:",
+            lambda **callbacks: extract_frames_sparse(video_path, output_dir,
+                                                      frame_indices=frame_indices, count=count,
+                                                      random_sample=random_sample, **callbacks))
+    
+    def load_video_direct(self):
+        """Videoyu frame çıkarmadan aç, frameler etiketlenirken videodan çözülür"""
+        video_path = filedialog.askopenfilename(
+            title="Video Dosyasını Seç",
+            filetypes=[("Video Dosyaları", "*.mp4 *.avi *.mov *.mkv"), ("Tüm Dosyalar", "*.*")]
+        )
+        
+        if not video_path:
             return
         
-        # İlk frame'i göster
+        # Çıktı klasörünü seç (etiketler ve video indeksi buraya yazılır)
+        output_dir = filedialog.askdirectory(title="Çıktı Klasörünü Seç")
+        if not output_dir:
+            return
+        
+        if not create_output_dirs(output_dir):
+            messagebox.showerror("Hata", "Çıktı klasörleri oluşturulamadı.")
+            return
+        
+        # Frame aralığını sor
+        interval = simpledialog.askinteger("Frame Aralığı", 
+                                          "Kaç frame'de bir etiketlensin? (1-1000):", 
+                                          minvalue=1, maxvalue=1000, initialvalue=30)
+        if not interval:
+            return
+        
+        # Keyframe indeksi ve seek ölçümü videonun okunmasını gerektirir, arka planda yapılır
+        result = {}
+        
+        def open_frames(**callbacks):
+            result["frames"] = open_video_frames(video_path, output_dir, interval)
+        
+        self.start_background_extraction(
+            "Video açılıyor:", open_frames, collect_frames=False,
+            on_done=lambda cancelled, _: self._finish_video_direct(result.get("frames"), cancelled,
+                                                                  video_path, output_dir))
+    
+    def _finish_video_direct(self, frames, cancelled, video_path, output_dir):
+        """Videodan doğrudan okuma deposu hazır olduğunda oturumu ona geçir"""
+        if cancelled:
+            if frames:
+                frames.close()
+            self.status_bar.config(text="Video açma iptal edildi.")
+            return
+        if not frames:
+            messagebox.showerror("Hata", "Video açılamadı.")
+            return
+        
+        # Değişkenleri ayarla
+        self.video_path = video_path
+        self.output_dir = output_dir
+        self.frames.close()
+        self.frames = frames
+        self.frames.set_raw_cache(open_raw_cache(frames, output_dir))
+        self.close_manifest()
+        self.open_label_index()
         self.current_frame_idx = 0
+        self.current_boxes = BoxSet(self.labels)
+        self.selected_box_indices = []
+        self.action_history = []
         
         # Son yüklenen frame'i sıfırla
         if hasattr(self, '_last_loaded_frame'):
             self._last_loaded_frame = None
         
         self.show_current_frame()
-        
-        # Frame bilgisini güncelle
-        self.annotation_panel.update_frame_info(self.current_frame_idx, len(self.frames))
+        self.frames.prefetch(self.current_frame_idx, 1)
         
         # Oturum bilgilerini kaydet
         session_info = {
@@ -1244,51 +1417,297 @@ class MainWindow:
             "labels": self.labels,
             "is_image_set": False
         }
-        save_session_info(session_info, output_dir, self.session_file)
-        
-        # Kullanıcıya bilgi ver
-        messagebox.showinfo("Bilgi", f"{len(self.frames)} frame çıkarıldı.")
+        self.save_session(session_info, output_dir)
         
         # Durum çubuğunu güncelle
-        self.status_bar.config(text=f"Video yüklendi: {len(self.frames)} frame")
+        self.status_bar.config(text=f"Video açıldı: {len(self.frames)} frame (diske çıkarılmadan)")
     
-    def extract_frames(self):
-        """Video dosyasından frameleri çıkar"""
-        if not self.video_path or not self.output_dir:
-            messagebox.showerror("Hata", "Önce bir video dosyası yüklemelisiniz.")
+    def export_frames(self):
+        """Videodan doğrudan etiketlenen frameleri JPEG olarak dışa aktar"""
+        if not isinstance(self.frames, VideoFrameStore):
+            messagebox.showerror("Hata", "Dışa aktarma sadece frame çıkarılmadan açılan videolar için kullanılabilir.")
             return
         
-        # Frame aralığını sor
-        interval = simpledialog.askinteger("Frame Aralığı", 
-                                          "Kaç frame'de bir çıkarılsın? (1-100):", 
-                                          minvalue=1, maxvalue=100, initialvalue=30)
-        if not interval:
+        # Mevcut frame'in etiketlerini kaydet (dosya varlığı kontrol edileceği için beklenir)
+        self.save_annotations(show_message=False)
+        self.file_writer.flush()
+        
+        # Varsayılan olarak sadece etiket dosyası olan frameler yazılır
+        only_labeled = messagebox.askyesno("Dışa Aktar",
+                                           "Sadece etiketlenmiş frameler dışa aktarılsın mı?\n(Hayır: tüm frameler)")
+        frames = self.frames
+        indices = None
+        if only_labeled:
+            indices = [i for i in range(len(frames))
+                       if os.path.exists(get_label_path(frames.get_path(i), self.output_dir))]
+            if not indices:
+                messagebox.showinfo("Bilgi", "Etiketlenmiş frame bulunamadı.")
+                return
+        
+        self.start_background_extraction(
+            "Frameler dışa aktarılıyor:",
+            lambda **callbacks: frames.export_frames(indices, **callbacks),
+            collect_frames=False, on_done=self._finish_export)
+    
+    def _finish_export(self, cancelled, written):
+        """Dışa aktarma bittiğinde kullanıcıyı bilgilendir"""
+        if cancelled:
+            self.status_bar.config(text=f"Dışa aktarma iptal edildi: {written} frame yazıldı")
+        else:
+            messagebox.showinfo("Bilgi", f"{written} frame dışa aktarıldı.")
+            self.status_bar.config(text=f"Frameler dışa aktarıldı: {written} frame")
+    
+    def build_raw_cache(self):
+        """Frameleri bir kez çözüp ham, bellek eşlemeli önbelleğe arka planda yaz"""
+        if not self.frames or not self.output_dir:
+            messagebox.showinfo("Bilgi", "Önce bir video veya fotoğraf seti yükleyin.")
+            return
+        
+        # Gerekli disk alanı frame boyutlarının okunmasını gerektirir; arka planda
+        # hesaplanır ve yer yetmezse önbellek oluşturulmaz
+        if not messagebox.askyesno("Ham Frame Önbelleği",
+                                   f"{len(self.frames)} frame çözülüp ham önbelleğe yazılacak "
+                                   f"(frame başına genişlik x yükseklik x 3 bayt). Devam edilsin mi?"):
             return
         
-        # Frameleri çıkar
-        self.frames = extract_frames_from_video(self.video_path, self.output_dir, interval)
+        # Eski önbellek yenisi oluşturulurken kullanılmaz (dosyası değiştirilecek)
+        self.cancel_extraction(wait=True)
+        self.frames.set_raw_cache(None)
+        frames = self.frames
+        output_dir = self.output_dir
         
-        if not self.frames:
-            messagebox.showerror("Hata", "Frameler çıkarılamadı.")
+        self.start_background_extraction(
+            "Ham frame önbelleği oluşturuluyor:",
+            lambda **callbacks: build_raw_cache(frames, output_dir, **callbacks),
+            collect_frames=False, on_done=self._finish_raw_cache)
+    
+    def _finish_raw_cache(self, cancelled, written):
+        """Ham önbellek oluşturulduğunda frame deposuna bağla"""
+        raw_cache = open_raw_cache(self.frames, self.output_dir)
+        self.frames.set_raw_cache(raw_cache)
+        if raw_cache is None:
+            messagebox.showerror("Hata", "Ham frame önbelleği oluşturulamadı.")
+        elif cancelled:
+            self.status_bar.config(text=f"Ham önbellek oluşturma iptal edildi: {written} frame önbellekte")
+        else:
+            self.status_bar.config(text=f"Ham frame önbelleği hazır: {written} frame "
+                                        f"({raw_cache.nbytes / 1e9:.1f} GB)")
+    
+    def delete_raw_cache(self):
+        """Ham frame önbelleğini sil"""
+        if not self.output_dir:
+            return
+        self.cancel_extraction(wait=True)
+        self.frames.set_raw_cache(None)
+        remove_raw_cache(self.output_dir)
+        self.status_bar.config(text="Ham frame önbelleği silindi")
+    
+    def start_background_extraction(self, title, extract_func, collect_frames=True, on_done=None):
+        """Frame çıkarmayı arka planda başlat, frameleri geldikçe göster
+
+        collect_frames False ise (dışa aktarma, önbellek oluşturma) mevcut
+        frame deposu korunur, yazılan frameler sadece sayılır ve iş bitince
+        on_done(iptal_edildi, yazılan) çağrılır.
+        """
+        # Devam eden bir çıkarma varsa durdur
+        self.cancel_extraction(wait=True)
+        
+        self.extraction_collect = collect_frames
+        self.extraction_written = 0
+        self.extraction_on_done = on_done
+        if collect_frames:
+            # Frameler diske çıkarılıyor, videodan doğrudan okuma indeksi ve ham önbellek geçersiz
+            remove_video_index(self.output_dir)
+            remove_raw_cache(self.output_dir)
+            
+            # Manifest yazılan framelerle sıfırdan oluşturulur
+            self.close_manifest()
+            self.manifest = open_manifest(self.output_dir)
+            if self.manifest:
+                self.manifest.clear()
+            
+            # Boş bir frame deposu ile başla, frameler yazıldıkça eklenecek
+            self.frames.close()
+            self.frames = FrameStore()
+            self.close_label_index()
+            self.current_frame_idx = 0
+            self.current_boxes = BoxSet(self.labels)
+            self.selected_box_indices = []
+            self.action_history = []
+            if hasattr(self, '_last_loaded_frame'):
+                self._last_loaded_frame = None
+            self.canvas.delete("all")
+            self.annotation_panel.update_frame_info(-1, 0)
+        
+        # İş parçacığı ile Tk arasındaki mesajlaşma kuyruğu
+        message_queue = queue.Queue()
+        cancel_event = threading.Event()
+        
+        def run():
+            try:
+                extract_func(
+                    progress_callback=lambda done, total: message_queue.put(("progress", done, total)),
+                    frame_callback=lambda path, size: message_queue.put(("frame", path, size)),
+                    cancel_event=cancel_event)
+            except Exception as e:
+                print(f"Arka plan frame çıkarma sırasında hata oluştu: {e}")
+            finally:
+                message_queue.put(("done",))
+        
+        self.extraction_queue = message_queue
+        self.extraction_cancel = cancel_event
+        self.extraction_start_time = time.perf_counter()
+        self.extraction_thread = threading.Thread(target=run, daemon=True)
+        self.extraction_thread.start()
+        
+        self.progress_panel.show(title)
+        self.status_bar.config(text=title)
+        self.extraction_poll_job = self.root.after(self.extraction_poll_interval, self._poll_extraction)
+    
+    def _poll_extraction(self):
+        """Arka plan çıkarmasından gelen mesajları işle (Tk iş parçacığında)"""
+        self.extraction_poll_job = None
+        had_frames = len(self.frames) > 0
+        progress = None
+        done = False
+        
+        try:
+            while True:
+                message = self.extraction_queue.get_nowait()
+                if message[0] == "frame":
+                    self._on_extracted_frame(message[1], message[2])
+                elif message[0] == "progress":
+                    progress = message[1:]
+                elif message[0] == "done":
+                    done = True
+        except queue.Empty:
+            pass
+        
+        if self.manifest:
+            self.manifest.commit()
+        
+        # İlk frame gelir gelmez göster, kullanıcı etiketlemeye başlayabilir
+        if self.extraction_collect and not had_frames and self.frames:
+            self.current_frame_idx = 0
+            self.show_current_frame()
+            self.frames.prefetch(self.current_frame_idx, 1)
+        elif self.frames:
+            self.annotation_panel.update_frame_info(self.current_frame_idx, len(self.frames))
+        
+        # Hız ve kalan süreyi hesapla
+        if progress:
+            processed, total = progress
+            elapsed = time.perf_counter() - self.extraction_start_time
+            rate = processed / elapsed if elapsed > 0 else 0.0
+            eta = (total - processed) / rate if rate > 0 and total >= processed else None
+            saved_count = len(self.frames) if self.extraction_collect else self.extraction_written
+            self.progress_panel.update_progress(processed, total, rate, eta, saved_count)
+        
+        if done:
+            self._finish_extraction()
+        else:
+            self.extraction_poll_job = self.root.after(self.extraction_poll_interval, self._poll_extraction)
+    
+    def _on_extracted_frame(self, frame_path, size):
+        """Arka plan işinin yazdığı frame'i depoya ekle veya say"""
+        if self.extraction_collect:
+            self.frames.append(frame_path, size)
+            if self.manifest:
+                self.manifest.add_frame(len(self.frames) - 1, frame_path, size)
+        else:
+            self.extraction_written += 1
+    
+    def _finish_extraction(self):
+        """Arka plan çıkarması bittiğinde (veya iptal edildiğinde) çağrılır"""
+        cancelled = self.extraction_cancel is not None and self.extraction_cancel.is_set()
+        self.extraction_thread = None
+        self.extraction_queue = None
+        self.extraction_cancel = None
+        self.progress_panel.hide()
+        
+        if not self.extraction_collect:
+            if self.extraction_on_done:
+                self.extraction_on_done(cancelled, self.extraction_written)
             return
         
-        # İlk frame'i göster
-        self.current_frame_idx = 0
+        is_image_set = self.video_path is None
         
-        # Son yüklenen frame'i sıfırla
-        if hasattr(self, '_last_loaded_frame'):
-            self._last_loaded_frame = None
+        if not self.frames:
+            if cancelled:
+                self.status_bar.config(text="Frame çıkarma iptal edildi.")
+            elif is_image_set:
+                messagebox.showerror("Hata", "Fotoğraflar yüklenemedi.")
+            else:
+                messagebox.showerror("Hata", "Frameler çıkarılamadı.")
+            return
         
-        self.show_current_frame()
+        # Manifestteki mtime ve içerik özetlerini arka planda doldur
+        if self.manifest:
+            self.manifest.refresh_in_background()
+        self.open_label_index()
         
-        # Kullanıcıya bilgi ver
-        messagebox.showinfo("Bilgi", f"{len(self.frames)} frame çıkarıldı.")
+        # Oturum bilgilerini kaydet
+        session_info = {
+            "video_path": self.video_path,
+            "output_dir": self.output_dir,
+            "current_frame_idx": self.current_frame_idx,
+            "labels": self.labels,
+            "is_image_set": is_image_set
+        }
+        self.save_session(session_info, self.output_dir)
         
         # Frame bilgisini güncelle
         self.annotation_panel.update_frame_info(self.current_frame_idx, len(self.frames))
         
-        # Durum çubuğunu güncelle
-        self.status_bar.config(text=f"Frameler çıkarıldı: {len(self.frames)} frame")
+        if is_image_set:
+            if cancelled:
+                self.status_bar.config(text=f"Fotoğraf aktarma iptal edildi: {len(self.frames)} fotoğraf korundu")
+            else:
+                messagebox.showinfo("Bilgi", f"{len(self.frames)} fotoğraf yüklendi.")
+                self.status_bar.config(text=f"Fotoğraflar yüklendi: {len(self.frames)} fotoğraf")
+        elif cancelled:
+            # Durum çubuğunu güncelle
+            self.status_bar.config(text=f"Frame çıkarma iptal edildi: {len(self.frames)} frame korundu")
+        else:
+            # Kullanıcıya bilgi ver
+            messagebox.showinfo("Bilgi", f"{len(self.frames)} frame çıkarıldı.")
+            
+            # Durum çubuğunu güncelle
+            self.status_bar.config(text=f"Frameler çıkarıldı: {len(self.frames)} frame")
+    
+    def cancel_extraction(self, wait=False):
+        """Devam eden arka plan çıkarmasını iptal et (yazılan frameler korunur)"""
+        if self.extraction_thread is None:
+            return
+        
+        self.extraction_cancel.set()
+        self.progress_panel.set_cancelling()
+        
+        # Yeni bir işlem başlatılacaksa veya uygulama kapanıyorsa bitmesini bekle
+        if wait:
+            self.extraction_thread.join()
+            if self.extraction_poll_job:
+                self.root.after_cancel(self.extraction_poll_job)
+                self.extraction_poll_job = None
+            self._poll_extraction_final()
+    
+    def _poll_extraction_final(self):
+        """Beklenerek durdurulan çıkarmanın kalan mesajlarını işle"""
+        if self.extraction_queue is None:
+            return
+        try:
+            while True:
+                message = self.extraction_queue.get_nowait()
+                if message[0] == "frame":
+                    self._on_extracted_frame(message[1], message[2])
+        except queue.Empty:
+            pass
+        if self.manifest:
+            self.manifest.commit()
+        self.extraction_thread = None
+        self.extraction_queue = None
+        self.extraction_cancel = None
+        self.progress_panel.hide()
     
     def resume_from_last_session(self):
         """Son oturumdan devam et"""
@@ -1312,14 +1731,19 @@ class MainWindow:
         self.annotation_panel.update_label_list(self.labels)
         self.annotation_panel.update_label_menu(self.labels)
         
-        # Frameleri yükle
-        frames_dir = os.path.join(output_dir, "frames")
-        self.frames = load_frames_from_dir(frames_dir)
+        # Frameleri yükle (frame çıkarılmadan açılan oturumlarda videodan okunur)
+        self.frames.close()
+        self.close_manifest()
+        self.frames = load_video_frames(output_dir) or self.load_frames_with_manifest(output_dir)
         
         if not self.frames:
             messagebox.showerror("Hata", "Frameler yüklenemedi.")
             return
         
+        # Daha önce oluşturulmuş ham frame önbelleği varsa kullan
+        self.frames.set_raw_cache(open_raw_cache(self.frames, output_dir))
+        self.open_label_index()
+        
         # Son frame'e git
         self.current_frame_idx = session_info.get("current_frame_idx", 0)
         if self.current_frame_idx >= len(self.frames):
@@ -1331,6 +1755,7 @@ class MainWindow:
         
         # Mevcut frame'i göster
         self.show_current_frame()
+        self.frames.prefetch(self.current_frame_idx, 0)
         
         # Frame bilgisini güncelle
         self.annotation_panel.update_frame_info(self.current_frame_idx, len(self.frames))
@@ -1346,6 +1771,136 @@ class MainWindow:
             # Durum çubuğunu güncelle
             self.status_bar.config(text=f"Oturum yüklendi: {len(self.frames)} frame")
     
+    def load_frames_with_manifest(self, output_dir):
+        """Frameleri manifestten yükle; manifest yoksa klasörü listeleyip oluştur"""
+        had_manifest = DatasetManifest.exists(output_dir)
+        self.manifest = open_manifest(output_dir)
+        
+        frames = self.manifest.load_frame_store() if self.manifest and had_manifest else FrameStore()
+        if not frames:
+            # Eski oturum: frames/ klasörünü bir kez listele ve manifesti oluştur
+            frames = load_frames_from_dir(os.path.join(output_dir, "frames"))
+            if self.manifest and frames:
+                self.manifest.clear()
+                self.manifest.add_frames(frames)
+        
+        # Eksik boyut/özet bilgilerini ve dışarıda değişen dosyaları arka planda güncelle
+        if self.manifest and frames:
+            self.manifest.refresh_in_background()
+        return frames
+    
+    def close_manifest(self):
+        """Açık manifesti kapat"""
+        if self.manifest:
+            # Bekleyen yazmalar kapanan manifesti günceller
+            self.file_writer.flush()
+            self.manifest.close()
+            self.manifest = None
+    
+    def open_label_index(self):
+        """Mevcut framelerin etiket dosyalarını arka planda bellek içi indekse oku"""
+        self.close_label_index()
+        # İndeks diskten okunur, bekleyen yazmalar önce tamamlanmalı
+        self.file_writer.flush()
+        self.label_index = LabelIndex(len(self.frames))
+        self.label_index.load_in_background(self.frames.frame_paths, self.output_dir)
+    
+    def close_label_index(self):
+        """Etiket indeksini kapat (kutular yeniden diskten okunur)"""
+        if self.label_index:
+            self.label_index.close()
+            self.label_index = None
+    
+    def save_current_annotations(self):
+        """Mevcut frame'in kutularını kaydet ve manifestteki etiket durumunu güncelle
+
+        Kutular diske en son yazılan haliyle aynıysa (içerik özeti
+        eşleşiyorsa) dosya yeniden yazılmaz.
+        """
+        frame_path = self.frames.get_path(self.current_frame_idx)
+        box_hash = self.current_boxes.content_hash()
+        if self.saved_box_hashes.get(frame_path) == box_hash:
+            self.label_write_stats["skipped"] += 1
+            return True
+        
+        if not self.output_dir or not self.labels:
+            return False
+        
+        # Özet gönderimden önce yazılır; yazma başarısız olursa gösterge güncellenirken
+        # (Tk iş parçacığında) geri alınır
+        self.saved_box_hashes[frame_path] = box_hash
+        self.label_write_stats["written"] += 1
+        
+        # Dosya arka planda yazılır; kutuların ve etiketlerin anlık görüntüsü gönderilir
+        img_size = self.frames.get_size(self.current_frame_idx)
+        self.file_writer.submit(get_label_path(frame_path, self.output_dir), self.write_labels,
+                                self.manifest, self.current_frame_idx, bool(self.current_boxes),
+                                save_annotations, self.current_boxes.copy(), list(self.labels),
+                                frame_path, self.output_dir, True, img_size,
+                                on_error=lambda _, path=frame_path: self.label_write_failures.put(
+                                    (path, box_hash)))
+        self.schedule_unsaved_indicator()
+        
+        if self.label_index and img_size:
+            self.label_index.set_boxes(self.current_frame_idx, self.current_boxes, img_size)
+        return True
+    
+    @staticmethod
+    def write_labels(manifest, idx, labeled, write_func, *args):
+        """Etiket dosyasını yaz ve başarılıysa manifestteki etiket durumunu güncelle
+
+        Arka plan yazıcısının iş parçacığında çalışır; manifest bu yüzden
+        sadece dosya gerçekten yazıldığında güncellenir.
+        """
+        if write_func(*args) is False:
+            return False
+        if manifest:
+            manifest.set_label_status(idx, labeled)
+        return True
+    
+    def on_label_write_failed(self, frame_path, box_hash):
+        """Yazılamayan etiketlerin özetini unut, böylece sonraki kayıt yeniden dener"""
+        if self.saved_box_hashes.get(frame_path) == box_hash:
+            del self.saved_box_hashes[frame_path]
+    
+    def process_label_write_failures(self):
+        """Arka plan yazıcısının bildirdiği yazma hatalarını işle (Tk iş parçacığında)
+
+        Yazıcının iş parçacığı Tk'yi çağırmaz, hataları kuyruğa koyar; kapanırken
+        yazıcı beklenirken Tk'ye erişmek uygulamayı kilitlerdi.
+        """
+        while True:
+            try:
+                frame_path, box_hash = self.label_write_failures.get_nowait()
+            except queue.Empty:
+                return
+            self.on_label_write_failed(frame_path, box_hash)
+    
+    def save_session(self, session_info, output_dir):
+        """Oturum bilgilerini arka plan yazıcısı ile kaydet"""
+        if not output_dir:
+            return
+        self.file_writer.submit(os.path.join(output_dir, self.session_file), save_session_info,
+                                copy.deepcopy(session_info), output_dir, self.session_file)
+        self.schedule_unsaved_indicator()
+    
+    def schedule_unsaved_indicator(self):
+        """Yazılmayı bekleyen dosya kalmayana kadar göstergeyi güncelle"""
+        if self.unsaved_job is None:
+            self.update_unsaved_indicator()
+    
+    def update_unsaved_indicator(self):
+        """Kaydedilmemiş değişiklik göstergesini güncelle"""
+        # Yazma hataları yazıcının iş parçacığında bildirilir, burada işlenir
+        self.process_label_write_failures()
+        pending = self.file_writer.pending_count()
+        if pending:
+            self.unsaved_label.config(text=f"● Kaydedilmemiş değişiklik ({pending})")
+            self.unsaved_job = self.root.after(UNSAVED_POLL_MS, self.update_unsaved_indicator)
+        else:
+            self.unsaved_label.config(text="")
+            self.unsaved_job = None
+    
     def save_annotations(self, event=None, show_message=True):
         """Etiketleri kaydet"""
         if not self.frames or not self.output_dir:
@@ -1354,9 +1909,9 @@ class MainWindow:
             return
         
         # Mevcut frame için etiketleri kaydet
+        frame_path = self.frames.get_path(self.current_frame_idx)
         if self.current_boxes:
-            frame_data, frame_path = self.frames[self.current_frame_idx]
-            save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir, silent=True)
+            save_result = self.save_current_annotations()
             if not save_result:
                 if show_message:
                     messagebox.showerror("Hata", "Etiketler kaydedilemedi.")
@@ -1370,7 +1925,7 @@ class MainWindow:
             "labels": self.labels,
             "is_image_set": self.video_path is None  # Video yolu yoksa fotoğraf seti
         }
-        save_session_info(session_info, self.output_dir, self.session_file)
+        self.save_session(session_info, self.output_dir)
         
         # Kullanıcıya bilgi ver
         if show_message:
@@ -1380,6 +1935,9 @@ class MainWindow:
     
     def on_closing(self):
         """Uygulama kapatılırken çağrılır"""
+        # Devam eden frame çıkarmayı durdur (yazılan frameler korunur)
+        self.cancel_extraction(wait=True)
+        
         # Otomatik kaydetme işini iptal et
         if self.autosave_job:
             self.root.after_cancel(self.autosave_job)
@@ -1389,8 +1947,7 @@ class MainWindow:
         if self.frames and self.output_dir:
             # Mevcut etiketleri kaydet
             if self.current_boxes:
-                frame_data, frame_path = self.frames[self.current_frame_idx]
-                save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir, silent=True)
+                self.save_current_annotations()
             
             # Oturum bilgilerini kaydet
             session_info = {
@@ -1400,13 +1957,31 @@ class MainWindow:
                 "labels": self.labels,
                 "is_image_set": self.video_path is None
             }
-            save_session_info(session_info, self.output_dir, self.session_file)
+            self.save_session(session_info, self.output_dir)
             
             # Klavye kısayollarını kaydet
             self.save_keyboard_shortcuts()
             
             print("Oturum bilgileri kaydedildi.")
         
+        # Bekleyen etiket ve oturum dosyalarını yaz
+        self.file_writer.close()
+        self.process_label_write_failures()
+        if self.output_dir:
+            print(f"Etiket dosyaları: {self.label_write_stats['written']} kayıt, "
+                  f"{self.label_write_stats['skipped']} değişmediği için atlandı; "
+                  f"diske {self.file_writer.stats['written']} yazma, "
+                  f"{self.file_writer.stats['coalesced']} birleştirildi, "
+                  f"{self.file_writer.stats['failed']} hata")
+        if self.unsaved_job:
+            self.root.after_cancel(self.unsaved_job)
+            self.unsaved_job = None
+        
+        # Arka plan frame çözme iş parçacığını durdur
+        self.frames.close()
+        self.close_manifest()
+        self.close_label_index()
+        
         self.root.destroy()
 
     def goto_specific_frame_dialog(self, event=None):
@@ -1420,8 +1995,8 @@ class MainWindow:
         if frame_idx:
             # Mevcut frame için etiketleri kaydet
             if self.current_boxes:
-                frame_data, frame_path = self.frames[self.current_frame_idx]
-                save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir)
+                frame_path = self.frames.get_path(self.current_frame_idx)
+                save_result = self.save_current_annotations()
                 if not save_result:
                     print(f"Etiketler kaydedilemedi (belirli frame'e geçiş diyalog): {frame_path}")
                 else:
@@ -1442,11 +2017,14 @@ class MainWindow:
                 "labels": self.labels,
                 "is_image_set": self.video_path is None
             }
-            save_session_info(session_info, self.output_dir, self.session_file)
+            self.save_session(session_info, self.output_dir)
             
             # Yeni frame'i göster
             self.show_current_frame()
             
+            # Her iki yöndeki komşu frameleri arka planda hazırla
+            self.frames.prefetch(self.current_frame_idx, 0)
+            
             # Seçili kutuları temizle
             self.selected_box_indices = []
             
@@ -1458,62 +2036,95 @@ class MainWindow:
         if not self.frames:
             return
         
-        # Mevcut frame'i al
-        frame_data, frame_path = self.frames[self.current_frame_idx]
+        # Mevcut frame'in görüntüleme piramidini al (ihtiyaç anında diskten çözülür).
+        # Sadece kutular yeniden çiziliyorsa ekrandaki piramit kullanılır; gösterilen
+        # frame önbellekte sabitlenir, önceden çözülen komşular onu çıkaramaz
+        frame_path = self.frames.get_path(self.current_frame_idx)
+        same_frame = getattr(self, '_last_loaded_frame', None) == frame_path
+        shown_path, pyramid = getattr(self, '_shown_pyramid', (None, None))
+        if not same_frame or shown_path != frame_path:
+            pyramid = self.frames.get_pyramid(self.current_frame_idx, pin=True)
+            if pyramid is None:
+                self._shown_pyramid = (None, None)
+                self.status_bar.config(text=f"Frame okunamadı: {os.path.basename(frame_path)}")
+                return
+            self._shown_pyramid = (frame_path, pyramid)
         
         # Son yüklenen frame'i kontrol et
-        if hasattr(self, '_last_loaded_frame') and self._last_loaded_frame == frame_path:
+        if same_frame:
             # Aynı frame, sadece kutuları yeniden çiz
             pass
         else:
             # Yeni frame, yükle ve kutuları çiz
             self._last_loaded_frame = frame_path
             
-            # Etiketleri yükle
-            label_path = os.path.join(
-                self.output_dir, 
-                "labels", 
-                os.path.splitext(os.path.basename(frame_path))[0] + ".txt"
-            )
+            # Etiketleri yükle (indeks hazırsa bellekten, değilse diskten)
+            boxes = None
+            if self.label_index:
+                boxes = self.label_index.get_boxes(self.current_frame_idx, self.labels, pyramid.shape[:2])
+            
+            if boxes is not None:
+                self.current_boxes = boxes
+                has_label_file = self.label_index.has_label_file(self.current_frame_idx)
+            elif os.path.exists(get_label_path(frame_path, self.output_dir)):
+                self.current_boxes = load_annotations(frame_path, self.output_dir, self.labels,
+                                                     img_size=pyramid.shape[:2])
+                has_label_file = True
+            else:
+                self.current_boxes = BoxSet(self.labels)
+                has_label_file = False
             
-            if os.path.exists(label_path):
-                self.current_boxes = load_annotations(frame_path, self.output_dir, self.labels)
+            # Diskteki hali bilinir; etiket dosyası olmayan frame ilk kayıtta yine yazılır
+            if has_label_file:
+                self.saved_box_hashes[frame_path] = self.current_boxes.content_hash()
             else:
-                self.current_boxes = []
+                self.saved_box_hashes.pop(frame_path, None)
         
         # Canvas boyutlarını al
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
         
         # Orijinal görüntü boyutlarını al
-        img_h, img_w = frame_data.shape[:2]
-        
-        # Frame'i yeniden boyutlandır
-        resized_frame, _ = resize_frame(frame_data, canvas_width, canvas_height, self.zoom_factor)
-        
-        # PhotoImage oluştur
-        photo = create_photo_image(resized_frame)
-        
-        # Canvas'ı temizle
-        self.canvas.delete("all")
-        
-        # Görüntüyü canvas'a yerleştir
-        resized_h, resized_w = resized_frame.shape[:2]
-        x_offset = (canvas_width - resized_w) // 2
-        y_offset = (canvas_height - resized_h) // 2
-        
-        self.canvas.create_image(x_offset, y_offset, anchor=tk.NW, image=photo)
-        self.canvas.image = photo  # Referansı tut
+        img_h, img_w = pyramid.shape[:2]
+        
+        # Görünüm (ölçek ve kaydırma); merkez kenarlara göre sınırlandırılmış haliyle saklanır
+        viewport = Viewport(img_w, img_h, canvas_width, canvas_height, self.zoom_factor, self.view_center)
+        if self.view_center is not None:
+            self.view_center = viewport.center
+        
+        # Görüntü katmanı sadece frame, canvas boyutu, zoom veya kaydırma değiştiğinde yeniden
+        # oluşturulur; hover, seçim ve ızgara gibi değişikliklerde önbellekteki kullanılır
+        view_key = (frame_path, id(pyramid), canvas_width, canvas_height, self.zoom_factor,
+                    viewport.offset_x, viewport.offset_y)
+        if view_key != self._view_key or not self.canvas.find_withtag("frame_image"):
+            # Sadece görünür bölgeyi piramidin uygun seviyesinden kırpıp ölçekle
+            view, x_offset, y_offset = render_view(pyramid, viewport)
+            
+            # PhotoImage oluştur
+            photo = create_photo_image(view)
+            
+            # Canvas'ı temizle
+            self.canvas.delete("all")
+            
+            # Görüntüyü canvas'a yerleştir
+            self.canvas.create_image(x_offset, y_offset, anchor=tk.NW, image=photo, tags="frame_image")
+            self.canvas.image = photo  # Referansı tut
+            self._view_key = view_key
+        else:
+            # Sadece ızgarayı ve geçici kutuyu temizle, kutular yerinde güncellenir
+            self.canvas.delete("grid", "temp_box")
         
         # Izgara çiz
         if self.grid_enabled:
             draw_grid(self.canvas, img_w, img_h, canvas_width, canvas_height, 
-                     self.grid_size, self.grid_color, self.zoom_factor)
+                     self.grid_size, self.grid_color, self.zoom_factor, self.view_center)
+            # Izgara görüntünün hemen üstünde, kutuların altında kalsın
+            self.canvas.tag_raise("grid", "frame_image")
         
-        # Kutuları çiz
-        if self.current_boxes:
-            draw_boxes(self.canvas, self.current_boxes, img_w, img_h, canvas_width, canvas_height,
-                      self.zoom_factor, self.selected_box_indices, self.label_colors, self.hover_box_idx)
+        # Kutuları çiz (boş liste önceki kutuların öğelerini kaldırır)
+        draw_boxes(self.canvas, self.current_boxes, img_w, img_h, canvas_width, canvas_height,
+                  self.zoom_factor, self.selected_box_indices, self.label_colors, self.hover_box_idx,
+                  self.view_center)
         
         # Frame bilgisini güncelle
         self.annotation_panel.update_frame_info(self.current_frame_idx, len(self.frames))
@@ -1540,11 +2151,59 @@ class MainWindow:
                     "labels": self.labels,
                     "is_image_set": self.video_path is None
                 }
-                save_session_info(session_info, self.output_dir, self.session_file)
+                self.save_session(session_info, self.output_dir)
             
             # Kullanıcıya bilgi ver
             messagebox.showinfo("Bilgi", f"Etiket eklendi: {label}") 
 
+    def remove_label(self, label):
+        """Etiketi listeden kaldır ve kutuların sınıf ID'lerini yeniden numaralandır
+
+        Kutular etiketi listedeki sırası (sınıf ID'si) ile tuttuğu için mevcut
+        kutular, geri alma geçmişi ve etiket indeksi güncellenir; silinen
+        etiketteki kutular kaldırılır. Sınıf ID'leri değişen etiket dosyaları
+        arka planda yeniden yazılır.
+        """
+        if label not in self.labels:
+            return
+        class_id = self.labels.index(label)
+        
+        # Dosyalar indeksten yeniden yazılacağı için indeksin yüklenmesi beklenir
+        if self.label_index:
+            self.label_index.wait()
+        
+        self.labels.remove(label)
+        
+        # Geçmişteki kümeler birbirinden bağımsızdır, her biri bir kez güncellenir
+        remapped = set()
+        def remap(boxes):
+            if id(boxes) not in remapped:
+                remapped.add(id(boxes))
+                boxes.remove_class(class_id)
+            return boxes
+        
+        remap(self.current_boxes)
+        self.selected_box_indices = []
+        self.action_history = [(action, remap(boxes), []) for action, boxes, _ in self.action_history]
+        if hasattr(self, 'undone_actions'):
+            self.undone_actions = [(action, remap(boxes), []) for action, boxes, _ in self.undone_actions]
+        
+        if self.label_index:
+            for idx in self.label_index.remove_class(class_id):
+                label_path = get_label_path(self.frames.get_path(idx), self.output_dir)
+                class_ids, yolo = self.label_index.get(idx)
+                self.file_writer.submit(label_path, self.write_labels, self.manifest, idx, bool(len(class_ids)),
+                                        write_file_atomic, label_path, format_yolo_rows(class_ids, yolo))
+            self.schedule_unsaved_indicator()
+        elif self.output_dir:
+            print("Etiket indeksi yok, diğer framelerin etiket dosyaları güncellenmedi.")
+        
+        # Kaydedilmiş hallerin özetleri eski sınıf ID'lerine göre hesaplandı
+        self.saved_box_hashes.clear()
+        if self.frames and self.output_dir:
+            self.save_current_annotations()
+        self.show_current_frame()
+
     def configure_label_colors(self):
         """Etiket renklerini yapılandır"""
         if not self.labels:
@@ -1669,10 +2328,8 @@ class MainWindow:
         # İşlem geçmişine ekle
         self.action_history.append(("delete", self.current_boxes.copy(), self.selected_box_indices.copy()))
         
-        # Seçili kutuları sil (büyükten küçüğe doğru sıralayarak)
-        for idx in sorted(self.selected_box_indices, reverse=True):
-            if 0 <= idx < len(self.current_boxes):
-                self.current_boxes.pop(idx)
+        # Seçili kutuları tek seferde sil
+        self.current_boxes.delete(self.selected_box_indices)
         
         # Seçimleri temizle
         self.selected_box_indices = []
@@ -1682,8 +2339,8 @@ class MainWindow:
         
         # Etiketleri hemen kaydet
         if self.frames:
-            frame_data, frame_path = self.frames[self.current_frame_idx]
-            save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir)
+            frame_path = self.frames.get_path(self.current_frame_idx)
+            save_result = self.save_current_annotations()
             if not save_result:
                 print(f"Etiketler kaydedilemedi (kutu silme sonrası): {frame_path}")
             else:
@@ -1703,8 +2360,8 @@ class MainWindow:
             
             # Etiketleri hemen kaydet
             if self.frames:
-                frame_data, frame_path = self.frames[self.current_frame_idx]
-                save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir)
+                frame_path = self.frames.get_path(self.current_frame_idx)
+                save_result = self.save_current_annotations()
                 if not save_result:
                     print(f"Etiketler kaydedilemedi (son kutu silme sonrası): {frame_path}")
                 else:
@@ -1778,8 +2435,8 @@ class MainWindow:
     def autosave(self):
         """Otomatik kaydetme işlemi"""
         if self.frames and self.output_dir and self.current_boxes:
-            frame_data, frame_path = self.frames[self.current_frame_idx]
-            save_result = save_annotations(self.current_boxes, self.labels, frame_path, self.output_dir, silent=True)
+            frame_path = self.frames.get_path(self.current_frame_idx)
+            save_result = self.save_current_annotations()
             if save_result:
                 # Oturum bilgilerini güncelle
                 session_info = {
@@ -1789,7 +2446,7 @@ class MainWindow:
                     "labels": self.labels,
                     "is_image_set": self.video_path is None
                 }
-                save_session_info(session_info, self.output_dir, self.session_file)
+                self.save_session(session_info, self.output_dir)
                 
                 # Durum çubuğunu güncelle
                 self.status_bar.config(text=f"Otomatik kaydedildi: {os.path.basename(frame_path)}")
@@ -16,6 +16,7 @@ class MenuBar:
         
         self.file_menu.add_command(label="Fotoğraf Yükle", command=self.main_window.load_images)
         self.file_menu.add_command(label="Video Yükle", command=self.main_window.load_video)
+        self.file_menu.add_command(label="Video Yükle (Frame Çıkarmadan)", command=self.main_window.load_video_direct)
         self.file_menu.add_separator()
         self.file_menu.add_command(label="Oturumdan Devam Et", command=self.main_window.resume_from_last_session)
         self.file_menu.add_separator()
@@ -28,6 +29,10 @@ class MenuBar:
         self.menu_bar.add_cascade(label="Frameler", menu=self.frames_menu)
         
         self.frames_menu.add_command(label="Frameleri Çıkar", command=self.main_window.extract_frames)
+        self.frames_menu.add_command(label="Seçili/Örnek Frameleri Çıkar", command=self.main_window.extract_sample_frames)
+        self.frames_menu.add_command(label="Frameleri Dışa Aktar", command=self.main_window.export_frames)
+        self.frames_menu.add_command(label="Ham Frame Önbelleği Oluştur", command=self.main_window.build_raw_cache)
+        self.frames_menu.add_command(label="Ham Frame Önbelleğini Sil", command=self.main_window.delete_raw_cache)
         self.frames_menu.add_separator()
         self.frames_menu.add_command(label="Önceki Frame", command=self.main_window.prev_frame)
         self.frames_menu.add_command(label="Sonraki Frame", command=self.main_window.next_frame)
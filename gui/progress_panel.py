@@ -0,0 +1,66 @@
+import tkinter as tk
+from tkinter import ttk
+
+class ProgressPanel:
+    def __init__(self, parent, main_window):
+        self.parent = parent
+        self.main_window = main_window
+
+        # Ana frame (sadece arka plan işi sürerken gösterilir)
+        self.frame = ttk.Frame(parent)
+
+        # İşlem başlığı
+        self.title_label = ttk.Label(self.frame, text="")
+        self.title_label.pack(side=tk.LEFT, padx=5)
+
+        # İlerleme çubuğu
+        self.progress_var = tk.DoubleVar(value=0)
+        self.progress_bar = ttk.Progressbar(self.frame, variable=self.progress_var,
+                                            maximum=100, mode="determinate")
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        # Hız ve kalan süre bilgisi
+        self.info_label = ttk.Label(self.frame, text="", width=40)
+        self.info_label.pack(side=tk.LEFT, padx=5)
+
+        # İptal butonu
+        self.cancel_button = ttk.Button(self.frame, text="İptal",
+                                        command=self.main_window.cancel_extraction)
+        self.cancel_button.pack(side=tk.RIGHT, padx=5)
+
+        self.visible = False
+
+    def show(self, title):
+        """Paneli göster ve sıfırla"""
+        self.title_label.config(text=title)
+        self.progress_var.set(0)
+        self.info_label.config(text="Başlatılıyor...")
+        self.cancel_button.config(state=tk.NORMAL)
+
+        if not self.visible:
+            self.frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=2)
+            self.visible = True
+
+    def update_progress(self, processed, total, rate, eta, saved_count):
+        """İlerleme çubuğunu ve hız/kalan süre bilgisini güncelle"""
+        if total > 0:
+            self.progress_var.set(min(100.0, processed * 100.0 / total))
+
+        if eta is not None:
+            minutes, seconds = divmod(int(eta), 60)
+            eta_text = f"{minutes:d}:{seconds:02d}"
+        else:
+            eta_text = "--:--"
+
+        self.info_label.config(text=f"{saved_count} frame | {rate:.1f} frame/sn | Kalan: {eta_text}")
+
+    def set_cancelling(self):
+        """İptal isteği gönderildiğinde butonu devre dışı bırak"""
+        self.cancel_button.config(state=tk.DISABLED)
+        self.info_label.config(text="İptal ediliyor...")
+
+    def hide(self):
+        """Paneli gizle"""
+        if self.visible:
+            self.frame.pack_forget()
+            self.visible = False
@@ -0,0 +1,68 @@
+import threading
+
+from utils.background_writer import BackgroundWriter
+
+def blocked_writer(**kwargs):
+    """İlk işi gate açılana kadar bekleten yazıcı (kuyruk durumunu test etmek için)"""
+    gate = threading.Event()
+    started = threading.Event()
+
+    def hold():
+        started.set()
+        gate.wait()
+
+    writer = BackgroundWriter(**kwargs)
+    writer.submit("hold", hold)
+    started.wait()
+    return writer, gate
+
+def test_coalesces_pending_writes_to_same_path():
+    writer, gate = blocked_writer()
+    written = []
+    for value in range(5):
+        writer.submit("a.txt", written.append, value)
+    writer.submit("b.txt", written.append, "b")
+    assert writer.pending_count() == 3
+    gate.set()
+    assert writer.flush(timeout=5)
+    writer.close()
+    assert written == [4, "b"]
+    assert writer.stats["coalesced"] == 4
+    assert writer.stats["written"] == 3
+
+def test_submit_waits_when_queue_is_full():
+    writer, gate = blocked_writer(max_pending=2)
+    writer.submit("a", lambda: None)
+    writer.submit("b", lambda: None)
+    submitted = threading.Event()
+    thread = threading.Thread(target=lambda: (writer.submit("c", lambda: None), submitted.set()))
+    thread.start()
+    assert not submitted.wait(0.2)
+    # Aynı dosyanın güncellenmesi yer gerektirmez
+    writer.submit("a", lambda: None)
+    gate.set()
+    assert submitted.wait(5)
+    thread.join()
+    writer.close()
+    assert writer.pending_count() == 0
+
+def test_on_error_for_failed_writes():
+    writer = BackgroundWriter()
+    failed = []
+
+    def fail():
+        raise OSError("disk dolu")
+
+    writer.submit("a", fail, on_error=failed.append)
+    writer.submit("b", lambda: False, on_error=failed.append)
+    writer.submit("c", lambda: True, on_error=failed.append)
+    writer.close()
+    assert failed == ["a", "b"]
+    assert writer.stats["failed"] == 2
+
+def test_submit_after_close_runs_synchronously():
+    writer = BackgroundWriter()
+    writer.close()
+    written = []
+    writer.submit("a", written.append, 1)
+    assert written == [1]
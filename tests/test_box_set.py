@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from utils.box_set import BoxSet
+
+LABELS = ["car", "person", "dog"]
+
+def make_boxes():
+    return BoxSet.from_boxes([(10, 10, 50, 50, "car"),
+                              (20, 20, 30, 30, "person"),
+                              (100, 100, 200, 150, "dog")], LABELS)
+
+def test_from_boxes_skips_unknown_labels():
+    boxes = BoxSet.from_boxes([(0, 0, 5, 5, "car"), (1, 1, 2, 2, "cat")], LABELS)
+    assert boxes.to_list() == [(0, 0, 5, 5, "car")]
+
+def test_append_grows_and_rejects_unknown_label():
+    boxes = BoxSet(LABELS)
+    for i in range(20):
+        boxes.append((i, i, i + 10, i + 10, "dog"))
+    assert len(boxes) == 20
+    assert boxes[-1] == (19, 19, 29, 29, "dog")
+    with pytest.raises(ValueError):
+        boxes.append((0, 0, 1, 1, "cat"))
+
+def test_copy_is_copy_on_write():
+    boxes = make_boxes()
+    snapshot = boxes.copy()
+    boxes.translate(5, 5, indices=[0])
+    boxes.append((1, 1, 2, 2, "car"))
+    assert snapshot.to_list() == make_boxes().to_list()
+    assert boxes[0] == (15, 15, 55, 55, "car")
+    assert len(boxes) == 4
+
+def test_views_are_read_only():
+    boxes = make_boxes()
+    with pytest.raises(ValueError):
+        boxes.coords[0, 0] = 1
+
+def test_delete_and_pop():
+    boxes = make_boxes()
+    boxes.delete([0, 2, 7])  # Geçersiz indeks yok sayılır
+    assert boxes.to_list() == [(20, 20, 30, 30, "person")]
+    assert boxes.pop() == (20, 20, 30, 30, "person")
+    assert len(boxes) == 0
+
+def test_remove_class_shifts_higher_ids():
+    boxes = make_boxes()
+    snapshot = boxes.copy()
+    boxes.remove_class(0)
+    assert boxes.class_ids.tolist() == [0, 1]
+    assert snapshot.class_ids.tolist() == [0, 1, 2]
+
+def test_translate_keeps_boxes_inside_image():
+    boxes = make_boxes()
+    boxes.translate(60, 0, img_width=256, img_height=256)
+    # Üçüncü kutu sınır dışına çıkacağı için yerinde kalır
+    assert boxes.coords.tolist() == [[70, 10, 110, 50], [80, 20, 90, 30], [100, 100, 200, 150]]
+
+def test_adjust_rejects_inverted_boxes():
+    boxes = make_boxes()
+    boxes.adjust((0, 0, -15, 0), indices=[0, 1])
+    assert boxes[0][:4] == (10, 10, 35, 50)
+    assert boxes[1][:4] == (20, 20, 30, 30)
+
+def test_find_at_prefers_smallest_box():
+    boxes = make_boxes()
+    assert boxes.find_at(25, 25) == 1
+    assert boxes.find_at(12, 12) == 0
+    assert boxes.find_at(300, 300) == -1
+
+def test_iou():
+    a = BoxSet(LABELS, [[0, 0, 10, 10]], [0])
+    b = BoxSet(LABELS, [[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]], [0, 0, 0])
+    np.testing.assert_allclose(a.iou(b), [[1.0, 1 / 3, 0.0]])
+    np.testing.assert_allclose(a.iou((0, 0, 5, 10, "car")), [[0.5]])
+
+def test_content_hash_tracks_content():
+    boxes = make_boxes()
+    original = boxes.content_hash()
+    assert boxes.copy().content_hash() == original
+    boxes.translate(1, 0, indices=[1])
+    assert boxes.content_hash() != original
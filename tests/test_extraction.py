@@ -0,0 +1,90 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from utils.file_utils import extract_frames_from_video
+from utils import video_utils
+from utils.video_utils import (_remove_segment_frames, extract_frames_parallel, extract_frames_sparse,
+                               split_segments)
+
+FRAME_COUNT = 60
+
+@pytest.fixture(scope="module")
+def video_path(tmp_path_factory):
+    """Her frame'in parlaklığı frame numarasının 4 katı olan küçük bir video"""
+    path = str(tmp_path_factory.mktemp("video") / "video.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48))
+    for i in range(FRAME_COUNT):
+        writer.write(np.full((48, 64, 3), i * 4, np.uint8))
+    writer.release()
+    return path
+
+def frame_number_of(frame_path):
+    """Frame dosyasının parlaklığından videodaki frame numarasını bul"""
+    return int(round(cv2.imread(frame_path).mean() / 4))
+
+def test_serial_extraction_names_frames_by_sample_number(video_path, tmp_path):
+    reported = []
+    frames = extract_frames_from_video(video_path, str(tmp_path), interval=7,
+                                       frame_callback=lambda path, size: reported.append(path))
+    paths = [frames.get_path(i) for i in range(len(frames))]
+    assert [os.path.basename(p) for p in paths] == [f"frame_{n:06d}.jpg" for n in range(9)]
+    assert reported == paths
+    assert [frame_number_of(p) for p in paths] == list(range(0, FRAME_COUNT, 7))
+    assert frames.get_size(0) == (48, 64)
+
+def test_serial_extraction_cancel_keeps_written_frames(video_path, tmp_path):
+    class CancelAfter:
+        def __init__(self, count):
+            self.count = count
+        def is_set(self):
+            self.count -= 1
+            return self.count < 0
+
+    frames = extract_frames_from_video(video_path, str(tmp_path), interval=5,
+                                       cancel_event=CancelAfter(20))
+    assert len(frames) == 4
+    assert sorted(os.listdir(tmp_path / "frames")) == [f"frame_{n:06d}.jpg" for n in range(4)]
+
+@pytest.mark.parametrize("use_seek", [True, False])
+def test_sparse_extraction_matches_serial_naming(video_path, tmp_path, use_seek):
+    reported = []
+    frames = extract_frames_sparse(video_path, str(tmp_path), interval=10, use_seek=use_seek,
+                                   frame_callback=lambda path, size: reported.append(path))
+    paths = [frames.get_path(i) for i in range(len(frames))]
+    assert [os.path.basename(p) for p in paths] == [f"frame_{n:06d}.jpg" for n in range(6)]
+    assert reported == paths
+    assert [frame_number_of(p) for p in paths] == list(range(0, FRAME_COUNT, 10))
+
+def test_sparse_extraction_of_frame_list(video_path, tmp_path):
+    frames = extract_frames_sparse(video_path, str(tmp_path), frame_indices=[33, 3, 21])
+    assert [frame_number_of(frames.get_path(i)) for i in range(len(frames))] == [3, 21, 33]
+
+def test_split_segments_are_aligned_to_interval(monkeypatch):
+    monkeypatch.setattr(video_utils, "MIN_FRAMES_PER_SEGMENT", 10)
+    segments = split_segments(FRAME_COUNT, 7, 4)
+    assert segments[0][0] == 0 and segments[-1][1] is None
+    assert all(start % 7 == 0 for start, _ in segments)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(segments, segments[1:]))
+
+def test_parallel_extraction_matches_serial(video_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(video_utils, "MIN_FRAMES_PER_SEGMENT", 10)
+    reported = []
+    frames = extract_frames_parallel(video_path, str(tmp_path), interval=7, workers=3,
+                                     frame_callback=lambda path, size: reported.append(path))
+    paths = [frames.get_path(i) for i in range(len(frames))]
+    assert [os.path.basename(p) for p in paths] == [f"frame_{n:06d}.jpg" for n in range(9)]
+    assert reported == paths
+    assert [frame_number_of(p) for p in paths] == list(range(0, FRAME_COUNT, 7))
+    # Kayıtlı indeks yoksa seri ön tarama yapılıp indeks yazılmaz
+    assert not (tmp_path / video_utils.KEYFRAME_INDEX_FILE).exists()
+
+def test_remove_segment_frames_only_touches_discarded_samples(tmp_path):
+    for n in range(12):
+        (tmp_path / f"frame_{n:06d}.jpg").write_bytes(b"")
+    (tmp_path / "notes.txt").write_text("")
+    removed = _remove_segment_frames(str(tmp_path), 5, [(20, 40), (50, None)])
+    assert removed == 6
+    assert sorted(os.listdir(tmp_path)) == [f"frame_{n:06d}.jpg" for n in (0, 1, 2, 3, 8, 9)] + ["notes.txt"]
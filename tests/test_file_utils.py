@@ -0,0 +1,52 @@
+import numpy as np
+
+from utils.box_set import BoxSet
+from utils.file_utils import (boxes_to_yolo, format_yolo_labels, load_annotations,
+                              parse_yolo_labels, save_annotations, yolo_to_boxes)
+
+LABELS = ["car", "person"]
+
+def test_parse_well_formed_text():
+    class_ids, yolo = parse_yolo_labels("0 0.5 0.5 0.2 0.2\n1 0.1 0.2 0.3 0.4\n\n")
+    assert class_ids.tolist() == [0, 1]
+    np.testing.assert_allclose(yolo, [[0.5, 0.5, 0.2, 0.2], [0.1, 0.2, 0.3, 0.4]])
+
+def test_parse_skips_malformed_lines():
+    text = "0 0.5 0.5 0.2 0.2\n1 0.1 0.2\nx 0.1 0.1 0.1 0.1\n1.5 0.1 0.1 0.1 0.1\n1 0.3 0.3 0.1 0.1\n"
+    class_ids, yolo = parse_yolo_labels(text)
+    assert class_ids.tolist() == [0, 1]
+    np.testing.assert_allclose(yolo[1], [0.3, 0.3, 0.1, 0.1])
+
+def test_parse_rejects_fractional_class_ids_on_fast_path():
+    class_ids, _ = parse_yolo_labels("1.5 0.1 0.1 0.1 0.1\n0 0.2 0.2 0.1 0.1\n")
+    assert class_ids.tolist() == [0]
+
+def test_parse_empty_text():
+    class_ids, yolo = parse_yolo_labels("")
+    assert class_ids.shape == (0,)
+    assert yolo.shape == (0, 4)
+
+def test_format_and_parse_round_trip():
+    coords = np.array([[10, 20, 110, 220], [0, 0, 639, 479]])
+    text = format_yolo_labels(coords, [1, 0], 640, 480)
+    assert text.splitlines()[0].split()[0] == "1"
+    class_ids, yolo = parse_yolo_labels(text)
+    boxes = yolo_to_boxes(class_ids, yolo, LABELS, 640, 480)
+    assert boxes.coords.tolist() == coords.tolist()
+    assert boxes.class_ids.tolist() == [1, 0]
+
+def test_yolo_to_boxes_drops_unknown_classes_and_clips():
+    boxes = yolo_to_boxes([0, 5], [[0.5, 0.5, 2.0, 2.0], [0.5, 0.5, 0.1, 0.1]], LABELS, 100, 50)
+    assert boxes.to_list() == [(0, 0, 99, 49, "car")]
+
+def test_boxes_to_yolo_is_normalised():
+    yolo = boxes_to_yolo([[0, 0, 50, 25]], 100, 50)
+    np.testing.assert_allclose(yolo, [[0.25, 0.25, 0.5, 0.5]])
+
+def test_save_and_load_annotations(tmp_path):
+    (tmp_path / "labels").mkdir()
+    frame_path = str(tmp_path / "frames" / "frame_000001.jpg")
+    boxes = BoxSet.from_boxes([(5, 6, 70, 80, "person")], LABELS)
+    assert save_annotations(boxes, LABELS, frame_path, str(tmp_path), img_size=(240, 320))
+    loaded = load_annotations(frame_path, str(tmp_path), LABELS, img_size=(240, 320))
+    assert loaded.to_list() == boxes.to_list()
@@ -0,0 +1,42 @@
+import numpy as np
+
+from utils.frame_store import FrameCache
+
+def frame(nbytes=100):
+    return np.zeros(nbytes, dtype=np.uint8)
+
+def test_evicts_least_recently_used():
+    cache = FrameCache(max_bytes=300)
+    for idx in range(3):
+        cache.put(idx, frame())
+    cache.get(0)
+    cache.put(3, frame())
+    assert 1 not in cache
+    assert all(idx in cache for idx in (0, 2, 3))
+
+def test_keeps_newest_item_even_if_over_budget():
+    cache = FrameCache(max_bytes=50)
+    cache.put(0, frame())
+    assert 0 in cache
+    cache.put(1, frame())
+    assert 0 not in cache and 1 in cache
+
+def test_pinned_item_is_never_evicted():
+    cache = FrameCache(max_bytes=250)
+    cache.put(0, frame())
+    cache.pin(0)
+    for idx in range(1, 6):
+        cache.put(idx, frame())
+    assert 0 in cache
+    assert cache.pinned_bytes() == 100
+    assert len(cache) == 2
+
+def test_unpin_allows_eviction():
+    cache = FrameCache(max_bytes=200)
+    cache.put(0, frame())
+    cache.pin(0)
+    cache.pin(None)
+    cache.put(1, frame())
+    cache.put(2, frame())
+    assert 0 not in cache
+    assert cache.pinned_bytes() == 0
@@ -0,0 +1,47 @@
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from utils import frame_writer
+from utils.frame_writer import FrameWriterPool
+
+def test_on_written_follows_submission_order(tmp_path, monkeypatch):
+    # İlk frame'in kodlanması geciktirilir, sonrakiler ondan önce biter
+    release = threading.Event()
+    imencode = cv2.imencode
+
+    def slow_imencode(ext, frame, params):
+        if frame[0, 0, 0] == 0:
+            release.wait(5)
+        return imencode(ext, frame, params)
+
+    monkeypatch.setattr(frame_writer.cv2, "imencode", slow_imencode)
+    reported = []
+    pool = FrameWriterPool(workers=4, on_written=lambda path, size: reported.append(path))
+    paths = [str(tmp_path / f"frame_{i:06d}.jpg") for i in range(6)]
+    for i, path in enumerate(paths):
+        pool.submit(np.full((8, 8, 3), i * 10, np.uint8), path, i)
+    assert reported == []
+    release.set()
+    written = pool.close()
+
+    assert reported == paths
+    assert [path for path, _ in written] == paths
+    assert all(size == (8, 8) for _, size in written)
+    assert pool.stats["written"] == 6
+
+def test_failed_frames_are_skipped_without_blocking_later_ones(tmp_path):
+    reported = []
+    pool = FrameWriterPool(workers=2, on_written=lambda path, size: reported.append(path))
+    good = [str(tmp_path / f"frame_{i:06d}.jpg") for i in (0, 2)]
+    pool.submit(np.zeros((8, 8, 3), np.uint8), good[0], 0)
+    pool.submit(np.zeros((8, 8, 3), np.uint8), str(tmp_path / "missing" / "frame.jpg"), 1)
+    pool.submit(np.zeros((8, 8, 3), np.uint8), good[1], 2)
+    written = pool.close()
+
+    assert reported == good
+    assert [path for path, _ in written] == good
+    assert pool.stats["failed"] == 1
+    assert sorted(os.listdir(tmp_path)) == ["frame_000000.jpg", "frame_000002.jpg"]
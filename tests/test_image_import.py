@@ -0,0 +1,53 @@
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from utils.image_import import import_images, is_jpeg
+
+def write_images(tmp_path):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    jpeg = str(src_dir / "a.jpg")
+    png = str(src_dir / "b.png")
+    broken = str(src_dir / "c.png")
+    cv2.imwrite(jpeg, np.full((30, 40, 3), 80, np.uint8))
+    cv2.imwrite(png, np.full((20, 10, 3), 160, np.uint8))
+    with open(broken, "wb") as f:
+        f.write(b"not an image")
+    return jpeg, png, broken
+
+def test_jpeg_is_linked_and_other_formats_transcoded(tmp_path):
+    jpeg, png, broken = write_images(tmp_path)
+    reported = []
+    frames = import_images([jpeg, broken, png], str(tmp_path / "out"), workers=2,
+                           frame_callback=lambda path, size: reported.append((path, size)))
+
+    frames_dir = tmp_path / "out" / "frames"
+    # Okunamayan dosya atlanır, diğerleri seçim sırasındaki adlarını korur
+    assert [os.path.basename(path) for path, _ in reported] == ["frame_000000.jpg", "frame_000002.jpg"]
+    assert [frames.get_path(i) for i in range(len(frames))] == [path for path, _ in reported]
+    assert os.path.samefile(jpeg, frames_dir / "frame_000000.jpg")
+    assert reported[1][1] == (20, 10)
+    assert is_jpeg(str(frames_dir / "frame_000002.jpg"))
+    assert frames.get_size(0) == (30, 40)
+
+def test_jpeg_is_copied_when_linking_is_disabled(tmp_path):
+    jpeg, _, _ = write_images(tmp_path)
+    frames = import_images([jpeg], str(tmp_path / "out"), link=False)
+    dst = frames.get_path(0)
+    assert not os.path.samefile(jpeg, dst)
+    with open(jpeg, "rb") as a, open(dst, "rb") as b:
+        assert a.read() == b.read()
+
+def test_cancel_stops_submitting_new_images(tmp_path):
+    jpeg, _, _ = write_images(tmp_path)
+    cancel_event = threading.Event()
+    frames = import_images([jpeg] * 40, str(tmp_path / "out"), workers=1,
+                           frame_callback=lambda path, size: cancel_event.set(),
+                           cancel_event=cancel_event)
+    # Sadece iptalden önce kuyruğa alınmış işler tamamlanır
+    assert 1 <= len(frames) <= 4
+    names = sorted(os.listdir(tmp_path / "out" / "frames"))
+    assert names == [f"frame_{i:06d}.jpg" for i in range(len(frames))]
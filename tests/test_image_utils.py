@@ -0,0 +1,136 @@
+import os
+
+import numpy as np
+from PIL import Image
+
+from utils import image_utils
+from utils.image_utils import (EXIF_ORIENTATION_TAG, ImagePyramid, Viewport, canvas_to_image_coords,
+                               get_image_size, image_to_canvas_coords, remember_image_size,
+                               render_view)
+
+def write_jpeg(path, width, height, orientation=None):
+    image = Image.fromarray(np.zeros((height, width, 3), dtype=np.uint8))
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[EXIF_ORIENTATION_TAG] = orientation
+    image.save(path, exif=exif)
+    return str(path)
+
+def bump_mtime(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+def test_reports_height_and_width(tmp_path):
+    path = write_jpeg(tmp_path / "a.jpg", 64, 48)
+    assert get_image_size(path) == (48, 64)
+
+def test_rotated_exif_orientation_swaps_dimensions(tmp_path):
+    for orientation in (5, 6, 7, 8):
+        path = write_jpeg(tmp_path / f"o{orientation}.jpg", 64, 48, orientation)
+        assert get_image_size(path) == (64, 48)
+    for orientation in (1, 2, 3, 4):
+        path = write_jpeg(tmp_path / f"o{orientation}.jpg", 64, 48, orientation)
+        assert get_image_size(path) == (48, 64)
+
+def test_missing_file_returns_none(tmp_path):
+    assert get_image_size(str(tmp_path / "missing.jpg")) is None
+
+def test_cached_size_is_reused_while_file_is_unchanged(tmp_path, monkeypatch):
+    path = write_jpeg(tmp_path / "a.jpg", 64, 48)
+    assert get_image_size(path) == (48, 64)
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("önbellekteki boyut tekrar okunmamalı")
+
+    monkeypatch.setattr(image_utils.Image, "open", fail_open)
+    assert get_image_size(path) == (48, 64)
+
+def test_cache_is_invalidated_when_file_changes(tmp_path):
+    path = write_jpeg(tmp_path / "a.jpg", 64, 48)
+    assert get_image_size(path) == (48, 64)
+    write_jpeg(path, 32, 16)
+    bump_mtime(path)
+    assert get_image_size(path) == (16, 32)
+
+def test_remember_image_size_fills_the_cache(tmp_path, monkeypatch):
+    path = write_jpeg(tmp_path / "a.jpg", 64, 48)
+    remember_image_size(path, (48, 64, 3))
+    monkeypatch.setattr(image_utils.Image, "open", None)
+    assert get_image_size(path) == (48, 64)
+
+def test_remember_image_size_ignores_missing_files(tmp_path):
+    path = str(tmp_path / "missing.jpg")
+    remember_image_size(path, (48, 64))
+    assert path not in image_utils._image_size_cache
+
+def test_viewport_scale_includes_fit_to_canvas_scale():
+    viewport = Viewport(200, 100, 400, 400)
+    assert viewport.scale == 2
+    assert (viewport.offset_x, viewport.offset_y) == (0, 100)
+    assert viewport.to_canvas(50, 25) == (100, 150)
+    assert viewport.to_image(100, 150) == (50, 25)
+
+    zoomed = Viewport(200, 100, 400, 400, zoom_factor=1.5)
+    assert zoomed.scale == 3
+
+def test_coordinate_helpers_round_trip_through_viewport():
+    for zoom, center in ((1.0, None), (4.0, None), (4.0, (30, 20))):
+        canvas_xy = image_to_canvas_coords(120, 60, 200, 100, 400, 400, zoom, center)
+        assert canvas_to_image_coords(*canvas_xy, 200, 100, 400, 400, zoom, center) == (120, 60)
+
+def test_zoomed_viewport_is_centred_and_clamped_to_image():
+    viewport = Viewport(200, 100, 400, 400, zoom_factor=4.0)
+    assert viewport.scale == 8
+    assert (viewport.offset_x, viewport.offset_y) == (-600, -200)
+    assert viewport.center == (100, 50)
+    assert viewport.visible_region() == (75, 25, 125, 75)
+
+    top_left = Viewport(200, 100, 400, 400, zoom_factor=4.0, center=(0, 0))
+    assert (top_left.offset_x, top_left.offset_y) == (0, 0)
+    assert top_left.visible_region() == (0, 0, 50, 50)
+
+    bottom_right = Viewport(200, 100, 400, 400, zoom_factor=4.0, center=(1000, 1000))
+    assert (bottom_right.offset_x, bottom_right.offset_y) == (-1200, -400)
+    assert bottom_right.visible_region() == (150, 50, 200, 100)
+
+def test_panned_moves_center_against_drag():
+    viewport = Viewport(200, 100, 400, 400, zoom_factor=4.0)
+    assert viewport.panned(80, -40) == (90, 55)
+
+def gradient_frame(width, height):
+    xs = np.tile(np.arange(width, dtype=np.uint8), (height, 1))
+    ys = np.tile(np.arange(height, dtype=np.uint8)[:, None], (1, width))
+    return np.dstack([xs, ys, np.zeros_like(xs)])
+
+def test_render_view_crops_visible_region_at_high_zoom():
+    frame = gradient_frame(200, 100)
+    viewport = Viewport(200, 100, 400, 400, zoom_factor=4.0, center=(60, 40))
+    view, canvas_x, canvas_y = render_view(frame, viewport)
+
+    # Çıktı tam frame'in büyütülmüş hali değil, sadece canvas boyutundadır
+    assert view.shape == (400, 400, 3)
+    x0, y0, _, _ = viewport.visible_region()
+    assert (canvas_x, canvas_y) == viewport.to_canvas(x0, y0)
+
+    # Canvas üzerindeki her noktada görüntü koordinatıyla aynı piksel görünür
+    for cx, cy in ((20, 20), (200, 200), (380, 300)):
+        img_x, img_y = viewport.to_image(cx, cy)
+        pixel = view[cy - canvas_y, cx - canvas_x]
+        assert abs(int(pixel[0]) - img_x) <= 1
+        assert abs(int(pixel[1]) - img_y) <= 1
+
+def test_render_view_fits_whole_frame_when_not_zoomed():
+    frame = gradient_frame(200, 100)
+    viewport = Viewport(200, 100, 400, 400)
+    view, canvas_x, canvas_y = render_view(frame, viewport)
+    assert view.shape == (200, 400, 3)
+    assert (canvas_x, canvas_y) == (0, 100)
+
+def test_render_view_uses_pyramid_level_when_zoomed_out():
+    frame = np.zeros((1024, 2048, 3), np.uint8)
+    pyramid = ImagePyramid(frame, min_size=128)
+    viewport = Viewport(2048, 1024, 512, 512)
+    assert pyramid.level_for_scale(viewport.scale).shape[:2] == (256, 512)
+    view, canvas_x, canvas_y = render_view(pyramid, viewport)
+    assert view.shape == (256, 512, 3)
+    assert (canvas_x, canvas_y) == (0, 128)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from utils.box_set import BoxSet
+from utils.label_index import LabelIndex
+
+LABELS = ["car", "person", "dog"]
+
+def make_session(tmp_path):
+    (tmp_path / "labels").mkdir()
+    frame_paths = [str(tmp_path / "frames" / f"frame_{i:06d}.jpg") for i in range(4)]
+    (tmp_path / "labels" / "frame_000000.txt").write_text("0 0.5 0.5 0.2 0.2\n2 0.1 0.1 0.1 0.1\n")
+    (tmp_path / "labels" / "frame_000002.txt").write_text("")
+    (tmp_path / "labels" / "frame_000003.txt").write_text("1 0.5 0.5 0.5 0.5\n")
+    return frame_paths
+
+def test_load_builds_columnar_index(tmp_path):
+    index = LabelIndex(4)
+    assert index.get(0) is None
+    assert index.load(make_session(tmp_path), str(tmp_path))
+    class_ids, boxes = index.get(0)
+    assert class_ids.tolist() == [0, 2]
+    np.testing.assert_allclose(boxes[0], [0.5, 0.5, 0.2, 0.2])
+    assert len(index.get(1)[0]) == 0
+    assert [index.has_label_file(i) for i in range(4)] == [True, False, True, True]
+
+def test_saved_boxes_override_loaded_ones(tmp_path):
+    index = LabelIndex(4)
+    index.load(make_session(tmp_path), str(tmp_path))
+    index.set_boxes(1, BoxSet(LABELS, [[0, 0, 50, 100]], [2]), (100, 100))
+    assert index.has_label_file(1)
+    assert index.get_boxes(1, LABELS, (100, 100)).to_list() == [(0, 0, 50, 99, "dog")]
+
+def test_remove_class_remaps_and_reports_affected_frames(tmp_path):
+    index = LabelIndex(4)
+    index.load(make_session(tmp_path), str(tmp_path))
+    index.set_boxes(1, BoxSet(LABELS, [[0, 0, 10, 10]], [0]), (100, 100))
+    assert index.remove_class(1) == [0, 3]
+    assert index.get(0)[0].tolist() == [0, 1]
+    assert len(index.get(3)[0]) == 0
+    # Sınıfı silinenden küçük olan kaydedilmiş frame değişmez
+    assert index.get(1)[0].tolist() == [0]
@@ -0,0 +1,102 @@
+import os
+import queue
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from gui import main_window
+from gui.main_window import MainWindow
+from utils.background_writer import BackgroundWriter
+from utils.box_set import BoxSet
+from utils.frame_store import FrameStore
+
+LABELS = ["car", "person"]
+
+def make_window(tmp_path, frame_count=1):
+    """Kaydetme yolunun kullandığı durumla, Tk penceresi açmadan ana pencere oluştur"""
+    os.makedirs(tmp_path / "frames")
+    os.makedirs(tmp_path / "labels")
+    frame_paths = []
+    for i in range(frame_count):
+        frame_path = str(tmp_path / "frames" / f"frame_{i:06d}.jpg")
+        cv2.imwrite(frame_path, np.zeros((48, 64, 3), np.uint8))
+        frame_paths.append(frame_path)
+
+    window = MainWindow.__new__(MainWindow)
+    window.root = mock.MagicMock()
+    window.status_bar = mock.MagicMock()
+    window.unsaved_label = mock.MagicMock()
+    window.video_path = None
+    window.output_dir = str(tmp_path)
+    window.frames = FrameStore(frame_paths)
+    window.manifest = None
+    window.label_index = None
+    window.saved_box_hashes = {}
+    window.label_write_stats = {"written": 0, "skipped": 0}
+    window.file_writer = BackgroundWriter()
+    window.label_write_failures = queue.Queue()
+    window.unsaved_job = None
+    window.session_file = "session_info.json"
+    window.current_frame_idx = 0
+    window.labels = list(LABELS)
+    window.current_boxes = BoxSet(window.labels)
+    return window
+
+def test_save_annotations_with_boxes(tmp_path, monkeypatch):
+    showinfo = mock.MagicMock()
+    monkeypatch.setattr(main_window.messagebox, "showinfo", showinfo)
+    window = make_window(tmp_path)
+    window.current_boxes.append((8, 12, 40, 36, "person"))
+
+    window.save_annotations()
+    window.file_writer.close()
+
+    showinfo.assert_called_once()
+    window.status_bar.config.assert_called_with(text="Etiketler kaydedildi: frame_000000.jpg")
+    label_text = (tmp_path / "labels" / "frame_000000.txt").read_text()
+    assert label_text.split()[0] == "1"
+    assert (tmp_path / "session_info.json").exists()
+
+def test_failed_label_write_is_handled_on_tk_thread(tmp_path, monkeypatch):
+    monkeypatch.setattr(main_window, "save_annotations", lambda *args: False)
+    window = make_window(tmp_path)
+    window.current_boxes.append((8, 12, 40, 36, "car"))
+    frame_path = window.frames.get_path(0)
+
+    assert window.save_current_annotations()
+    assert window.file_writer.flush(timeout=5)
+    # Yazıcının iş parçacığı Tk'ye dokunmaz, özet gösterge güncellenene kadar durur
+    assert all(call.args[1:2] != (window.on_label_write_failed,) for call in window.root.after.call_args_list)
+    assert frame_path in window.saved_box_hashes
+
+    window.update_unsaved_indicator()
+    assert frame_path not in window.saved_box_hashes
+    window.file_writer.close()
+
+def test_unchanged_boxes_are_not_rewritten(tmp_path, monkeypatch):
+    writes = []
+
+    def counting_save(*args):
+        writes.append(args[2])
+        return real_save(*args)
+
+    real_save = main_window.save_annotations
+    monkeypatch.setattr(main_window, "save_annotations", counting_save)
+    window = make_window(tmp_path)
+    window.current_boxes.append((8, 12, 40, 36, "car"))
+
+    assert window.save_current_annotations()
+    assert window.save_current_annotations()
+    assert window.file_writer.flush(timeout=5)
+    assert len(writes) == 1
+    assert window.label_write_stats == {"written": 1, "skipped": 1}
+
+    # Değişen kutular tekrar yazılır
+    window.current_boxes.append((20, 20, 30, 30, "person"))
+    assert window.save_current_annotations()
+    window.file_writer.close()
+    assert len(writes) == 2
+    assert window.label_write_stats == {"written": 2, "skipped": 1}
+    label_lines = (tmp_path / "labels" / "frame_000000.txt").read_text().splitlines()
+    assert [line.split()[0] for line in label_lines] == ["0", "1"]
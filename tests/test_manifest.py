@@ -0,0 +1,124 @@
+import os
+
+import cv2
+import numpy as np
+
+from utils.manifest import DatasetManifest, file_hash, open_manifest
+
+def make_frames(tmp_path, count=3):
+    os.makedirs(tmp_path / "frames")
+    os.makedirs(tmp_path / "labels")
+    frame_paths = []
+    for i in range(count):
+        frame_path = str(tmp_path / "frames" / f"frame_{i:06d}.jpg")
+        cv2.imwrite(frame_path, np.full((48, 64, 3), i * 40, np.uint8))
+        frame_paths.append(frame_path)
+    return frame_paths
+
+def read_rows(manifest):
+    return manifest._conn.execute("SELECT idx, path, height, width, mtime, hash, labeled "
+                                  "FROM frames ORDER BY idx").fetchall()
+
+def test_round_trip_keeps_paths_sizes_and_label_status(tmp_path):
+    frame_paths = make_frames(tmp_path)
+    (tmp_path / "labels" / "frame_000000.txt").write_text("0 0.5 0.5 0.1 0.1\n")
+    (tmp_path / "labels" / "frame_000001.txt").write_text("")
+
+    manifest = DatasetManifest(str(tmp_path))
+    for idx, frame_path in enumerate(frame_paths):
+        manifest.add_frame(idx, frame_path, (48, 64))
+    manifest.commit()
+    manifest.close()
+
+    assert DatasetManifest.exists(str(tmp_path))
+    manifest = open_manifest(str(tmp_path))
+    rows = read_rows(manifest)
+    assert [row[1] for row in rows] == [os.path.join("frames", f"frame_{i:06d}.jpg") for i in range(3)]
+    assert [row[6] for row in rows] == [1, 0, None]
+
+    frames = manifest.load_frame_store()
+    assert frames.frame_paths == frame_paths
+    assert all(frames.frame_sizes[i] == (48, 64) for i in range(3))
+    manifest.close()
+
+def test_uncommitted_frames_are_not_persisted(tmp_path):
+    frame_paths = make_frames(tmp_path, count=1)
+    manifest = DatasetManifest(str(tmp_path))
+    manifest.add_frame(0, frame_paths[0])
+    manifest._conn.rollback()
+    assert read_rows(manifest) == []
+    manifest.close()
+
+def test_set_label_status_updates_row(tmp_path):
+    frame_paths = make_frames(tmp_path, count=1)
+    manifest = DatasetManifest(str(tmp_path))
+    manifest.add_frame(0, frame_paths[0])
+    manifest.commit()
+
+    manifest.set_label_status(0, True)
+    assert read_rows(manifest)[0][6] == 1
+    manifest.set_label_status(0, None)
+    assert read_rows(manifest)[0][6] is None
+    manifest.close()
+
+def test_refresh_fills_missing_size_mtime_and_hash(tmp_path):
+    frame_paths = make_frames(tmp_path)
+    manifest = DatasetManifest(str(tmp_path))
+    for idx, frame_path in enumerate(frame_paths):
+        manifest.add_frame(idx, frame_path)
+    manifest.commit()
+
+    (tmp_path / "labels" / "frame_000002.txt").write_text("1 0.5 0.5 0.2 0.2\n")
+    manifest.refresh()
+
+    for idx, path, height, width, mtime, digest, labeled in read_rows(manifest):
+        frame_path = frame_paths[idx]
+        assert (height, width) == (48, 64)
+        assert mtime == os.stat(frame_path).st_mtime
+        assert digest == file_hash(frame_path)
+    assert [row[6] for row in read_rows(manifest)] == [None, None, 1]
+    manifest.close()
+
+def test_refresh_rehashes_changed_files_only(tmp_path):
+    frame_paths = make_frames(tmp_path, count=2)
+    manifest = DatasetManifest(str(tmp_path))
+    for idx, frame_path in enumerate(frame_paths):
+        manifest.add_frame(idx, frame_path)
+    manifest.commit()
+    manifest.refresh()
+    before = read_rows(manifest)
+
+    cv2.imwrite(frame_paths[1], np.full((24, 32, 3), 200, np.uint8))
+    stat = os.stat(frame_paths[1])
+    os.utime(frame_paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**10))
+    manifest.refresh()
+    after = read_rows(manifest)
+
+    assert after[0] == before[0]
+    assert after[1][2:4] == (24, 32)
+    assert after[1][5] == file_hash(frame_paths[1]) != before[1][5]
+    manifest.close()
+
+def test_refresh_skips_missing_files(tmp_path):
+    frame_paths = make_frames(tmp_path, count=2)
+    manifest = DatasetManifest(str(tmp_path))
+    for idx, frame_path in enumerate(frame_paths):
+        manifest.add_frame(idx, frame_path)
+    manifest.commit()
+    os.remove(frame_paths[0])
+
+    manifest.refresh()
+    rows = read_rows(manifest)
+    assert rows[0][5] is None
+    assert rows[1][5] == file_hash(frame_paths[1])
+    manifest.close()
+
+def test_clear_removes_all_frames(tmp_path):
+    frame_paths = make_frames(tmp_path)
+    manifest = DatasetManifest(str(tmp_path))
+    for idx, frame_path in enumerate(frame_paths):
+        manifest.add_frame(idx, frame_path)
+    manifest.commit()
+    manifest.clear()
+    assert manifest.load_frame_store().frame_paths == []
+    manifest.close()
@@ -1,94 +1,176 @@
-import cv2
 import numpy as np
 
+from utils.box_set import BoxSet
+from utils.image_utils import Viewport
+
 def find_box_at_position(img_x, img_y, boxes):
-    """Belirtilen konumda bir kutu var mı kontrol et"""
-    # Önce kutunun içinde mi kontrol et
-    for i, box in enumerate(boxes):
-        x1, y1, x2, y2, _ = box
-        # Kutunun içinde mi kontrol et (kenarlar dahil)
-        if x1 <= img_x <= x2 and y1 <= img_y <= y2:
-            return i
-    return -1
+    """Belirtilen konumdaki kutunun indeksini döndür, yoksa -1
 
-def draw_boxes(canvas, boxes, img_width, img_height, canvas_width, canvas_height, 
-              zoom_factor, selected_indices, label_colors=None, hover_index=-1):
-    """Canvas üzerine kutuları çiz"""
-    if not boxes:
-        return
-    
-    # Önce tüm kutu ve etiketleri temizle
-    canvas.delete("box")
-    canvas.delete("label")
-    canvas.delete("overlay")
-    
-    # Etiket renkleri yoksa varsayılan olarak kırmızı kullan
-    if label_colors is None:
-        label_colors = {}
-    
-    # Canvas merkezleme ofsetini hesapla
-    offset_x = (canvas_width - img_width * zoom_factor) // 2
-    offset_y = (canvas_height - img_height * zoom_factor) // 2
-    
-    # Eğer fare bir kutunun üzerindeyse, tüm ekranı karartacak bir overlay oluştur
-    if hover_index >= 0:
-        # Tüm ekranı kaplayan karartma katmanı
-        canvas.create_rectangle(
-            0, 0, canvas_width, canvas_height,
-            fill="black", stipple="gray50", tags="overlay"
+    İç içe geçen kutularda en küçüğü seçilir, böylece büyük bir kutunun
+    içindeki küçük kutu da seçilebilir. boxes bir BoxSet veya (x1, y1, x2,
+    y2, etiket) listesi olabilir; arama BoxSet.find_at ile yapılır.
+    """
+    if not isinstance(boxes, BoxSet):
+        boxes = BoxSet(coords=[box[:4] for box in boxes], class_ids=np.zeros(len(boxes)))
+    return boxes.find_at(img_x, img_y)
+
+class BoxRenderer:
+    """Kutuları canvas üzerinde kalıcı öğeler olarak tutan çizici
+
+    Her kutu için çerçeve ve etiket öğelerinin kimlikleri saklanır. Her
+    güncellemede sadece konumu, etiketi veya stili değişen öğeler coords ve
+    itemconfig ile güncellenir; eklenen kutular için öğe oluşturulur, silinen
+    kutuların öğeleri kaldırılır.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._items = []   # Kutu başına (çerçeve, etiket) öğe kimlikleri
+        self._states = []  # Kutu başına son çizilen (koordinatlar, etiket, renk, kalınlık)
+        self._dim_item = None
+        self._hover_item = None
+        self._overlay_states = {}  # Öğe -> son uygulanan (koordinatlar veya None: gizli)
+
+    def reset(self):
+        """Canvas temizlendiğinde saklanan öğe kimliklerini unut"""
+        self._items = []
+        self._states = []
+        self._dim_item = None
+        self._hover_item = None
+        self._overlay_states = {}
+
+    def _set_overlay(self, item, coords):
+        """Karartma/vurgu öğesini verilen koordinatlarda göster, coords None ise gizle"""
+        if item in self._overlay_states and self._overlay_states[item] == coords:
+            return
+        if coords is None:
+            self.canvas.itemconfigure(item, state="hidden")
+        else:
+            self.canvas.coords(item, *coords)
+            self.canvas.itemconfigure(item, state="normal")
+        self._overlay_states[item] = coords
+
+    def _ensure_overlay_items(self):
+        """Hover karartma ve vurgu öğelerini (gizli olarak) oluştur"""
+        # Canvas başka bir yerde temizlendiyse öğeler artık yoktur
+        if self._dim_item is not None and self.canvas.type(self._dim_item):
+            return
+        self.reset()
+        self._dim_item = self.canvas.create_rectangle(
+            0, 0, 0, 0, fill="black", stipple="gray50", outline="",
+            state="hidden", tags="overlay"
         )
-    
-    # Tüm kutuları çiz
-    for i, box in enumerate(boxes):
-        x1, y1, x2, y2, label = box
+        self._hover_item = self.canvas.create_rectangle(
+            0, 0, 0, 0, fill="cyan", stipple="gray25", outline="",
+            state="hidden", tags="overlay"
+        )
+        self._overlay_states = {self._dim_item: None, self._hover_item: None}
+
+    def update(self, boxes, img_width, img_height, canvas_width, canvas_height,
+               zoom_factor, selected_indices, label_colors=None, hover_index=-1, center=None):
+        """Kutuları verilen duruma getir, sadece farkları canvas'a uygula"""
+        canvas = self.canvas
+        self._ensure_overlay_items()
         
-        # Koordinatları ölçeklendir
-        x1_scaled = int(x1 * zoom_factor)
-        y1_scaled = int(y1 * zoom_factor)
-        x2_scaled = int(x2 * zoom_factor)
-        y2_scaled = int(y2 * zoom_factor)
+        # Etiket renkleri yoksa varsayılan olarak kırmızı kullan
+        if label_colors is None:
+            label_colors = {}
+        selected = set(selected_indices)
         
-        # Kutuyu çiz - seçili kutu farklı renkte
-        # Etiket için özel renk varsa kullan, yoksa varsayılan renkleri kullan
-        outline_color = label_colors.get(label, "red")
+        # Görüntünün canvas üzerindeki ölçeği ve kaydırması
+        viewport = Viewport(img_width, img_height, canvas_width, canvas_height, zoom_factor, center)
         
-        # Seçili kutular için farklı renk ve kalınlık
-        if i in selected_indices:
-            outline_color = "yellow"  # Seçili kutu her zaman sarı
-            width = 3
-        elif i == hover_index:
-            outline_color = "cyan"  # Fare üzerindeyken turkuaz
-            width = 3
-            
-            # Hover durumunda, kutunun içini yarı saydam göster (overlay üzerine)
-            canvas.create_rectangle(
-                x1_scaled + offset_x,
-                y1_scaled + offset_y,
-                x2_scaled + offset_x,
-                y2_scaled + offset_y,
-                fill="cyan", stipple="gray25", outline="", tags="overlay"
-            )
+        # Fare bir kutunun üzerindeyse ekranı karart ve kutunun içini vurgula
+        if 0 <= hover_index < len(boxes):
+            self._set_overlay(self._dim_item, (0, 0, canvas_width, canvas_height))
         else:
-            width = 2
+            self._set_overlay(self._dim_item, None)
         
-        # Kenarlık çiz
-        canvas.create_rectangle(
-            x1_scaled + offset_x,
-            y1_scaled + offset_y,
-            x2_scaled + offset_x,
-            y2_scaled + offset_y,
-            outline=outline_color, width=width, fill="", tags=("box", f"box_outline_{i}")
-        )
+        hover_fill = None
         
-        # Etiketi çiz
-        canvas.create_text(
-            x1_scaled + offset_x,
-            y1_scaled + offset_y - 10,
-            text=label, fill=outline_color, anchor="sw", tags=("label", f"label_{i}")
-        )
+        # Koordinatları tek seferde canvas'a dönüştür (Viewport.to_canvas ile aynı yuvarlama)
+        if isinstance(boxes, BoxSet):
+            img_coords = boxes.coords
+        else:
+            img_coords = np.array([box[:4] for box in boxes], dtype=np.int64).reshape(-1, 4)
+        offsets = np.array([viewport.offset_x, viewport.offset_y] * 2, dtype=np.int64)
+        canvas_coords = ((img_coords * viewport.scale).astype(np.int64) + offsets).tolist()
+        
+        for i, (box, coords) in enumerate(zip(boxes, canvas_coords)):
+            label = box[4]
+            coords = tuple(coords)
+            
+            # Seçili kutu her zaman sarı, fare üzerindeki turkuaz
+            if i in selected:
+                color, width = "yellow", 3
+            elif i == hover_index:
+                color, width = "cyan", 3
+                hover_fill = coords
+            else:
+                color, width = label_colors.get(label, "red"), 2
+            
+            state = (coords, label, color, width)
+            
+            if i >= len(self._items):
+                # Yeni kutu
+                rect = canvas.create_rectangle(
+                    *coords, outline=color, width=width, fill="",
+                    tags=("box", f"box_outline_{i}")
+                )
+                text = canvas.create_text(
+                    coords[0], coords[1] - 10, text=label, fill=color, anchor="sw",
+                    tags=("label", f"label_{i}")
+                )
+                self._items.append((rect, text))
+                self._states.append(state)
+                continue
+            
+            old = self._states[i]
+            if old == state:
+                continue
+            
+            rect, text = self._items[i]
+            if old[0] != coords:
+                canvas.coords(rect, *coords)
+                canvas.coords(text, coords[0], coords[1] - 10)
+            if old[2] != color or old[3] != width:
+                canvas.itemconfigure(rect, outline=color, width=width)
+                canvas.itemconfigure(text, fill=color)
+            if old[1] != label:
+                canvas.itemconfigure(text, text=label)
+            self._states[i] = state
+        
+        # Silinen kutuların öğelerini kaldır
+        for rect, text in self._items[len(boxes):]:
+            canvas.delete(rect, text)
+        del self._items[len(boxes):]
+        del self._states[len(boxes):]
+        
+        self._set_overlay(self._hover_item, hover_fill)
+
+def draw_boxes(canvas, boxes, img_width, img_height, canvas_width, canvas_height, 
+              zoom_factor, selected_indices, label_colors=None, hover_index=-1, center=None):
+    """Canvas üzerine kutuları çiz (canvas'a bağlı BoxRenderer ile sadece farklar çizilir)"""
+    # Çizici, PhotoImage referansı gibi canvas üzerinde saklanır
+    renderer = getattr(canvas, "box_renderer", None)
+    if renderer is None:
+        renderer = BoxRenderer(canvas)
+        canvas.box_renderer = renderer
+    
+    renderer.update(boxes or [], img_width, img_height, canvas_width, canvas_height,
+                    zoom_factor, selected_indices, label_colors, hover_index, center)
 
-def move_box(box, dx, dy, img_width, img_height):
-    """Kutuyu belirtilen miktarda taşı"""
+def move_box(box, dx, dy, img_width, img_height, indices=None):
+    """Kutuyu belirtilen miktarda taşı
+
+    box bir BoxSet ise indices kutuları (None ise tümü) taşınmış yeni bir
+    küme döndürülür; sınır dışına çıkacak kutular yerinde kalır.
+    """
+    if isinstance(box, BoxSet):
+        moved = box.copy()
+        moved.translate(dx, dy, indices, img_width, img_height)
+        return moved
+    
     x1, y1, x2, y2, label = box
     
     # Yeni koordinatlar
@@ -103,8 +185,17 @@ def move_box(box, dx, dy, img_width, img_height):
     
     return box
 
-def resize_box(box, x1_delta, y1_delta, x2_delta, y2_delta, img_width, img_height):
-    """Kutuyu yeniden boyutlandır"""
+def resize_box(box, x1_delta, y1_delta, x2_delta, y2_delta, img_width, img_height, indices=None):
+    """Kutuyu yeniden boyutlandır
+
+    box bir BoxSet ise indices kutuları (None ise tümü) yeniden boyutlandırılmış
+    yeni bir küme döndürülür.
+    """
+    if isinstance(box, BoxSet):
+        resized = box.copy()
+        resized.adjust((x1_delta, y1_delta, x2_delta, y2_delta), indices, img_width, img_height)
+        return resized
+    
     x1, y1, x2, y2, label = box
     
     # Yeni koordinatlar
@@ -0,0 +1,87 @@
+import threading
+
+# Yazılmayı bekleyen en fazla bu kadar farklı dosya tutulur
+MAX_PENDING_WRITES = 256
+
+class BackgroundWriter:
+    """Dosya yazma işlerini tek bir arka plan iş parçacığında yapan yazıcı
+
+    Her iş hedef dosyanın yolu ile gönderilir. Aynı dosya için yazılmayı
+    bekleyen bir iş varsa yenisiyle değiştirilir, böylece art arda gelen
+    güncellemelerden sadece sonuncusu yazılır. Bekleyen iş sayısı
+    max_pending'e ulaşırsa submit() yer açılana kadar bekler.
+    """
+
+    def __init__(self, max_pending=MAX_PENDING_WRITES):
+        self.max_pending = max_pending
+        self.stats = {"written": 0, "coalesced": 0, "failed": 0}
+
+        self._pending = {}
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def submit(self, path, func, *args, on_error=None):
+        """func(*args) ile path dosyasını yazma işini kuyruğa ekle
+
+        func False döndürür veya hata verirse on_error(path) arka plan iş
+        parçacığında çağrılır. Yazıcı kapatıldıysa iş hemen yapılır.
+        """
+        with self._cond:
+            if not self._closed:
+                if path in self._pending:
+                    self.stats["coalesced"] += 1
+                else:
+                    self._cond.wait_for(lambda: len(self._pending) < self.max_pending)
+                self._pending[path] = (func, args, on_error)
+                self._cond.notify_all()
+                return
+        self._run(path, func, args, on_error)
+
+    def pending_count(self):
+        """Henüz diske yazılmamış dosya sayısı"""
+        with self._cond:
+            return len(self._pending) + int(self._busy)
+
+    def flush(self, timeout=None):
+        """Bekleyen tüm işler yazılana kadar bekle, zaman aşımında False döndür"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self):
+        """Bekleyen işleri yaz ve iş parçacığını durdur"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self, path, func, args, on_error):
+        try:
+            ok = func(*args) is not False
+        except Exception as e:
+            print(f"Dosya yazılamadı: {path} - {e}")
+            ok = False
+        if not ok and on_error:
+            on_error(path)
+        return ok
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                # En eski iş önce yazılır
+                path = next(iter(self._pending))
+                func, args, on_error = self._pending.pop(path)
+                self._busy = True
+                self._cond.notify_all()
+
+            ok = self._run(path, func, args, on_error)
+
+            with self._cond:
+                self._busy = False
+                self.stats["written" if ok else "failed"] += 1
+                self._cond.notify_all()
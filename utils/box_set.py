@@ -0,0 +1,243 @@
+import hashlib
+import numpy as np
+
+class BoxSet:
+    """Kutuları bitişik numpy dizilerinde tutan küme
+
+    Koordinatlar (N, 4) int32 [x1, y1, x2, y2], sınıflar (N,) int32 sınıf
+    ID'si olarak saklanır; ID, paylaşılan etiket listesindeki (labels)
+    sıradır. Liste gibi indekslenip gezilebilir, elemanlar (x1, y1, x2, y2,
+    etiket) tuple'larıdır. copy() dizileri kopyalamaz; iki kümeden biri ilk
+    kez değiştirildiğinde kendi kopyasını alır (yazarken kopyala).
+    """
+
+    def __init__(self, labels=None, coords=None, class_ids=None):
+        self.labels = labels if labels is not None else []
+        if coords is None:
+            coords = np.empty((0, 4), dtype=np.int32)
+            class_ids = np.empty(0, dtype=np.int32)
+        self._coords = np.asarray(coords, dtype=np.int32).reshape(-1, 4)
+        self._class_ids = np.asarray(class_ids, dtype=np.int32).reshape(-1)
+        self._size = len(self._class_ids)
+        self._owned = True
+
+    @classmethod
+    def from_boxes(cls, boxes, labels):
+        """(x1, y1, x2, y2, etiket) tuple'larından küme oluştur (listede olmayan etiketler atlanır)"""
+        class_index = {label: i for i, label in enumerate(labels)}
+        rows = [(box[:4], class_index[box[4]]) for box in boxes if box[4] in class_index]
+        if not rows:
+            return cls(labels)
+        coords, class_ids = zip(*rows)
+        return cls(labels, coords, class_ids)
+
+    @property
+    def coords(self):
+        """Kutu koordinatları (N, 4), salt okunur görünüm"""
+        view = self._coords[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def class_ids(self):
+        """Sınıf ID'leri (N,), salt okunur görünüm"""
+        view = self._class_ids[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self._size
+        if not 0 <= idx < self._size:
+            raise IndexError("Kutu indeksi aralık dışında")
+        x1, y1, x2, y2 = (int(v) for v in self._coords[idx])
+        return (x1, y1, x2, y2, self.label_of(self._class_ids[idx]))
+
+    def __repr__(self):
+        return f"BoxSet({list(self)!r})"
+
+    def label_of(self, class_id):
+        """Sınıf ID'sinin etiket adı (listede yoksa None)"""
+        return self.labels[class_id] if 0 <= class_id < len(self.labels) else None
+
+    def class_id_of(self, label):
+        """Etiket adının sınıf ID'si"""
+        try:
+            return self.labels.index(label)
+        except ValueError:
+            raise ValueError(f"Etiket listede bulunamadı: {label}")
+
+    def content_hash(self):
+        """Kutu içeriğinin özeti (kaydedilmiş hali ile karşılaştırmak için)"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(self.coords).tobytes())
+        digest.update(np.ascontiguousarray(self.class_ids).tobytes())
+        return digest.hexdigest()
+
+    def to_list(self):
+        """Kutuları (x1, y1, x2, y2, etiket) tuple listesi olarak döndür"""
+        return list(self)
+
+    def copy(self):
+        """Kümenin anlık görüntüsü (diziler ilk değişiklikte kopyalanır)"""
+        other = BoxSet(self.labels)
+        other._coords = self._coords
+        other._class_ids = self._class_ids
+        other._size = self._size
+        other._owned = False
+        self._owned = False
+        return other
+
+    def _own(self, capacity=0):
+        """Değiştirmeden önce dizilerin bu kümeye ait olmasını ve yeterli kapasiteyi sağla"""
+        if self._owned and capacity <= len(self._class_ids):
+            return
+        capacity = max(capacity, self._size)
+        if capacity > len(self._class_ids):
+            # Ekleme maliyeti sabit kalsın diye kapasite ikiye katlanır
+            capacity = max(capacity, 2 * len(self._class_ids), 8)
+        coords = np.empty((capacity, 4), dtype=np.int32)
+        class_ids = np.empty(capacity, dtype=np.int32)
+        coords[:self._size] = self._coords[:self._size]
+        class_ids[:self._size] = self._class_ids[:self._size]
+        self._coords, self._class_ids = coords, class_ids
+        self._owned = True
+
+    def append(self, box):
+        """(x1, y1, x2, y2, etiket) kutusunu sona ekle"""
+        class_id = self.class_id_of(box[4])
+        self._own(self._size + 1)
+        self._coords[self._size] = box[:4]
+        self._class_ids[self._size] = class_id
+        self._size += 1
+
+    def pop(self, idx=-1):
+        """Kutuyu kümeden çıkar ve döndür"""
+        box = self[idx]
+        self.delete([idx])
+        return box
+
+    def delete(self, indices):
+        """Verilen indekslerdeki kutuları tek seferde sil (geçersiz indeksler yok sayılır)"""
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        indices = np.where(indices < 0, indices + self._size, indices)
+        indices = indices[(indices >= 0) & (indices < self._size)]
+        if not len(indices):
+            return
+        keep = np.ones(self._size, dtype=bool)
+        keep[indices] = False
+        coords = self._coords[:self._size][keep]
+        class_ids = self._class_ids[:self._size][keep]
+        self._coords, self._class_ids = coords, class_ids
+        self._size = len(class_ids)
+        self._owned = True
+
+    def remove_class(self, class_id):
+        """Silinen etiketi kümeden çıkar
+
+        O sınıftaki kutular silinir, daha büyük sınıf ID'leri bir azaltılır;
+        etiket listesinden bir etiket kaldırıldığında çağrılmalıdır.
+        """
+        self.delete(np.flatnonzero(self.class_ids == class_id))
+        self._own()
+        class_ids = self._class_ids[:self._size]
+        class_ids[class_ids > class_id] -= 1
+
+    def _select(self, indices):
+        """indices None ise tüm kutular, değilse verilen kutular için maske"""
+        mask = np.zeros(self._size, dtype=bool)
+        if indices is None:
+            mask[:] = True
+        else:
+            indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+            mask[indices[(indices >= 0) & (indices < self._size)]] = True
+        return mask
+
+    def areas(self):
+        """Kutu alanları (N,)"""
+        coords = self.coords.astype(np.int64)
+        return (coords[:, 2] - coords[:, 0]) * (coords[:, 3] - coords[:, 1])
+
+    def clip(self, img_width, img_height):
+        """Tüm kutuları görüntü sınırları içine al"""
+        self._own()
+        coords = self._coords[:self._size]
+        np.clip(coords[:, 0::2], 0, img_width - 1, out=coords[:, 0::2])
+        np.clip(coords[:, 1::2], 0, img_height - 1, out=coords[:, 1::2])
+
+    def translate(self, dx, dy, indices=None, img_width=None, img_height=None):
+        """Kutuları (dx, dy) kadar taşı
+
+        Görüntü boyutu verilirse sınır dışına çıkacak kutular yerinde bırakılır.
+        """
+        mask = self._select(indices)
+        moved = self._coords[:self._size] + np.array([dx, dy, dx, dy], dtype=np.int32)
+        if img_width is not None and img_height is not None:
+            mask &= ((moved[:, 0] >= 0) & (moved[:, 1] >= 0) &
+                     (moved[:, 2] < img_width) & (moved[:, 3] < img_height))
+        if not mask.any():
+            return
+        self._own()
+        self._coords[:self._size][mask] = moved[mask]
+
+    def adjust(self, deltas, indices=None, img_width=None, img_height=None):
+        """Kutu kenarlarını (dx1, dy1, dx2, dy2) kadar kaydır (yeniden boyutlandırma)
+
+        Görüntü boyutu verilirse sonuç sınırlara kırpılır; geçersiz hale
+        gelen (x2 <= x1 veya y2 <= y1) kutular değiştirilmez.
+        """
+        mask = self._select(indices)
+        resized = self._coords[:self._size] + np.asarray(deltas, dtype=np.int32)
+        if img_width is not None and img_height is not None:
+            np.clip(resized[:, 0::2], 0, img_width - 1, out=resized[:, 0::2])
+            np.clip(resized[:, 1::2], 0, img_height - 1, out=resized[:, 1::2])
+        mask &= (resized[:, 2] > resized[:, 0]) & (resized[:, 3] > resized[:, 1])
+        if not mask.any():
+            return
+        self._own()
+        self._coords[:self._size][mask] = resized[mask]
+
+    def scale(self, sx, sy=None):
+        """Koordinatları ölçekle (ör. farklı çözünürlükteki görüntüye aktarırken)"""
+        sy = sx if sy is None else sy
+        self._own()
+        coords = self._coords[:self._size]
+        coords[:] = np.rint(coords * np.array([sx, sy, sx, sy]))
+
+    def find_at(self, img_x, img_y):
+        """Noktayı içeren (kenarlar dahil) en küçük alanlı kutunun indeksini döndür, yoksa -1"""
+        coords = self.coords
+        inside = ((np.minimum(coords[:, 0], coords[:, 2]) <= img_x) &
+                  (img_x <= np.maximum(coords[:, 0], coords[:, 2])) &
+                  (np.minimum(coords[:, 1], coords[:, 3]) <= img_y) &
+                  (img_y <= np.maximum(coords[:, 1], coords[:, 3])))
+        if not inside.any():
+            return -1
+        # Eşit alanlarda önce gelen kutu seçilir
+        return int(np.argmin(np.where(inside, np.abs(self.areas()), np.iinfo(np.int64).max)))
+
+    def iou(self, other):
+        """Bu kümedeki her kutunun diğer kümedeki (veya tek kutudaki) her kutuyla IoU matrisi"""
+        if isinstance(other, BoxSet):
+            b = other.coords.astype(np.float64)
+        else:
+            b = np.asarray([other[:4]], dtype=np.float64)
+        a = self.coords.astype(np.float64)
+
+        x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+        y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+        x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+        y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+        inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+        area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+        area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+        union = area_a[:, None] + area_b[None, :] - inter
+        return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
@@ -1,8 +1,23 @@
 import os
 import json
+import time
 import cv2
 import numpy as np
 
+from utils.box_set import BoxSet
+from utils.frame_store import FrameStore
+from utils.frame_writer import FrameWriterPool
+from utils.image_utils import get_image_size
+from utils.tiled_image import TILED_EXTENSION
+from utils.video_utils import (extract_frames_sparse, extract_frames_parallel, sample_frame_path,
+                               SEEK_INTERVAL_THRESHOLD)
+
+# İlerleme bildirimi kaç frame'de bir yapılır
+PROGRESS_REPORT_EVERY = 25
+
+# YOLO etiket dosyalarına yazılan ondalık basamak sayısı
+YOLO_PRECISION = 6
+
 def create_output_dirs(output_dir):
     """Çıktı klasörlerini oluştur"""
     try:
@@ -13,6 +28,18 @@ def create_output_dirs(output_dir):
         print(f"Çıktı klasörleri oluşturulamadı: {e}")
         return False
 
+def write_file_atomic(path, content):
+    """Metni önce geçici dosyaya yazıp yerine taşı (yarıda kalan yazma eski dosyayı bozmaz)"""
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 def save_session_info(session_info, output_dir, session_file="session_info.json"):
     """Oturum bilgilerini JSON dosyasına kaydet"""
     if not output_dir:
@@ -21,8 +48,7 @@ def save_session_info(session_info, output_dir, session_file="session_info.json"
     session_file_path = os.path.join(output_dir, session_file)
     
     try:
-        with open(session_file_path, 'w') as f:
-            json.dump(session_info, f)
+        write_file_atomic(session_file_path, json.dumps(session_info))
         return True
     except Exception as e:
         print(f"Oturum bilgileri kaydedilemedi: {e}")
@@ -46,61 +72,107 @@ def load_session_info(output_dir, session_file="session_info.json"):
         print(f"Oturum bilgileri yüklenemedi: {e}")
         return None
 
-def extract_frames_from_video(video_path, output_dir, interval=30):
-    """Video dosyasından frameleri çıkar ve kaydet"""
+def extract_frames_from_video(video_path, output_dir, interval=30, workers=1,
+                              progress_callback=None, frame_callback=None, cancel_event=None):
+    """Video dosyasından frameleri çıkar ve kaydet (workers > 1 ise paralel)
+
+    progress_callback(işlenen, toplam) ilerlemeyi, frame_callback(yol, boyut) her
+    yazılan frame'i sırasıyla bildirir. cancel_event set edilirse çıkarma durur ve
+    o ana kadar yazılan frameler korunur.
+    """
+    frames = FrameStore()
+    
     if not video_path or not output_dir:
         print("Video yolu veya çıktı klasörü belirtilmemiş.")
-        return []
+        return frames
+    
+    # Büyük aralıklarda videonun tamamını okumak yerine hedeflere atla
+    if interval >= SEEK_INTERVAL_THRESHOLD:
+        return extract_frames_sparse(video_path, output_dir, interval=interval,
+                                     progress_callback=progress_callback,
+                                     frame_callback=frame_callback, cancel_event=cancel_event)
+    
+    # Birden fazla süreç istendiyse videoyu segmentlere bölerek çıkar
+    if workers > 1:
+        return extract_frames_parallel(video_path, output_dir, interval, workers,
+                                       progress_callback=progress_callback,
+                                       frame_callback=frame_callback, cancel_event=cancel_event)
     
     try:
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             print(f"Video açılamadı: {video_path}")
-            return []
+            return frames
         
         # Frames klasörünün var olduğundan emin ol
         frames_dir = os.path.join(output_dir, "frames")
         os.makedirs(frames_dir, exist_ok=True)
         
-        frames = []
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         frame_count = 0
-        saved_count = 0
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            if frame_count % interval == 0:
-                # Frame'i kaydet
-                frame_path = os.path.join(frames_dir, f"frame_{saved_count:06d}.jpg")
-                if not cv2.imwrite(frame_path, frame):
-                    print(f"Frame kaydedilemedi: {frame_path}")
-                    frame_count += 1
-                    continue
+        # Çözme bu iş parçacığında, JPEG kodlama ve yazma havuzda yapılır
+        writer = FrameWriterPool(on_written=frame_callback)
+        
+        try:
+            while True:
+                # İptal istendiyse dur, yazılan frameler korunur
+                if cancel_event is not None and cancel_event.is_set():
+                    print("Frame çıkarma iptal edildi.")
+                    break
                 
-                # RGB'ye dönüştür ve listeye ekle
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frames.append((rgb_frame, frame_path))
-                saved_count += 1
-            
-            frame_count += 1
+                decode_start = time.perf_counter()
+                
+                # Örneklenmeyecek frameleri retrieve etmeden geç (BGR dönüşümü ve
+                # tampon ayırma maliyeti ödenmez)
+                if not cap.grab():
+                    break
+                
+                if frame_count % interval == 0:
+                    # Sadece saklanacak frame'i tam olarak çöz
+                    ret, frame = cap.retrieve()
+                    writer.add_decode_time(time.perf_counter() - decode_start)
+                    if not ret:
+                        print(f"Frame çözülemedi: {frame_count}")
+                        frame_count += 1
+                        continue
+                    
+                    # Frame'i yazıcı havuzuna gönder; dosya adı paralel çıkarmadaki
+                    # gibi örnek numarasıdır (frame_count // interval)
+                    frame_path = sample_frame_path(frames_dir, frame_count // interval)
+                    writer.submit(frame, frame_path, frame_count)
+                else:
+                    writer.add_decode_time(time.perf_counter() - decode_start)
+                
+                frame_count += 1
+                
+                if progress_callback and frame_count % PROGRESS_REPORT_EVERY == 0:
+                    progress_callback(frame_count, total_frames)
+        finally:
+            cap.release()
+            written = writer.close()
+        
+        if progress_callback:
+            progress_callback(frame_count, max(total_frames, frame_count))
         
-        cap.release()
+        # Sadece yolu ve boyutu sakla, piksel verisini bellekte tutma
+        for frame_path, size in written:
+            frames.append(frame_path, size)
         
         if not frames:
             print("Hiç frame çıkarılamadı.")
         else:
-            print(f"{saved_count} frame çıkarıldı.")
+            print(f"{len(frames)} frame çıkarıldı.")
+            print(writer.format_stats())
         
         return frames
     except Exception as e:
         print(f"Frame çıkarma işlemi sırasında hata oluştu: {e}")
-        return []
+        return frames
 
 def load_frames_from_dir(frames_dir):
-    """Klasörden frameleri yükle"""
-    frames = []
+    """Klasörden frameleri yükle (frameler ihtiyaç anında çözülür)"""
+    frames = FrameStore()
     
     if not frames_dir or not os.path.exists(frames_dir):
         print(f"Frames klasörü bulunamadı: {frames_dir}")
@@ -108,26 +180,15 @@ def load_frames_from_dir(frames_dir):
     
     try:
         # Frame dosyalarını bul ve sırala
-        frame_files = sorted([f for f in os.listdir(frames_dir) if f.startswith("frame_") and f.endswith(".jpg")])
+        frame_files = sorted([f for f in os.listdir(frames_dir)
+                              if f.startswith("frame_") and f.endswith((".jpg", TILED_EXTENSION))])
         
         if not frame_files:
             print(f"Frames klasöründe frame bulunamadı: {frames_dir}")
             return frames
         
         for frame_file in frame_files:
-            try:
-                frame_path = os.path.join(frames_dir, frame_file)
-                frame = cv2.imread(frame_path)
-                
-                if frame is None:
-                    print(f"Frame okunamadı: {frame_path}")
-                    continue
-                
-                # BGR'den RGB'ye dönüştür
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frames.append((rgb_frame, frame_path))
-            except Exception as e:
-                print(f"Frame yüklenirken hata oluştu: {frame_file} - {e}")
+            frames.append(os.path.join(frames_dir, frame_file))
         
         print(f"{len(frames)} frame yüklendi.")
         return frames
@@ -141,8 +202,95 @@ def get_label_path(frame_path, output_dir):
     frame_name_without_ext = os.path.splitext(frame_name)[0]
     return os.path.join(output_dir, "labels", f"{frame_name_without_ext}.txt")
 
-def save_annotations(boxes, labels, frame_path, output_dir, silent=True):
-    """Etiketleri YOLO formatında kaydet"""
+def boxes_to_yolo(coords, img_w, img_h):
+    """Piksel kutularını (N, 4) normalize [x_merkez, y_merkez, genişlik, yükseklik] dizisine dönüştür (0-1'e kırpılır)"""
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 4)
+    yolo = np.empty_like(coords)
+    yolo[:, 0] = (coords[:, 0] + coords[:, 2]) / (2 * img_w)
+    yolo[:, 1] = (coords[:, 1] + coords[:, 3]) / (2 * img_h)
+    yolo[:, 2] = (coords[:, 2] - coords[:, 0]) / img_w
+    yolo[:, 3] = (coords[:, 3] - coords[:, 1]) / img_h
+    np.clip(yolo, 0, 1, out=yolo)
+    return yolo
+
+def yolo_to_boxes(class_ids, yolo, labels, img_w, img_h):
+    """Normalize YOLO kutularını piksel koordinatlı BoxSet'e dönüştür
+
+    Etiket listesinde olmayan sınıf ID'leri atlanır, koordinatlar görüntü
+    sınırlarına kırpılır.
+    """
+    class_ids = np.asarray(class_ids, dtype=np.int32)
+    yolo = np.asarray(yolo, dtype=np.float64).reshape(-1, 4)
+    valid = (class_ids >= 0) & (class_ids < len(labels))
+    if not valid.all():
+        print(f"Geçersiz sınıf ID'leri atlandı: {sorted(set(class_ids[~valid].tolist()))}, "
+              f"etiket sayısı: {len(labels)}")
+        class_ids, yolo = class_ids[valid], yolo[valid]
+
+    half_w, half_h = yolo[:, 2] / 2, yolo[:, 3] / 2
+    coords = np.rint(np.stack([(yolo[:, 0] - half_w) * img_w, (yolo[:, 1] - half_h) * img_h,
+                               (yolo[:, 0] + half_w) * img_w, (yolo[:, 1] + half_h) * img_h], axis=1))
+    np.clip(coords[:, 0::2], 0, img_w - 1, out=coords[:, 0::2])
+    np.clip(coords[:, 1::2], 0, img_h - 1, out=coords[:, 1::2])
+    return BoxSet(labels, coords, class_ids)
+
+def parse_yolo_labels(text):
+    """YOLO etiket metnini (sınıf ID'leri (N,), normalize kutular (N, 4)) dizilerine çöz
+
+    Her satırda tam 5 değer varsa metin tek numpy dönüşümüyle çözülür;
+    değilse satır satır çözülür ve okunamayan satırlar atlanır.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    values = None
+    if all(len(line.split()) == 5 for line in lines):
+        try:
+            values = np.array(text.split(), dtype=np.float64).reshape(-1, 5)
+        except ValueError:
+            pass
+    # Tam sayı olmayan sınıf ID'leri de satır satır çözülerek atlanır
+    if values is None or not np.array_equal(values[:, 0], np.floor(values[:, 0])):
+        rows = []
+        for line in lines:
+            parts = line.split()
+            try:
+                if len(parts) != 5:
+                    raise ValueError(f"{len(parts)} değer")
+                rows.append([int(parts[0])] + [float(part) for part in parts[1:]])
+            except ValueError as e:
+                print(f"Etiket satırı ayrıştırılamadı: {line.strip()} - {e}")
+        values = np.array(rows, dtype=np.float64).reshape(-1, 5)
+    return values[:, 0].astype(np.int32), values[:, 1:]
+
+def format_yolo_rows(class_ids, yolo, precision=YOLO_PRECISION):
+    """Sınıf ID'leri ve normalize kutulardan YOLO dosya içeriğini oluştur"""
+    yolo = np.asarray(yolo, dtype=np.float64).reshape(-1, 4)
+    if not len(yolo):
+        return ""
+
+    values = np.empty((len(yolo), 5), dtype=np.float64)
+    values[:, 0] = class_ids
+    values[:, 1:] = yolo
+
+    # Tüm satırlar tek bir biçimlendirme çağrısıyla oluşturulur
+    line = "%d" + f" %.{precision}f" * 4 + "\n"
+    return (line * len(values)) % tuple(values.ravel().tolist())
+
+def format_yolo_labels(coords, class_ids, img_w, img_h, precision=YOLO_PRECISION):
+    """Kutuları tek numpy geçişiyle YOLO satırlarına dönüştür, dosya içeriğini döndür
+
+    coords (N, 4) piksel [x1, y1, x2, y2], class_ids (N,) sınıf ID'leridir.
+    """
+    return format_yolo_rows(class_ids, boxes_to_yolo(coords, img_w, img_h), precision)
+
+def save_annotations(boxes, labels, frame_path, output_dir, silent=True, img_size=None,
+                     precision=YOLO_PRECISION):
+    """Etiketleri YOLO formatında kaydet
+
+    img_size (yükseklik, genişlik) verilmezse boyut frame dosyasının
+    başlığından okunur; diskte bulunmayan (videodan doğrudan çözülen)
+    frameler için gereklidir. Pikseller hiçbir durumda çözülmez. Kutular
+    tek geçişte biçimlendirilip tek yazma çağrısıyla kaydedilir.
+    """
     if not frame_path or not output_dir:
         if not silent:
             print("Kaydetmek için gerekli bilgiler eksik: frame_path veya output_dir yok.")
@@ -161,8 +309,7 @@ def save_annotations(boxes, labels, frame_path, output_dir, silent=True):
             os.makedirs(os.path.dirname(label_path), exist_ok=True)
             
             # Boş dosya oluştur
-            with open(label_path, 'w') as f:
-                pass
+            write_file_atomic(label_path, "")
             
             if not silent:
                 print(f"Boş etiket dosyası oluşturuldu: {label_path}")
@@ -172,14 +319,30 @@ def save_annotations(boxes, labels, frame_path, output_dir, silent=True):
                 print(f"Boş etiket dosyası oluşturulamadı: {e}")
             return False
     
-    # Frame boyutlarını al
-    frame = cv2.imread(frame_path)
-    if frame is None:
-        if not silent:
-            print(f"Frame okunamadı: {frame_path}")
-        return False
+    # Frame boyutlarını al (verilmediyse sadece dosya başlığından okunur)
+    if img_size is None:
+        img_size = get_image_size(frame_path)
+        if img_size is None:
+            if not silent:
+                print(f"Frame boyutu okunamadı: {frame_path}")
+            return False
     
-    img_h, img_w = frame.shape[:2]
+    img_h, img_w = img_size
+    
+    # Sınıf ID'leri: BoxSet'te hazır, listede sözlükten bulunur
+    if isinstance(boxes, BoxSet) and boxes.labels == labels:
+        coords, class_ids = boxes.coords, boxes.class_ids
+    else:
+        class_index = {label: i for i, label in enumerate(labels)}
+        coords, class_ids = [], []
+        for x1, y1, x2, y2, label in boxes:
+            class_id = class_index.get(label)
+            if class_id is None:
+                if not silent:
+                    print(f"Etiket listede bulunamadı: {label}, mevcut etiketler: {labels}")
+                continue
+            coords.append((x1, y1, x2, y2))
+            class_ids.append(class_id)
     
     # YOLO formatında etiket dosyası oluştur
     label_path = get_label_path(frame_path, output_dir)
@@ -188,31 +351,8 @@ def save_annotations(boxes, labels, frame_path, output_dir, silent=True):
         # Etiket klasörünün var olduğundan emin ol
         os.makedirs(os.path.dirname(label_path), exist_ok=True)
         
-        with open(label_path, 'w') as f:
-            for box in boxes:
-                x1, y1, x2, y2, label = box
-                
-                # Sınıf ID'sini bul
-                try:
-                    class_id = labels.index(label)
-                except ValueError:
-                    if not silent:
-                        print(f"Etiket listede bulunamadı: {label}, mevcut etiketler: {labels}")
-                    continue
-                
-                # YOLO formatına dönüştür (x_center, y_center, width, height)
-                x_center = (x1 + x2) / (2 * img_w)
-                y_center = (y1 + y2) / (2 * img_h)
-                width = (x2 - x1) / img_w
-                height = (y2 - y1) / img_h
-                
-                # Değerlerin 0-1 aralığında olduğundan emin ol
-                x_center = max(0, min(x_center, 1))
-                y_center = max(0, min(y_center, 1))
-                width = max(0, min(width, 1))
-                height = max(0, min(height, 1))
-                
-                f.write(f"{class_id} {x_center} {y_center} {width} {height}\n")
+        content = format_yolo_labels(coords, class_ids, img_w, img_h, precision)
+        write_file_atomic(label_path, content)
         
         if not silent:
             print(f"Etiketler başarıyla kaydedildi: {label_path}")
@@ -222,9 +362,9 @@ def save_annotations(boxes, labels, frame_path, output_dir, silent=True):
             print(f"Etiketler kaydedilemedi: {e}")
         return False
 
-def load_annotations(frame_path, output_dir, labels):
-    """YOLO formatındaki etiketleri yükle"""
-    boxes = []
+def load_annotations(frame_path, output_dir, labels, img_size=None):
+    """YOLO formatındaki etiketleri BoxSet olarak yükle (img_size verilmezse başlıktan okunur)"""
+    boxes = BoxSet(labels)
     
     if not frame_path or not output_dir:
         print("Yüklemek için gerekli bilgiler eksik.")
@@ -235,49 +375,20 @@ def load_annotations(frame_path, output_dir, labels):
         print(f"Etiket dosyası bulunamadı: {label_path}")
         return boxes
     
-    # Frame boyutlarını al
-    frame = cv2.imread(frame_path)
-    if frame is None:
-        print(f"Frame okunamadı: {frame_path}")
-        return boxes
+    # Frame boyutlarını al (verilmediyse sadece dosya başlığından okunur)
+    if img_size is None:
+        img_size = get_image_size(frame_path)
+        if img_size is None:
+            print(f"Frame boyutu okunamadı: {frame_path}")
+            return boxes
     
-    img_h, img_w = frame.shape[:2]
+    img_h, img_w = img_size
     
     try:
         with open(label_path, 'r') as f:
-            lines = f.readlines()
-            
-        for line in lines:
-            parts = line.strip().split()
-            if len(parts) == 5:
-                try:
-                    class_id = int(parts[0])
-                    x_center = float(parts[1])
-                    y_center = float(parts[2])
-                    width = float(parts[3])
-                    height = float(parts[4])
-                    
-                    # YOLO formatından piksel koordinatlarına dönüştür
-                    x1 = int((x_center - width/2) * img_w)
-                    y1 = int((y_center - height/2) * img_h)
-                    x2 = int((x_center + width/2) * img_w)
-                    y2 = int((y_center + height/2) * img_h)
-                    
-                    # Koordinatları sınırlar içinde tut
-                    x1 = max(0, min(x1, img_w - 1))
-                    y1 = max(0, min(y1, img_h - 1))
-                    x2 = max(0, min(x2, img_w - 1))
-                    y2 = max(0, min(y2, img_h - 1))
-                    
-                    # Eğer sınıf ID'si etiket listesinde yoksa, atla
-                    if 0 <= class_id < len(labels):
-                        label = labels[class_id]
-                        boxes.append((x1, y1, x2, y2, label))
-                    else:
-                        print(f"Geçersiz sınıf ID'si: {class_id}, etiket sayısı: {len(labels)}")
-                except (ValueError, IndexError) as e:
-                    print(f"Etiket satırı ayrıştırılamadı: {line.strip()} - {e}")
+            class_ids, yolo = parse_yolo_labels(f.read())
     except Exception as e:
         print(f"Etiketler yüklenemedi: {e}")
+        return boxes
     
-    return boxes 
\ No newline at end of file
+    return yolo_to_boxes(class_ids, yolo, labels, img_w, img_h)
@@ -0,0 +1,459 @@
+import os
+import time
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+import cv2
+
+from utils.frame_writer import FrameWriterPool
+from utils.image_utils import ImagePyramid, get_image_size, remember_image_size
+from utils.tiled_image import TILE_CACHE_BYTES, is_tiled, open_tiled_image
+
+class FrameCache:
+    """Çözülmüş frameler için bellek sınırlı LRU önbellek (nbytes'ı olan her nesne)
+
+    pin() ile işaretlenen öğe (ekranda gösterilen frame) hiçbir zaman
+    çıkarılmaz; diğerleri en az kullanılandan başlayarak çıkarılır.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._frames = OrderedDict()
+        self._bytes = 0
+        self._pinned = None
+        self._lock = threading.Lock()
+
+    def __contains__(self, idx):
+        with self._lock:
+            return idx in self._frames
+
+    def __len__(self):
+        with self._lock:
+            return len(self._frames)
+
+    def get(self, idx):
+        """Önbellekteki frame'i döndür ve en son kullanılan olarak işaretle"""
+        with self._lock:
+            frame = self._frames.get(idx)
+            if frame is not None:
+                self._frames.move_to_end(idx)
+            return frame
+
+    def put(self, idx, frame):
+        """Frame'i önbelleğe ekle, bellek sınırı aşılırsa en eski frameleri çıkar"""
+        with self._lock:
+            old = self._frames.pop(idx, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+
+            self._frames[idx] = frame
+            self._bytes += frame.nbytes
+
+            # Sınır aşıldıysa en az kullanılanları çıkar (sabitlenmiş ve en son
+            # eklenen öğe her zaman tutulur)
+            while self._bytes > self.max_bytes:
+                victim = next((key for key in self._frames if key != self._pinned and key != idx), None)
+                if victim is None:
+                    break
+                self._bytes -= self._frames.pop(victim).nbytes
+
+    def pin(self, idx):
+        """Öğeyi çıkarılmaya karşı sabitle (önceki sabitleme kalkar, None ise hiçbiri)"""
+        with self._lock:
+            self._pinned = idx
+
+    def pinned_bytes(self):
+        """Sabitlenmiş öğenin kapladığı bellek"""
+        with self._lock:
+            frame = self._frames.get(self._pinned)
+            return frame.nbytes if frame is not None else 0
+
+    def clear(self):
+        """Önbelleği temizle"""
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+class FrameSource:
+    """Frame yollarını ve meta verilerini tutan, frameleri ihtiyaç anında çözen salt okunur depo
+
+    Frame listesi oluşturulduktan sonra değişmez; frame eklenebilen depo
+    FrameStore'dur.
+    """
+
+    def __init__(self, frame_paths=None, cache_bytes=512 * 1024 * 1024, prefetch_count=4):
+        # Sadece yollar ve boyut bilgisi tutulur, piksel verisi önbellekte sınırlı tutulur
+        self.frame_paths = list(frame_paths) if frame_paths else []
+        self.frame_sizes = {}
+
+        # Çözülmüş frameler için LRU önbellek (görüntüleme piramitleri olarak)
+        self.cache = FrameCache(cache_bytes)
+
+        # Döşemeli görüntülerin diskten okunan döşemeleri için LRU önbellek
+        self.tile_cache = FrameCache(TILE_CACHE_BYTES)
+
+        # İsteğe bağlı ham frame önbelleği (RawFrameCache); varsa frameler çözülmez
+        self.raw_cache = None
+        self._raw_view = (None, None)
+
+        # Arka planda komşu frameleri önceden çözme
+        self.prefetch_count = prefetch_count
+        self._prefetch_queue = []
+        self._prefetch_generation = 0
+        self._prefetch_cond = threading.Condition()
+        self._prefetch_thread = None
+        self._closed = False
+
+    def __len__(self):
+        return len(self.frame_paths)
+
+    def get_path(self, idx):
+        """Frame dosya yolunu döndür"""
+        return self.frame_paths[idx]
+
+    def get_size(self, idx):
+        """Frame boyutlarını (yükseklik, genişlik) döndür"""
+        if idx in self.frame_sizes:
+            return self.frame_sizes[idx]
+
+        # Boyut henüz bilinmiyorsa frame'i çözmeden dosya başlığından oku
+        size = get_image_size(self.frame_paths[idx])
+        if size is not None:
+            self.frame_sizes[idx] = size
+        return size
+
+    def get_frame(self, idx):
+        """Frame'i önbellekten veya diskten okuyup RGB olarak döndür"""
+        pyramid = self.get_pyramid(idx)
+        return pyramid.frame if pyramid is not None else None
+
+    def get_pyramid(self, idx, pin=False):
+        """Frame'in görüntüleme piramidini döndür (önbellekte yoksa çözüp oluştur)
+
+        pin True ise frame gösterilen frame olarak önbellekte sabitlenir;
+        önceden çözülen komşular onu önbellekten çıkaramaz.
+        """
+        if pin:
+            self.cache.pin(idx)
+
+        # Ham önbellekte varsa kopyasız görünüm tek seviyeli piramit olarak döner;
+        # aynı frame tekrar istendiğinde aynı nesne kullanılır
+        if self.raw_cache is not None and idx in self.raw_cache:
+            if self._raw_view[0] != idx:
+                view = self.raw_cache.get(idx)
+                self._raw_view = (idx, ImagePyramid(view, min_size=float("inf")))
+            return self._raw_view[1]
+
+        pyramid = self.cache.get(idx)
+        if pyramid is not None:
+            return pyramid
+
+        pyramid = self._load(idx)
+        if pyramid is None:
+            return None
+
+        self.cache.put(idx, pyramid)
+        return pyramid
+
+    def set_raw_cache(self, raw_cache):
+        """Ham frame önbelleğini bağla (None ise kaldır)"""
+        self.raw_cache = raw_cache
+        self._raw_view = (None, None)
+
+    def read_frame(self, idx):
+        """Frame'i önbelleklere koymadan diskten çözüp RGB olarak döndür"""
+        return self._decode(idx)
+
+    def _load(self, idx):
+        """Frame'i görüntülemeye hazırla
+
+        Döşemeli görüntüler diskten eşlenir (pikseller çözülmez), diğerleri
+        çözülüp görüntüleme piramidine dönüştürülür.
+        """
+        frame_path = self.frame_paths[idx]
+        if is_tiled(frame_path):
+            pyramid = open_tiled_image(frame_path, self.tile_cache)
+        else:
+            frame = self._decode(idx)
+            pyramid = ImagePyramid(frame) if frame is not None else None
+
+        if pyramid is not None:
+            self.frame_sizes[idx] = pyramid.shape[:2]
+        return pyramid
+
+    def _decode(self, idx):
+        """Frame'i çöz ve BGR'den RGB'ye dönüştür"""
+        frame_path = self.frame_paths[idx]
+        try:
+            frame = cv2.imread(frame_path)
+            if frame is None:
+                print(f"Frame okunamadı: {frame_path}")
+                return None
+            remember_image_size(frame_path, frame.shape)
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        except Exception as e:
+            print(f"Frame yüklenirken hata oluştu: {os.path.basename(frame_path)} - {e}")
+            return None
+
+    def prefetch(self, center_idx, direction=1, page_size=0):
+        """Gidiş yönündeki komşu frameleri arka planda önceden çöz
+
+        direction 0 ise her iki yöndeki komşular alınır. page_size verilirse
+        bir sayfa ilerideki frame ve komşuları da kuyruğa eklenir. Yeni bir
+        istek geldiğinde henüz işlenmemiş eski istekler iptal edilir.
+        """
+        if self._closed or not self.frame_paths:
+            return
+
+        directions = [direction] if direction else [1, -1]
+        targets = []
+        for step in range(1, self.prefetch_count + 1):
+            for d in directions:
+                targets.append(center_idx + d * step)
+
+        if page_size:
+            page_idx = center_idx + (direction or 1) * page_size
+            targets.append(page_idx)
+            for step in range(1, self.prefetch_count + 1):
+                targets.append(page_idx + (direction or 1) * step)
+
+        targets = [i for i in targets if 0 <= i < len(self.frame_paths)
+                   and not (self.raw_cache is not None and i in self.raw_cache)]
+
+        # Sadece gösterilen frame'in yanında önbelleğe sığacak kadar frame alınır;
+        # yoksa önceden çözülenler birbirini (ve diğer komşuları) çıkarır
+        pinned_bytes = self.cache.pinned_bytes()
+        frame_bytes = pinned_bytes or self._estimate_pyramid_bytes(center_idx)
+        if frame_bytes:
+            budget = self.cache.max_bytes - pinned_bytes
+            targets = targets[:max(0, budget // frame_bytes)]
+
+        with self._prefetch_cond:
+            # Eski istekleri iptal et
+            self._prefetch_generation += 1
+            self._prefetch_queue = targets
+            self._prefetch_cond.notify()
+
+        if self._prefetch_thread is None:
+            self._prefetch_thread = threading.Thread(target=self._prefetch_worker, daemon=True)
+            self._prefetch_thread.start()
+
+    def _estimate_pyramid_bytes(self, idx):
+        """Frame'in piramidinin yaklaşık bellek boyutu (bilinmiyorsa 0)"""
+        size = self.frame_sizes.get(idx)
+        if size is None or is_tiled(self.frame_paths[idx]):
+            return 0
+        # Piramidin alt seviyeleri tam çözünürlüğün yaklaşık üçte biri kadardır
+        return size[0] * size[1] * 3 * 4 // 3
+
+    def _prefetch_worker(self):
+        """Kuyruktaki frameleri sırayla çözüp önbelleğe ekleyen iş parçacığı"""
+        while True:
+            with self._prefetch_cond:
+                while not self._prefetch_queue and not self._closed:
+                    self._prefetch_cond.wait()
+                if self._closed:
+                    return
+                idx = self._prefetch_queue.pop(0)
+                generation = self._prefetch_generation
+
+            if idx in self.cache:
+                continue
+
+            pyramid = self._load(idx)
+            if pyramid is None:
+                continue
+
+            # Çözme sırasında kullanıcı başka yere geçtiyse ve bu frame yeni
+            # istekte yer almıyorsa sonucu önbelleğe koyma (bayat istek)
+            with self._prefetch_cond:
+                stale = (generation != self._prefetch_generation
+                         and idx not in self._prefetch_queue)
+            if not stale:
+                self.cache.put(idx, pyramid)
+
+    def clear_cache(self):
+        """Bellekte tutulan çözülmüş frameleri bırak"""
+        with self._prefetch_cond:
+            self._prefetch_generation += 1
+            self._prefetch_queue = []
+        self.cache.clear()
+        self.tile_cache.clear()
+
+    def close(self):
+        """Arka plan iş parçacığını durdur ve önbelleği temizle"""
+        with self._prefetch_cond:
+            self._closed = True
+            self._prefetch_queue = []
+            self._prefetch_cond.notify_all()
+        self.cache.clear()
+        self.tile_cache.clear()
+        self.set_raw_cache(None)
+
+# Bu kadar frame'den kısa ileri atlamalarda seek yerine grab ile ilerlenir
+MAX_GRAB_GAP = 60
+
+def nearest_keyframe(keyframes, frame_no):
+    """frame_no'dan önceki (veya kendisi olan) en yakın keyframe'i döndür"""
+    pos = bisect_right(keyframes, frame_no) - 1
+    return keyframes[pos] if pos >= 0 else 0
+
+def read_video_frame(cap, frame_no, next_pos, use_seek=True, keyframes=None,
+                     max_grab_gap=MAX_GRAB_GAP):
+    """frame_no'daki frame'i oku; next_pos okuyucunun bulunduğu konumdur
+
+    keyframes verilirse okuyucu hedefin keyframe'inden önceyse veya
+    hedefi geçtiyse en yakın keyframe'e atlanır, aksi halde grab ile
+    ilerlenir. Keyframe'e atlamak keyfi frame'e seek güvenilir olmasa da
+    doğrudur, bu yüzden use_seek'ten bağımsız yapılır. Keyframe bilgisi
+    yoksa kısa mesafelerde grab, uzaklarda seek yapılır; seek de güvenilir
+    değilse geri gitmek için baştan okunur.
+    (frame, yeni konum) döndürür, okunamazsa frame None olur.
+    """
+    gap = frame_no - next_pos if next_pos is not None else -1
+    if keyframes:
+        key = nearest_keyframe(keyframes, frame_no)
+        if gap < 0 or next_pos < key:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, key)
+            gap = frame_no - key
+    elif gap < 0 or (gap > max_grab_gap and use_seek):
+        if use_seek:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_no)
+            gap = 0
+        else:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            gap = frame_no
+
+    for _ in range(gap):
+        if not cap.grab():
+            return None, None
+
+    ok, frame = cap.read()
+    if not ok:
+        return None, None
+    return frame, frame_no + 1
+
+class FrameStore(FrameSource):
+    """Diskteki framelerin deposu; çıkarma ve içe aktarma sırasında frame eklenebilir"""
+
+    def append(self, frame_path, size=None):
+        """Depoya yeni bir frame yolu ekle"""
+        self.frame_paths.append(frame_path)
+        if size is not None:
+            self.frame_sizes[len(self.frame_paths) - 1] = size
+
+class VideoFrameStore(FrameSource):
+    """Frameleri diske yazmadan doğrudan videodan çözen salt okunur depo
+
+    Her frame (video_path, frame_number) şeklinde sanal bir referanstır.
+    frame_paths get_label_path ile uyumlu sanal yollardır; bu yollara
+    sadece export_frames ile dışa aktarıldığında dosya yazılır.
+    """
+
+    def __init__(self, video_path, frame_numbers, frames_dir, frame_size=None,
+                 use_seek=True, keyframes=None, **kwargs):
+        frame_paths = [os.path.join(frames_dir, f"frame_{i:06d}.jpg")
+                       for i in range(len(frame_numbers))]
+        super().__init__(frame_paths, **kwargs)
+
+        self.video_path = video_path
+        self.frame_numbers = list(frame_numbers)
+        self.frame_size = tuple(frame_size) if frame_size else None
+        self.use_seek = use_seek
+        self.keyframes = keyframes
+
+        # Tek bir okuyucu, GUI ve önceden çözme iş parçacığı arasında paylaşılır
+        self._cap = None
+        self._next_pos = None
+        self._cap_lock = threading.Lock()
+
+    def get_size(self, idx):
+        """Tüm frameler videonun boyutundadır, çözmeye gerek yok"""
+        if self.frame_size:
+            return self.frame_size
+
+        # Boyut indeksten gelmediyse bir frame çözülerek öğrenilir
+        frame = self.get_frame(idx)
+        if frame is None:
+            return None
+        return frame.shape[:2]
+
+    def _decode(self, idx):
+        """Frame'i videodan çöz ve BGR'den RGB'ye dönüştür"""
+        frame_no = self.frame_numbers[idx]
+        with self._cap_lock:
+            if self._closed:
+                return None
+            try:
+                if self._cap is None:
+                    self._cap = cv2.VideoCapture(self.video_path)
+                    self._next_pos = 0
+                    if not self._cap.isOpened():
+                        print(f"Video açılamadı: {self.video_path}")
+                        self._cap = None
+                        return None
+
+                frame, self._next_pos = read_video_frame(self._cap, frame_no, self._next_pos,
+                                                         self.use_seek, self.keyframes)
+                if frame is None:
+                    print(f"Frame okunamadı: {frame_no}")
+                    return None
+            except Exception as e:
+                print(f"Frame videodan çözülürken hata oluştu: {frame_no} - {e}")
+                self._next_pos = None
+                return None
+
+        if self.frame_size is None:
+            self.frame_size = frame.shape[:2]
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def export_frames(self, indices=None, progress_callback=None, frame_callback=None,
+                      cancel_event=None):
+        """Seçili frameleri (varsayılan tümü) sanal yollarına JPEG olarak yaz
+
+        GUI'deki okuyucuyu meşgul etmemek için ayrı bir okuyucu kullanılır.
+        Yazılan (frame_path, size) listesini döndürür.
+        """
+        indices = sorted(set(range(len(self)) if indices is None else indices))
+        if not indices:
+            return []
+
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            print(f"Video açılamadı: {self.video_path}")
+            return []
+
+        os.makedirs(os.path.dirname(self.frame_paths[indices[0]]), exist_ok=True)
+        writer = FrameWriterPool(on_written=frame_callback)
+        next_pos = 0
+        try:
+            for done, idx in enumerate(indices):
+                if cancel_event is not None and cancel_event.is_set():
+                    print("Frame dışa aktarma iptal edildi.")
+                    break
+
+                decode_start = time.perf_counter()
+                frame, next_pos = read_video_frame(cap, self.frame_numbers[idx], next_pos,
+                                                   self.use_seek, self.keyframes)
+                writer.add_decode_time(time.perf_counter() - decode_start)
+                if frame is None:
+                    print(f"Frame okunamadı: {self.frame_numbers[idx]}")
+                    next_pos = None
+                else:
+                    writer.submit(frame, self.frame_paths[idx], idx)
+
+                if progress_callback:
+                    progress_callback(done + 1, len(indices))
+        finally:
+            cap.release()
+            written = writer.close()
+            print(writer.format_stats())
+        return written
+
+    def close(self):
+        """Önbelleği temizle ve video okuyucusunu bırak"""
+        super().close()
+        with self._cap_lock:
+            if self._cap is not None:
+                self._cap.release()
+                self._cap = None
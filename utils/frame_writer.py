@@ -0,0 +1,134 @@
+import os
+import time
+import queue
+import threading
+from collections import deque
+import cv2
+
+class FrameWriterPool:
+    """Çözme ile JPEG kodlama/yazmayı ayıran, sınırlı kuyruklu yazıcı havuzu
+
+    Çözen taraf submit() ile frame gönderir; kuyruk doluysa bekler (geri basınç),
+    böylece bellekte en fazla max_pending frame bulunur. cv2.imencode GIL'i
+    bıraktığı için yazıcı iş parçacıkları gerçekten paralel çalışır.
+    on_written verilirse başarıyla yazılan her frame için gönderim sırasıyla
+    on_written(frame_path, size) çağrılır.
+    """
+
+    def __init__(self, workers=None, max_pending=None, jpeg_quality=95, on_written=None):
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.max_pending = max_pending or self.workers * 2
+        self.encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), jpeg_quality]
+
+        self._queue = queue.Queue(maxsize=self.max_pending)
+        self._lock = threading.Lock()
+        self._results = []
+
+        # Yazılan frameleri gönderim sırasıyla bildirmek için
+        self.on_written = on_written
+        self._submitted_keys = deque()
+        self._completed = {}
+
+        # Aşama sürelerinin toplamı (saniye)
+        self.stats = {
+            "decode": 0.0,
+            "encode": 0.0,
+            "io": 0.0,
+            "wait": 0.0,
+            "written": 0,
+            "failed": 0
+        }
+        self._start_time = time.perf_counter()
+
+        self._threads = []
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def add_decode_time(self, seconds):
+        """Çözen tarafın harcadığı süreyi istatistiklere ekle"""
+        self.stats["decode"] += seconds
+
+    def submit(self, frame, frame_path, order_key):
+        """Frame'i yazılmak üzere kuyruğa ekle (kuyruk doluysa bekler)"""
+        with self._lock:
+            self._submitted_keys.append(order_key)
+
+        start = time.perf_counter()
+        self._queue.put((order_key, frame, frame_path))
+        self.stats["wait"] += time.perf_counter() - start
+
+    def _worker(self):
+        """Kuyruktaki frameleri JPEG'e kodlayıp diske yazan iş parçacığı"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+
+            order_key, frame, frame_path = item
+            result = None
+            try:
+                start = time.perf_counter()
+                ok, buffer = cv2.imencode(".jpg", frame, self.encode_params)
+                encode_time = time.perf_counter() - start
+
+                io_time = 0.0
+                if ok:
+                    start = time.perf_counter()
+                    with open(frame_path, "wb") as f:
+                        f.write(buffer.tobytes())
+                    io_time = time.perf_counter() - start
+
+                with self._lock:
+                    self.stats["encode"] += encode_time
+                    self.stats["io"] += io_time
+                    if ok:
+                        self.stats["written"] += 1
+                        result = (frame_path, frame.shape[:2])
+                        self._results.append((order_key, frame_path, frame.shape[:2]))
+                    else:
+                        self.stats["failed"] += 1
+                        print(f"Frame kodlanamadı: {frame_path}")
+            except Exception as e:
+                with self._lock:
+                    self.stats["failed"] += 1
+                print(f"Frame kaydedilemedi: {frame_path} - {e}")
+            finally:
+                with self._lock:
+                    self._completed[order_key] = result
+                    self._emit_in_order()
+                self._queue.task_done()
+
+    def _emit_in_order(self):
+        """Sırası gelen tamamlanmış frameleri on_written ile bildir (kilit altında çağrılır)"""
+        while self._submitted_keys and self._submitted_keys[0] in self._completed:
+            key = self._submitted_keys.popleft()
+            result = self._completed.pop(key)
+            if result is not None and self.on_written:
+                try:
+                    self.on_written(*result)
+                except Exception as e:
+                    print(f"Frame bildirimi sırasında hata oluştu: {e}")
+
+    def close(self):
+        """Kuyruğun boşalmasını bekle ve başarıyla yazılan frameleri sıralı döndür"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+        self.stats["total"] = time.perf_counter() - self._start_time
+        return [(path, size) for _, path, size in sorted(self._results)]
+
+    def format_stats(self):
+        """Aşama sürelerini okunabilir bir rapor olarak döndür"""
+        stats = self.stats
+        return (f"Çözme: {stats['decode']:.2f} sn | "
+                f"Kodlama: {stats['encode']:.2f} sn | "
+                f"Disk: {stats['io']:.2f} sn | "
+                f"Kuyruk bekleme: {stats['wait']:.2f} sn | "
+                f"Toplam: {stats.get('total', 0.0):.2f} sn | "
+                f"{stats['written']} yazıldı, {stats['failed']} hata "
+                f"({self.workers} yazıcı)")
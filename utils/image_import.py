@@ -0,0 +1,139 @@
+import os
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+
+from utils.frame_store import FrameStore
+from utils.image_utils import get_image_size
+from utils.tiled_image import TILED_MIN_PIXELS, TILED_EXTENSION, convert_to_tiled
+
+# JPEG dosyalarının ilk baytları (SOI işaretçisi)
+JPEG_MAGIC = b"\xff\xd8\xff"
+
+# İlerleme bildirimi kaç dosyada bir yapılır
+PROGRESS_REPORT_EVERY = 25
+
+def is_jpeg(path):
+    """Dosyanın uzantısına değil içeriğine bakarak JPEG olup olmadığını kontrol et"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(JPEG_MAGIC)) == JPEG_MAGIC
+    except OSError:
+        return False
+
+def _link_or_copy(src, dst, link=True):
+    """Dosyayı bayt bayt aktar: mümkünse hardlink, değilse kopya. Yöntemi döndür"""
+    if os.path.exists(dst):
+        if os.path.samefile(src, dst):
+            return "linked"
+        os.remove(dst)
+
+    if link:
+        try:
+            os.link(src, dst)
+            return "linked"
+        except OSError:
+            # Farklı dosya sistemi veya hardlink desteklenmiyor
+            pass
+
+    shutil.copyfile(src, dst)
+    return "copied"
+
+def _import_one(src, dst, link=True, jpeg_quality=95):
+    """Tek bir görüntüyü içe aktar, (yöntem, frame yolu, boyut) döndür
+
+    Çok büyük görüntüler (ortofoto, uydu görüntüsü) döşemeli biçime
+    dönüştürülür. JPEG dosyaları yeniden kodlanmadan aktarılır (boyut
+    bilinmiyorsa None), diğer biçimler çözülüp JPEG olarak yazılır.
+    """
+    size = get_image_size(src)
+    if size is not None and size[0] * size[1] >= TILED_MIN_PIXELS:
+        tiled_path = os.path.splitext(dst)[0] + TILED_EXTENSION
+        size = convert_to_tiled(src, tiled_path)
+        return ("tiled" if size else "failed"), tiled_path, size
+
+    if is_jpeg(src):
+        return _link_or_copy(src, dst, link), dst, None
+
+    img = cv2.imread(src)
+    if img is None:
+        print(f"Görüntü okunamadı: {src}")
+        return "failed", dst, None
+
+    if not cv2.imwrite(dst, img, [int(cv2.IMWRITE_JPEG_QUALITY), jpeg_quality]):
+        print(f"Görüntü kaydedilemedi: {dst}")
+        return "failed", dst, None
+    return "transcoded", dst, img.shape[:2]
+
+def import_images(image_paths, output_dir, workers=None, link=True, jpeg_quality=95,
+                  progress_callback=None, frame_callback=None, cancel_event=None):
+    """Görüntüleri frames/ klasörüne iş parçacığı havuzunda paralel aktar
+
+    JPEG girdiler kopyalanır veya hardlink ile bağlanır (kayıpsız ve hızlı),
+    sadece diğer biçimler JPEG'e dönüştürülür; TILED_MIN_PIXELS'ten büyük
+    görüntüler frame_XXXXXX.tiled döşemeli klasörlerine dönüştürülür. Dosya
+    adları seçim sırasına göre frame_XXXXXX.jpg olur; frame_callback(yol,
+    boyut) bu sırayla çağrılır.
+    """
+    frames = FrameStore()
+
+    if not image_paths or not output_dir:
+        print("Görüntü listesi veya çıktı klasörü belirtilmemiş.")
+        return frames
+
+    frames_dir = os.path.join(output_dir, "frames")
+    os.makedirs(frames_dir, exist_ok=True)
+
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    total = len(image_paths)
+    stats = {"linked": 0, "copied": 0, "transcoded": 0, "tiled": 0, "failed": 0}
+
+    def report(done):
+        if progress_callback:
+            progress_callback(done, total)
+
+    # Bellekte sınırlı sayıda bekleyen iş tut, sonuçları gönderim sırasıyla al
+    pending = deque()
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        path_iter = iter(enumerate(image_paths))
+        while True:
+            cancelled = cancel_event is not None and cancel_event.is_set()
+            while not cancelled and len(pending) < workers * 4:
+                item = next(path_iter, None)
+                if item is None:
+                    break
+                i, src = item
+                dst = os.path.join(frames_dir, f"frame_{i:06d}.jpg")
+                pending.append((src, dst, executor.submit(_import_one, src, dst, link, jpeg_quality)))
+
+            if not pending:
+                break
+
+            src, dst, future = pending.popleft()
+            try:
+                method, frame_path, size = future.result()
+            except Exception as e:
+                print(f"Görüntü içe aktarılamadı: {src} - {e}")
+                method, frame_path, size = "failed", dst, None
+
+            stats[method] += 1
+            if method != "failed":
+                frames.append(frame_path, size)
+                if frame_callback:
+                    frame_callback(frame_path, size)
+
+            done += 1
+            if done % PROGRESS_REPORT_EVERY == 0:
+                report(done)
+
+    if cancel_event is not None and cancel_event.is_set():
+        print("Görüntü içe aktarma iptal edildi.")
+    report(done)
+
+    print(f"{len(frames)} görüntü içe aktarıldı: {stats['linked']} bağlandı, "
+          f"{stats['copied']} kopyalandı, {stats['transcoded']} dönüştürüldü, "
+          f"{stats['tiled']} döşemeli, "
+          f"{stats['failed']} hata ({workers} iş parçacığı)")
+    return frames
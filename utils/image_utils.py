@@ -1,9 +1,173 @@
+import os
+import threading
 import cv2
 import numpy as np
 from PIL import Image, ImageTk
 
+from utils.tiled_image import is_tiled, read_tiled_size
+
+# Büyük ortofotoların başlıkları okunabilsin diye PIL'in piksel sınırı kaldırılır
+Image.MAX_IMAGE_PIXELS = None
+
+# EXIF yönlendirme etiketi; 5-8 değerlerinde cv2.imread görüntüyü 90 derece döndürür
+EXIF_ORIENTATION_TAG = 0x0112
+
+# Piramidin en küçük seviyesinin kısa kenarı bundan küçük olmaz
+PYRAMID_MIN_SIZE = 256
+
+# Yol -> ((mtime, dosya boyutu), (yükseklik, genişlik))
+_image_size_cache = {}
+_image_size_lock = threading.Lock()
+
+def _file_signature(path):
+    """Dosya değiştiğinde önbellek kaydını geçersiz kılmak için imza"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def remember_image_size(path, size):
+    """Zaten çözülmüş bir frame'in boyutunu önbelleğe ekle"""
+    try:
+        signature = _file_signature(path)
+    except OSError:
+        return
+    with _image_size_lock:
+        _image_size_cache[path] = (signature, tuple(size[:2]))
+
+def get_image_size(path):
+    """Görüntü boyutunu (yükseklik, genişlik) piksel çözmeden, sadece başlıktan oku
+
+    Sonuç yol başına önbelleğe alınır. cv2.imread ile tutarlı olması için
+    EXIF yönlendirmesi dikkate alınır. Döşemeli görüntülerin boyutu meta
+    verilerinden okunur. Okunamazsa None döndürür.
+    """
+    try:
+        signature = _file_signature(path)
+    except OSError:
+        print(f"Görüntü bulunamadı: {path}")
+        return None
+
+    with _image_size_lock:
+        cached = _image_size_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    try:
+        if is_tiled(path):
+            height, width = read_tiled_size(path)
+        else:
+            # Image.open sadece başlığı okur, pikseller çözülmez
+            with Image.open(path) as img:
+                width, height = img.size
+                if img.getexif().get(EXIF_ORIENTATION_TAG, 1) in (5, 6, 7, 8):
+                    width, height = height, width
+    except Exception as e:
+        print(f"Görüntü boyutu okunamadı: {path} - {e}")
+        return None
+
+    size = (height, width)
+    with _image_size_lock:
+        _image_size_cache[path] = (signature, size)
+    return size
+
+class ImagePyramid:
+    """Frame'in her seviyede yarıya küçültülmüş kopyalarından oluşan piramit
+
+    Seviyeler INTER_AREA ile bir kez oluşturulur; ekrana çizerken hedef
+    ölçeğe en yakın (ondan küçük olmayan) seviye küçültülür, böylece
+    yeniden çizim maliyeti kaynak çözünürlüğüne değil canvas boyutuna bağlı kalır.
+    """
+
+    def __init__(self, frame, min_size=PYRAMID_MIN_SIZE):
+        self.levels = [frame]
+        level = frame
+        while min(level.shape[:2]) // 2 >= min_size:
+            h, w = level.shape[:2]
+            level = cv2.resize(level, (w // 2, h // 2), interpolation=cv2.INTER_AREA)
+            self.levels.append(level)
+
+    @property
+    def frame(self):
+        """Tam çözünürlüklü frame"""
+        return self.levels[0]
+
+    @property
+    def shape(self):
+        return self.levels[0].shape
+
+    @property
+    def nbytes(self):
+        return sum(level.nbytes for level in self.levels)
+
+    def level_for_scale(self, scale):
+        """scale oranında çizim için kullanılacak en küçük yeterli seviyeyi döndür"""
+        full_w = self.levels[0].shape[1]
+        for level in reversed(self.levels):
+            if level.shape[1] >= full_w * scale:
+                return level
+        return self.levels[0]
+
+class Viewport:
+    """Görüntünün canvas üzerindeki görünümü: ölçek, kaydırma ve merkezleme ofseti
+
+    Ölçek, pencereye sığdırma ölçeği ile zoom faktörünün çarpımıdır. center,
+    canvas ortasına gelen görüntü noktasıdır (None ise görüntünün ortası);
+    görüntü canvas'tan büyükken kenar dışına kaydırılamayacak şekilde sınırlanır,
+    küçükken görüntü ortalanır.
+    """
+
+    def __init__(self, img_width, img_height, canvas_width, canvas_height,
+                 zoom_factor=1.0, center=None):
+        self.img_width = img_width
+        self.img_height = img_height
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        self.scale = min(canvas_width / img_width, canvas_height / img_height) * zoom_factor
+        
+        center_x, center_y = center if center is not None else (img_width / 2, img_height / 2)
+        self.offset_x = self._axis_offset(canvas_width, img_width, center_x)
+        self.offset_y = self._axis_offset(canvas_height, img_height, center_y)
+
+    def _axis_offset(self, canvas_size, img_size, center):
+        """Bir eksende görüntünün sol/üst kenarının canvas konumu"""
+        scaled = img_size * self.scale
+        if scaled <= canvas_size:
+            return int((canvas_size - scaled) // 2)
+        offset = canvas_size / 2 - center * self.scale
+        return int(round(min(0, max(canvas_size - scaled, offset))))
+
+    @property
+    def center(self):
+        """Sınırlandırılmış görünüm merkezi (görüntü koordinatlarında)"""
+        return ((self.canvas_width / 2 - self.offset_x) / self.scale,
+                (self.canvas_height / 2 - self.offset_y) / self.scale)
+
+    def panned(self, dx, dy):
+        """Görünüm canvas üzerinde (dx, dy) piksel sürüklendiğinde yeni merkezi döndür"""
+        center_x, center_y = self.center
+        return center_x - dx / self.scale, center_y - dy / self.scale
+
+    def to_canvas(self, img_x, img_y):
+        """Görüntü koordinatlarını canvas koordinatlarına dönüştür"""
+        return int(img_x * self.scale) + self.offset_x, int(img_y * self.scale) + self.offset_y
+
+    def to_image(self, canvas_x, canvas_y):
+        """Canvas koordinatlarını görüntü koordinatlarına dönüştür"""
+        return (int((canvas_x - self.offset_x) / self.scale),
+                int((canvas_y - self.offset_y) / self.scale))
+
+    def visible_region(self):
+        """Canvas'ta görünen görüntü bölgesi (x0, y0, x1, y1), görüntü koordinatlarında"""
+        x0 = max(0, int(np.floor(-self.offset_x / self.scale)))
+        y0 = max(0, int(np.floor(-self.offset_y / self.scale)))
+        x1 = min(self.img_width, int(np.ceil((self.canvas_width - self.offset_x) / self.scale)))
+        y1 = min(self.img_height, int(np.ceil((self.canvas_height - self.offset_y) / self.scale)))
+        return x0, y0, max(x1, x0 + 1), max(y1, y0 + 1)
+
 def resize_frame(frame, width, height, zoom_factor=1.0):
-    """Frame'i belirtilen boyuta yeniden boyutlandır"""
+    """Frame'i belirtilen boyuta yeniden boyutlandır
+
+    frame bir ImagePyramid ise hedef boyuta en yakın seviyeden küçültülür.
+    """
     h, w = frame.shape[:2]
     
     # Temel ölçeklendirme faktörünü hesapla (görüntüyü pencereye sığdırmak için)
@@ -16,65 +180,80 @@ def resize_frame(frame, width, height, zoom_factor=1.0):
     new_w = int(w * final_scale)
     new_h = int(h * final_scale)
     
-    # Frame'i yeniden boyutlandır
-    resized_frame = cv2.resize(frame, (new_w, new_h))
+    # Piramitte hedefe en yakın seviyeyi seç
+    source = frame.level_for_scale(final_scale) if isinstance(frame, ImagePyramid) else frame
+    
+    # Küçültürken alan ortalaması, büyütürken doğrusal ara değerleme
+    interpolation = cv2.INTER_AREA if new_w < source.shape[1] else cv2.INTER_LINEAR
+    resized_frame = cv2.resize(source, (new_w, new_h), interpolation=interpolation)
     
     # Tutarlılık için zoom_factor'ü döndür
     return resized_frame, zoom_factor
 
+def render_view(frame, viewport):
+    """Sadece görünür bölgeyi kırpıp canvas ölçeğine getir
+
+    frame bir ImagePyramid veya TiledImage ise kırpma ölçeğe en yakın seviyeden
+    yapılır (döşemeli görüntülerde sadece gereken döşemeler okunur); böylece
+    yeniden çizimin bellek ve süre maliyeti her zoom seviyesinde canvas boyutuyla
+    sınırlı kalır. (görüntü, canvas_x, canvas_y) döndürür.
+    """
+    x0, y0, x1, y1 = viewport.visible_region()
+    scale = viewport.scale
+    
+    # Piramitte hedefe en yakın seviyeyi seç ve bölgeyi o seviyenin koordinatlarına çevir
+    source = frame.level_for_scale(scale) if hasattr(frame, "level_for_scale") else frame
+    level_x = source.shape[1] / viewport.img_width
+    level_y = source.shape[0] / viewport.img_height
+    crop = source[int(y0 * level_y):max(int(y0 * level_y) + 1, int(np.ceil(y1 * level_y))),
+                  int(x0 * level_x):max(int(x0 * level_x) + 1, int(np.ceil(x1 * level_x)))]
+    
+    out_w = max(1, int(round((x1 - x0) * scale)))
+    out_h = max(1, int(round((y1 - y0) * scale)))
+    
+    # Küçültürken alan ortalaması, büyütürken doğrusal ara değerleme
+    interpolation = cv2.INTER_AREA if out_w < crop.shape[1] else cv2.INTER_LINEAR
+    view = cv2.resize(crop, (out_w, out_h), interpolation=interpolation)
+    
+    canvas_x, canvas_y = viewport.to_canvas(x0, y0)
+    return view, canvas_x, canvas_y
+
 def create_photo_image(frame):
     """OpenCV frame'inden Tkinter PhotoImage oluştur"""
     return ImageTk.PhotoImage(image=Image.fromarray(frame))
 
 def draw_grid(canvas, img_width, img_height, canvas_width, canvas_height, 
-              grid_size, grid_color, zoom_factor=1.0):
-    """Canvas üzerine ızgara çiz"""
-    # Görüntü boyutlarını hesapla
-    scaled_w = int(img_width * zoom_factor)
-    scaled_h = int(img_height * zoom_factor)
+              grid_size, grid_color, zoom_factor=1.0, center=None):
+    """Canvas üzerine ızgara çiz (sadece görünür bölgedeki çizgiler)"""
+    viewport = Viewport(img_width, img_height, canvas_width, canvas_height, zoom_factor, center)
     
-    # Görüntünün canvas üzerindeki konumu
-    offset_x = (canvas_width - scaled_w) // 2
-    offset_y = (canvas_height - scaled_h) // 2
+    # Çizgiler ekranda birbirine çok yakınsa çizme
+    if grid_size * viewport.scale < 2:
+        return
+    
+    # Görünür bölgenin canvas üzerindeki sınırları
+    x0, y0, x1, y1 = viewport.visible_region()
+    left, top = viewport.to_canvas(x0, y0)
+    right, bottom = viewport.to_canvas(x1, y1)
     
     # Yatay çizgiler
-    for y in range(0, scaled_h, int(grid_size * zoom_factor)):
-        canvas.create_line(
-            offset_x, offset_y + y, 
-            offset_x + scaled_w, offset_y + y,
-            fill=grid_color, tags="grid"
-        )
+    for y in range(-(-y0 // grid_size) * grid_size, y1, grid_size):
+        _, canvas_y = viewport.to_canvas(0, y)
+        canvas.create_line(left, canvas_y, right, canvas_y, fill=grid_color, tags="grid")
     
     # Dikey çizgiler
-    for x in range(0, scaled_w, int(grid_size * zoom_factor)):
-        canvas.create_line(
-            offset_x + x, offset_y,
-            offset_x + x, offset_y + scaled_h,
-            fill=grid_color, tags="grid"
-        )
+    for x in range(-(-x0 // grid_size) * grid_size, x1, grid_size):
+        canvas_x, _ = viewport.to_canvas(x, 0)
+        canvas.create_line(canvas_x, top, canvas_x, bottom, fill=grid_color, tags="grid")
 
 def canvas_to_image_coords(canvas_x, canvas_y, img_width, img_height, 
-                          canvas_width, canvas_height, zoom_factor):
+                          canvas_width, canvas_height, zoom_factor, center=None):
     """Canvas koordinatlarını görüntü koordinatlarına dönüştür"""
-    # Canvas merkezleme ofsetini hesapla
-    offset_x = (canvas_width - img_width * zoom_factor) // 2
-    offset_y = (canvas_height - img_height * zoom_factor) // 2
-    
-    # Canvas koordinatlarından görüntü koordinatlarına dönüştür
-    img_x = int((canvas_x - offset_x) / zoom_factor)
-    img_y = int((canvas_y - offset_y) / zoom_factor)
-    
-    return img_x, img_y
+    viewport = Viewport(img_width, img_height, canvas_width, canvas_height, zoom_factor, center)
+    return viewport.to_image(canvas_x, canvas_y)
 
 def image_to_canvas_coords(img_x, img_y, img_width, img_height, 
-                          canvas_width, canvas_height, zoom_factor):
+                          canvas_width, canvas_height, zoom_factor, center=None):
     """Görüntü koordinatlarını canvas koordinatlarına dönüştür"""
-    # Canvas merkezleme ofsetini hesapla
-    offset_x = (canvas_width - img_width * zoom_factor) // 2
-    offset_y = (canvas_height - img_height * zoom_factor) // 2
-    
-    # Görüntü koordinatlarından canvas koordinatlarına dönüştür
-    canvas_x = int(img_x * zoom_factor) + offset_x
-    canvas_y = int(img_y * zoom_factor) + offset_y
-    
-    return canvas_x, canvas_y 
\ No newline at end of file
+    viewport = Viewport(img_width, img_height, canvas_width, canvas_height, zoom_factor, center)
+    return viewport.to_canvas(img_x, img_y)
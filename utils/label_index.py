@@ -0,0 +1,190 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from utils.file_utils import boxes_to_yolo, yolo_to_boxes, parse_yolo_labels
+
+# Her iş parçacığına bir seferde verilen etiket dosyası sayısı
+READ_CHUNK_SIZE = 256
+
+def _read_chunk(items):
+    """(frame indeksi, etiket yolu) çiftlerini okuyup çöz, (indeks, sınıflar, kutular) listesi döndür"""
+    results = []
+    for idx, label_path in items:
+        try:
+            with open(label_path, "r") as f:
+                class_ids, yolo = parse_yolo_labels(f.read())
+        except Exception as e:
+            print(f"Etiket dosyası okunamadı: {label_path} - {e}")
+            continue
+        if len(class_ids):
+            results.append((idx, class_ids, yolo))
+    return results
+
+class LabelIndex:
+    """Oturumdaki tüm etiket dosyalarının sütunlu, bellek içi indeksi
+
+    Kutular frame sırasıyla tek dizilerde tutulur: frame_ids (N,), class_ids
+    (N,) ve boxes (N, 4) normalize [x_merkez, y_merkez, genişlik, yükseklik];
+    i. frame'in kutuları offsets[i]:offsets[i + 1] aralığındadır. İndeks
+    yüklendikten sonra kaydedilen frameler ayrıca tutulur ve önceliklidir.
+    """
+
+    def __init__(self, frame_count=0):
+        self.frame_ids = np.empty(0, dtype=np.int32)
+        self.class_ids = np.empty(0, dtype=np.int32)
+        self.boxes = np.empty((0, 4), dtype=np.float32)
+        self.offsets = np.zeros(frame_count + 1, dtype=np.int64)
+        self.has_file = np.zeros(frame_count, dtype=bool)  # Etiket dosyası var mı
+        self.ready = False
+
+        # Tk iş parçacığı ve arka plan yüklemesi aynı indeksi kilitle paylaşır
+        self._lock = threading.Lock()
+        self._saved = {}
+        self._load_thread = None
+        self._stop_event = threading.Event()
+
+    def load(self, frame_paths, output_dir, workers=None):
+        """Etiket dosyalarını paralel okuyup indeksi oluştur
+
+        labels/ klasörü bir kez listelenir, böylece etiketi olmayan frameler
+        için dosya sistemine gidilmez. stop_event set edilirse yarıda bırakılır
+        ve indeks hazır sayılmaz.
+        """
+        frame_count = len(frame_paths)
+        labels_dir = os.path.join(output_dir, "labels")
+        try:
+            names = {entry.name for entry in os.scandir(labels_dir) if entry.name.endswith(".txt")}
+        except OSError:
+            names = set()
+
+        items = []
+        for idx, frame_path in enumerate(frame_paths):
+            name = os.path.splitext(os.path.basename(frame_path))[0] + ".txt"
+            if name in names:
+                items.append((idx, os.path.join(labels_dir, name)))
+
+        results = []
+        workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            chunks = [items[i:i + READ_CHUNK_SIZE] for i in range(0, len(items), READ_CHUNK_SIZE)]
+            for chunk_results in executor.map(_read_chunk, chunks):
+                if self._stop_event.is_set():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return False
+                results.extend(chunk_results)
+
+        # Frame sırasına göre tek sütunlu dizilere birleştir
+        counts = np.zeros(frame_count, dtype=np.int64)
+        if results:
+            frame_ids = np.concatenate([np.full(len(c), idx, dtype=np.int32) for idx, c, _ in results])
+            class_ids = np.concatenate([c for _, c, _ in results])
+            boxes = np.concatenate([b for _, _, b in results]).astype(np.float32)
+            counts[:] = np.bincount(frame_ids, minlength=frame_count)
+        else:
+            frame_ids = np.empty(0, dtype=np.int32)
+            class_ids = np.empty(0, dtype=np.int32)
+            boxes = np.empty((0, 4), dtype=np.float32)
+
+        offsets = np.zeros(frame_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        has_file = np.zeros(frame_count, dtype=bool)
+        has_file[[idx for idx, _ in items]] = True
+
+        with self._lock:
+            self.frame_ids, self.class_ids, self.boxes = frame_ids, class_ids, boxes
+            self.offsets = offsets
+            self.has_file = has_file
+            self.ready = True
+
+        print(f"Etiket indeksi oluşturuldu: {len(items)} dosya, {len(class_ids)} kutu")
+        return True
+
+    def load_in_background(self, frame_paths, output_dir):
+        """load() işlemini arka plan iş parçacığında başlat"""
+        self._stop_event.clear()
+        self._load_thread = threading.Thread(target=self._load_worker,
+                                             args=(list(frame_paths), output_dir), daemon=True)
+        self._load_thread.start()
+
+    def _load_worker(self, frame_paths, output_dir):
+        try:
+            self.load(frame_paths, output_dir)
+        except Exception as e:
+            print(f"Etiket indeksi oluşturulamadı: {e}")
+
+    def close(self):
+        """Arka plan yüklemesini durdur"""
+        self._stop_event.set()
+        if self._load_thread is not None:
+            self._load_thread.join()
+            self._load_thread = None
+
+    def wait(self):
+        """Arka plan yüklemesinin bitmesini bekle"""
+        if self._load_thread is not None:
+            self._load_thread.join()
+
+    def remove_class(self, class_id):
+        """Silinen etiketi indeksten çıkar (bkz. BoxSet.remove_class)
+
+        Sınıf ID'leri değişen frame indekslerini döndürür; bu framelerin
+        etiket dosyaları yeniden yazılmalıdır.
+        """
+        with self._lock:
+            affected = set(np.unique(self.frame_ids[self.class_ids >= class_id]).tolist())
+            keep = self.class_ids != class_id
+            frame_ids, class_ids, boxes = self.frame_ids[keep], self.class_ids[keep], self.boxes[keep]
+            class_ids[class_ids > class_id] -= 1
+            counts = np.bincount(frame_ids, minlength=len(self.offsets) - 1)
+            offsets = np.zeros(len(self.offsets), dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+            self.frame_ids, self.class_ids, self.boxes, self.offsets = frame_ids, class_ids, boxes, offsets
+
+            # Sonradan kaydedilen framelerde geçerli olan kaydedilen halidir
+            affected -= set(self._saved)
+            for idx, (saved_ids, saved_boxes) in list(self._saved.items()):
+                if (saved_ids >= class_id).any():
+                    affected.add(idx)
+                    keep = saved_ids != class_id
+                    saved_ids = saved_ids[keep]
+                    saved_ids[saved_ids > class_id] -= 1
+                    self._saved[idx] = (saved_ids, saved_boxes[keep])
+        return sorted(affected)
+
+    def get(self, idx):
+        """Frame'in (sınıf ID'leri, normalize kutular) dizilerini döndür, indeks hazır değilse None"""
+        with self._lock:
+            if idx in self._saved:
+                return self._saved[idx]
+            if not self.ready:
+                return None
+            if not 0 <= idx < len(self.offsets) - 1:
+                return self.class_ids[:0], self.boxes[:0]
+            start, end = self.offsets[idx], self.offsets[idx + 1]
+            return self.class_ids[start:end], self.boxes[start:end]
+
+    def has_label_file(self, idx):
+        """Frame'in etiket dosyası olup olmadığını döndür, indeks hazır değilse None"""
+        with self._lock:
+            if idx in self._saved:
+                return True
+            if not self.ready:
+                return None
+            return 0 <= idx < len(self.has_file) and bool(self.has_file[idx])
+
+    def get_boxes(self, idx, labels, img_size):
+        """Frame'in kutularını piksel koordinatlı BoxSet olarak döndür, indeks hazır değilse None"""
+        entry = self.get(idx)
+        if entry is None:
+            return None
+        img_h, img_w = img_size
+        return yolo_to_boxes(entry[0], entry[1], labels, img_w, img_h)
+
+    def set_boxes(self, idx, boxes, img_size):
+        """Kaydedilen frame'in kutularını indekse yaz (BoxSet)"""
+        img_h, img_w = img_size
+        entry = (np.array(boxes.class_ids), boxes_to_yolo(boxes.coords, img_w, img_h).astype(np.float32))
+        with self._lock:
+            self._saved[idx] = entry
@@ -0,0 +1,247 @@
+import os
+import sqlite3
+import hashlib
+import threading
+
+from utils.frame_store import FrameStore
+from utils.image_utils import get_image_size
+from utils.file_utils import get_label_path
+
+# Çıktı klasöründeki manifest veritabanı
+MANIFEST_FILE = "manifest.db"
+
+# Arka plan doğrulamasında kaç satırda bir veritabanına yazılır
+REFRESH_BATCH_SIZE = 500
+
+# WAL paylaşımlı bellek gerektirir, bu dosya sistemlerinde çalışmaz
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "sshfs", "fuse.sshfs",
+                       "9p", "afs", "ceph", "glusterfs", "fuse.glusterfs", "davfs"}
+
+def is_network_path(path):
+    """Yolun bir ağ dosya sisteminde olup olmadığını tahmin et"""
+    path = os.path.abspath(path)
+    if os.name == "nt":
+        if path.startswith("\\\\"):
+            return True
+        try:
+            import ctypes
+            drive = os.path.splitdrive(path)[0] + "\\"
+            return ctypes.windll.kernel32.GetDriveTypeW(drive) == 4  # DRIVE_REMOTE
+        except Exception:
+            return False
+
+    # Yolu içeren en uzun bağlama noktasının dosya sistemi türüne bak
+    try:
+        with open("/proc/mounts", "r") as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return False
+    best, fs_type = "", ""
+    for mount_point, mount_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best):
+            best, fs_type = mount_point, mount_type
+    return fs_type in NETWORK_FILESYSTEMS
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """Dosya içeriğinin özetini hesapla"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def label_status(label_path):
+    """Etiket dosyası durumu: None yok, 0 boş, 1 kutu içeriyor"""
+    try:
+        return 1 if os.path.getsize(label_path) > 0 else 0
+    except OSError:
+        return None
+
+class DatasetManifest:
+    """Her frame'in yolunu, boyutunu, mtime'ını, içerik özetini ve etiket durumunu tutan SQLite manifest
+
+    Oturuma devam ederken frames/ klasörünü listelemek ve frameleri okumak
+    yerine manifest okunur. Frameler eklendikçe ve etiketler kaydedildikçe
+    artımlı olarak güncellenir; mtime ve özet arka planda doldurulur.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.db_path = os.path.join(output_dir, MANIFEST_FILE)
+
+        # Tk iş parçacığı ve arka plan doğrulaması aynı bağlantıyı kilitle paylaşır
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._set_journal_mode()
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS frames (
+                                  idx INTEGER PRIMARY KEY,
+                                  path TEXT NOT NULL,
+                                  height INTEGER,
+                                  width INTEGER,
+                                  mtime REAL,
+                                  hash TEXT,
+                                  labeled INTEGER)""")
+        self._conn.commit()
+
+        self._refresh_thread = None
+        self._stop_event = threading.Event()
+
+    def _set_journal_mode(self):
+        """Yerel diskte WAL, ağ dosya sistemlerinde veya WAL açılamazsa DELETE kipini kullan"""
+        if not is_network_path(self.output_dir):
+            try:
+                mode = self._conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                if mode.lower() == "wal":
+                    return
+            except sqlite3.Error as e:
+                print(f"Manifest WAL kipine alınamadı: {e}")
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+
+    @staticmethod
+    def exists(output_dir):
+        """Çıktı klasöründe manifest olup olmadığını kontrol et"""
+        return bool(output_dir) and os.path.exists(os.path.join(output_dir, MANIFEST_FILE))
+
+    def _relative(self, frame_path):
+        """Çıktı klasörü taşınabilsin diye yolları göreli sakla"""
+        prefix = os.path.join(self.output_dir, "")
+        if frame_path.startswith(prefix):
+            return frame_path[len(prefix):]
+        return os.path.relpath(frame_path, self.output_dir)
+
+    def clear(self):
+        """Tüm frame kayıtlarını sil (yeni çıkarma/aktarma başlarken)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM frames")
+            self._conn.commit()
+
+    def _frame_row(self, idx, frame_path, size):
+        height, width = size if size else (None, None)
+        return (idx, self._relative(frame_path), height, width,
+                label_status(get_label_path(frame_path, self.output_dir)))
+
+    def add_frame(self, idx, frame_path, size=None):
+        """Frame kaydı ekle (commit() çağrılana kadar yazılmaz)"""
+        row = self._frame_row(idx, frame_path, size)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO frames (idx, path, height, width, labeled) "
+                               "VALUES (?, ?, ?, ?, ?)", row)
+
+    def add_frames(self, frames):
+        """FrameStore'daki tüm frameleri tek işlemde ekle"""
+        rows = [self._frame_row(idx, frame_path, frames.frame_sizes.get(idx))
+                for idx, frame_path in enumerate(frames.frame_paths)]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO frames (idx, path, height, width, labeled) "
+                                   "VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def commit(self):
+        """Bekleyen değişiklikleri veritabanına yaz"""
+        with self._lock:
+            self._conn.commit()
+
+    def set_label_status(self, idx, labeled):
+        """Frame'in etiket durumunu güncelle (etiket kaydedildikten sonra)"""
+        with self._lock:
+            self._conn.execute("UPDATE frames SET labeled = ? WHERE idx = ?",
+                               (None if labeled is None else int(labeled), idx))
+            self._conn.commit()
+
+    def load_frame_store(self):
+        """Manifestten frame deposunu oluştur (dosyalara dokunulmaz)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT idx, path, height, width FROM frames "
+                                      "ORDER BY idx").fetchall()
+
+        frames = FrameStore(os.path.join(self.output_dir, row[1]) for row in rows)
+        for i, (_, _, height, width) in enumerate(rows):
+            if height and width:
+                frames.frame_sizes[i] = (height, width)
+        return frames
+
+    def refresh(self):
+        """Eksik veya eskimiş kayıtları (boyut, mtime, özet, etiket durumu) doldur
+
+        Değiştirilme zamanı kayıtlı olandan farklı dosyaların boyutu ve özeti
+        yeniden hesaplanır. stop_event set edilirse yarıda bırakılır.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT idx, path, height, width, mtime, hash, labeled "
+                                      "FROM frames ORDER BY idx").fetchall()
+
+        updates = []
+        for idx, path, height, width, mtime, digest, _ in rows:
+            if self._stop_event.is_set():
+                break
+
+            frame_path = os.path.join(self.output_dir, path)
+            try:
+                current_mtime = os.stat(frame_path).st_mtime
+            except OSError:
+                continue
+
+            if current_mtime != mtime or digest is None or not height:
+                size = get_image_size(frame_path)
+                if size:
+                    height, width = size
+                try:
+                    digest = file_hash(frame_path)
+                except OSError:
+                    continue
+                mtime = current_mtime
+
+            updates.append((height, width, mtime, digest, get_label_path(frame_path, self.output_dir), idx))
+
+            if len(updates) >= REFRESH_BATCH_SIZE:
+                self._write_updates(updates)
+                updates = []
+
+        if updates:
+            self._write_updates(updates)
+
+    def _write_updates(self, updates):
+        # Etiket durumu kilit altında okunur, böylece aynı anda kaydedilen bir
+        # etiketin set_label_status ile yazdığı durum eskisiyle ezilmez
+        with self._lock:
+            rows = [(height, width, mtime, digest, label_status(label_path), idx)
+                    for height, width, mtime, digest, label_path, idx in updates]
+            self._conn.executemany("UPDATE frames SET height = ?, width = ?, mtime = ?, hash = ?, "
+                                   "labeled = ? WHERE idx = ?", rows)
+            self._conn.commit()
+
+    def refresh_in_background(self):
+        """refresh() işlemini arka plan iş parçacığında başlat"""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(target=self._refresh_worker, daemon=True)
+        self._refresh_thread.start()
+
+    def _refresh_worker(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Manifest güncellenirken hata oluştu: {e}")
+
+    def close(self):
+        """Arka plan doğrulamasını durdur ve bağlantıyı kapat"""
+        self._stop_event.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
+            self._refresh_thread = None
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+def open_manifest(output_dir):
+    """Çıktı klasöründeki manifesti aç (yoksa oluştur), hata olursa None döndür"""
+    if not output_dir:
+        return None
+    try:
+        return DatasetManifest(output_dir)
+    except Exception as e:
+        print(f"Manifest açılamadı: {e}")
+        return None
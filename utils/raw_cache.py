@@ -0,0 +1,173 @@
+import os
+import json
+import shutil
+import numpy as np
+
+# Çıktı klasöründeki ham frame önbelleği
+RAW_CACHE_DIR = "raw_cache"
+RAW_FRAMES_FILE = "frames.npy"
+RAW_INDEX_FILE = "index.npy"
+RAW_META_FILE = "meta.json"
+
+# Önbellek oluşturulduktan sonra diskte en az bu kadar boş yer kalmalı
+RAW_CACHE_FREE_MARGIN = 1024 * 1024 * 1024
+
+# İlerleme bildirimi kaç frame'de bir yapılır
+PROGRESS_REPORT_EVERY = 25
+
+def raw_cache_dir(output_dir):
+    """Ham frame önbelleği klasörünün yolu"""
+    return os.path.join(output_dir, RAW_CACHE_DIR)
+
+class RawFrameCache:
+    """Frameleri bir kez çözülmüş ham RGB olarak tutan bellek eşlemeli dosya
+
+    Her frame en büyük frame boyutundaki sabit bir yuvada saklanır; i.
+    frame'in konumu i * yuva boyutudur, gerçek boyutu indeks tablosundadır
+    (0 ise frame önbellekte yok). get() kopyasız bir numpy görünümü döndürür,
+    bellekten atmayı işletim sisteminin sayfa önbelleği yapar.
+    """
+
+    def __init__(self, frames_array, index):
+        self._frames = frames_array
+        self._index = index
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def nbytes(self):
+        """Önbellek dosyasının boyutu (bayt)"""
+        return self._frames.nbytes
+
+    def __contains__(self, idx):
+        return 0 <= idx < len(self._index) and self._index[idx, 0] > 0
+
+    def get(self, idx):
+        """Frame'in kopyasız görünümünü döndür, önbellekte yoksa None"""
+        if idx not in self:
+            return None
+        height, width = self._index[idx]
+        return self._frames[idx, :height, :width]
+
+def estimate_raw_cache_bytes(frames):
+    """Önbelleğin diskte kaplayacağı yaklaşık boyutu (bayt) ve frame boyutlarını döndür"""
+    sizes = [frames.get_size(i) for i in range(len(frames))]
+    known = [size for size in sizes if size]
+    if not known:
+        return 0, sizes
+    max_h = max(size[0] for size in known)
+    max_w = max(size[1] for size in known)
+    return len(sizes) * max_h * max_w * 3, sizes
+
+def build_raw_cache(frames, output_dir, progress_callback=None, frame_callback=None, cancel_event=None):
+    """Frame deposundaki tüm frameleri çözüp ham önbellek dosyasına yaz
+
+    Gereken disk alanı frame boyutları okunarak burada hesaplanır, bu
+    yüzden arka plan iş parçacığında çağrılmalıdır. Önbellek geçici bir
+    klasörde oluşturulur ve bitince eskisinin yerine taşınır; bu yüzden
+    silinip yeniden oluşturulması her zaman güvenlidir.
+    İptal edilirse o ana kadar çözülen frameler korunur. frame_callback(yol,
+    boyut) her yazılan frame için çağrılır. Başarılıysa True döndürür.
+    """
+    total = len(frames)
+    if not total or not output_dir:
+        print("Önbelleğe alınacak frame yok.")
+        return False
+
+    needed, sizes = estimate_raw_cache_bytes(frames)
+    if not needed:
+        print("Frame boyutları okunamadı, ham önbellek oluşturulamadı.")
+        return False
+
+    free = shutil.disk_usage(output_dir).free
+    if needed + RAW_CACHE_FREE_MARGIN > free:
+        print(f"Ham önbellek için yeterli disk alanı yok: {needed / 1e9:.1f} GB gerekli, "
+              f"{free / 1e9:.1f} GB boş")
+        return False
+
+    cache_dir = raw_cache_dir(output_dir)
+    tmp_dir = cache_dir + ".tmp"
+    try:
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        os.makedirs(tmp_dir)
+
+        max_h = max(size[0] for size in sizes if size)
+        max_w = max(size[1] for size in sizes if size)
+        slots = np.lib.format.open_memmap(os.path.join(tmp_dir, RAW_FRAMES_FILE), mode="w+",
+                                          dtype=np.uint8, shape=(total, max_h, max_w, 3))
+        index = np.zeros((total, 2), dtype=np.int32)
+
+        written = 0
+        for idx in range(total):
+            if cancel_event is not None and cancel_event.is_set():
+                print("Ham önbellek oluşturma iptal edildi.")
+                break
+
+            frame = frames.read_frame(idx)
+            if frame is not None:
+                height, width = frame.shape[:2]
+                if height <= max_h and width <= max_w:
+                    slots[idx, :height, :width] = frame
+                    index[idx] = (height, width)
+                    written += 1
+                    if frame_callback:
+                        frame_callback(frames.get_path(idx), (height, width))
+                else:
+                    print(f"Frame boyutu beklenenden büyük, önbelleğe alınmadı: {frames.get_path(idx)}")
+
+            if progress_callback and (idx + 1) % PROGRESS_REPORT_EVERY == 0:
+                progress_callback(idx + 1, total)
+
+        slots.flush()
+        # Windows'ta eşlenmiş dosyalar açıkken klasör taşınamaz
+        slots = None
+
+        np.save(os.path.join(tmp_dir, RAW_INDEX_FILE), index)
+        with open(os.path.join(tmp_dir, RAW_META_FILE), "w") as f:
+            json.dump({"frame_paths": frames.frame_paths}, f)
+
+        if os.path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
+        os.replace(tmp_dir, cache_dir)
+
+        if progress_callback:
+            progress_callback(total, total)
+        print(f"Ham önbellek oluşturuldu: {written}/{total} frame ({needed / 1e9:.1f} GB)")
+        return True
+    except Exception as e:
+        print(f"Ham önbellek oluşturulamadı: {e}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
+
+def open_raw_cache(frames, output_dir):
+    """Çıktı klasöründeki ham önbelleği aç; yoksa veya başka framelere aitse None döndür"""
+    if not output_dir:
+        return None
+
+    cache_dir = raw_cache_dir(output_dir)
+    if not os.path.exists(os.path.join(cache_dir, RAW_META_FILE)):
+        return None
+
+    try:
+        with open(os.path.join(cache_dir, RAW_META_FILE), "r") as f:
+            meta = json.load(f)
+        if meta.get("frame_paths") != frames.frame_paths:
+            print("Ham önbellek mevcut framelerle eşleşmiyor, kullanılmayacak.")
+            return None
+
+        frames_array = np.load(os.path.join(cache_dir, RAW_FRAMES_FILE), mmap_mode="r")
+        index = np.load(os.path.join(cache_dir, RAW_INDEX_FILE))
+        return RawFrameCache(frames_array, index)
+    except Exception as e:
+        print(f"Ham önbellek açılamadı: {e}")
+        return None
+
+def remove_raw_cache(output_dir):
+    """Ham önbelleği sil (frameler yeniden çıkarıldığında geçersiz olur)"""
+    if not output_dir:
+        return
+    for path in (raw_cache_dir(output_dir), raw_cache_dir(output_dir) + ".tmp"):
+        if os.path.exists(path):
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,277 @@
+import os
+import json
+import shutil
+import threading
+import cv2
+import numpy as np
+from PIL import Image, ImageOps
+
+# Bu kadar pikselden büyük görüntüler içe aktarılırken döşemeli biçime dönüştürülür
+TILED_MIN_PIXELS = 64 * 1024 * 1024
+
+# Döşeme kenar uzunluğu (piksel)
+TILE_SIZE = 512
+
+# Döşemeli görüntüler frames/ altında bu uzantılı klasörler olarak saklanır
+TILED_EXTENSION = ".tiled"
+TILED_INFO_FILE = "info.json"
+
+# Döşeme önbelleğinin varsayılan bellek sınırı
+TILE_CACHE_BYTES = 256 * 1024 * 1024
+
+# Dönüştürme kaynak görüntünün tamamını bir kez (diske) çözer; aynı anda tek dönüştürme yapılır
+_convert_lock = threading.Lock()
+
+# Kaynak görüntünün dönüştürme sırasında çözüldüğü geçici dosya
+SOURCE_BUFFER_FILE = "source.raw"
+
+# Pillow'un doğrudan bellek eşlemeli dosyaya çözebildiği modlar (4 bayt/piksel düzeni)
+_BUFFER_MODES = {"RGB": "RGBX", "RGBA": "RGBA"}
+
+# EXIF yönlendirmesine karşılık gelen kopyasız numpy görünümleri (ImageOps.exif_transpose ile aynı)
+_EXIF_TRANSFORMS = {
+    2: lambda a: a[:, ::-1],
+    3: lambda a: a[::-1, ::-1],
+    4: lambda a: a[::-1],
+    5: lambda a: a.transpose(1, 0, 2),
+    6: lambda a: a.transpose(1, 0, 2)[:, ::-1],
+    7: lambda a: a.transpose(1, 0, 2)[::-1, ::-1],
+    8: lambda a: a.transpose(1, 0, 2)[::-1],
+}
+
+def is_tiled(path):
+    """Yolun döşemeli bir görüntü klasörü olup olmadığını kontrol et"""
+    return path.endswith(TILED_EXTENSION) and os.path.isdir(path)
+
+def read_tiled_info(path):
+    """Döşemeli görüntünün meta verilerini oku"""
+    with open(os.path.join(path, TILED_INFO_FILE), "r") as f:
+        return json.load(f)
+
+def read_tiled_size(path):
+    """Döşemeli görüntünün tam çözünürlüklü boyutunu (yükseklik, genişlik) döndür"""
+    info = read_tiled_info(path)
+    return info["height"], info["width"]
+
+def _tile_count(size, tile_size):
+    return -(-size // tile_size)
+
+def _level_path(path, index):
+    return os.path.join(path, f"level_{index}.npy")
+
+def _create_level(path, index, height, width, tile_size):
+    """(döşeme satırı, döşeme sütunu, T, T, 3) şeklinde disk üzerinde bir seviye oluştur"""
+    shape = (_tile_count(height, tile_size), _tile_count(width, tile_size), tile_size, tile_size, 3)
+    return np.lib.format.open_memmap(_level_path(path, index), mode="w+", dtype=np.uint8, shape=shape)
+
+def _write_rows(level, ty, rows):
+    """Bir döşeme satırı yüksekliğindeki şeridi döşemelere bölüp yaz (kenarlar sıfırla doldurulur)"""
+    n_tx, tile_size = level.shape[1], level.shape[2]
+    strip = np.zeros((tile_size, n_tx * tile_size, 3), np.uint8)
+    strip[:rows.shape[0], :rows.shape[1]] = rows
+    level[ty] = strip.reshape(tile_size, n_tx, tile_size, 3).transpose(1, 0, 2, 3)
+
+def _read_rows(level, ty0, ty1):
+    """ty0..ty1 döşeme satırlarını birleştirip tek bir şerit olarak döndür"""
+    tiles = np.asarray(level[ty0:ty1])
+    n, n_tx, tile_size = tiles.shape[:3]
+    return tiles.transpose(0, 2, 1, 3, 4).reshape(n * tile_size, n_tx * tile_size, 3)
+
+def _read_source(src_path):
+    """Kaynak görüntüyü RGB olarak belleğe çöz (OpenCV'nin piksel sınırını aşanlar PIL ile)"""
+    frame = cv2.imread(src_path)
+    if frame is not None:
+        # Yerinde dönüştürülür, görüntünün ikinci bir kopyası oluşmaz
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+
+    with Image.open(src_path) as img:
+        # cv2.imread ile tutarlı olması için EXIF yönlendirmesi uygulanır
+        return np.asarray(ImageOps.exif_transpose(img).convert("RGB"))
+
+def _open_source(src_path, buffer_path):
+    """Kaynak görüntüyü (yükseklik, genişlik, 3) RGB dizisi olarak aç
+
+    Pillow görüntüyü bellek yerine buffer_path'teki bellek eşlemeli dosyaya
+    çözer ve EXIF yönlendirmesi kopyasız görünüm olarak uygulanır; böylece
+    sadece dilimlenen şeritler RAM'e okunur. Pillow'un bu şekilde çözemediği
+    modlarda görüntü bir kez bellekte çözülür.
+    """
+    with Image.open(src_path) as img:
+        buffer_mode = _BUFFER_MODES.get(img.mode)
+        if buffer_mode is not None:
+            width, height = img.size
+            buffer = np.memmap(buffer_path, dtype=np.uint8, mode="w+", shape=(height, width, 4))
+            core = Image.core.map_buffer(buffer, img.size, "raw", 0, (buffer_mode, 0, 1))
+            img.im = core
+            img.load()
+            # Sıkıştırılmamış bazı dosyalarda Pillow dosyanın kendisini eşler
+            if img.im is core:
+                transform = _EXIF_TRANSFORMS.get(img.getexif().get(0x0112, 1))
+                image = buffer[:, :, :3]
+                return transform(image) if transform else image
+
+    return _read_source(src_path)
+
+def convert_to_tiled(src_path, dst_path, tile_size=TILE_SIZE):
+    """Görüntüyü bir kez döşemeli, bellek eşlemeli biçime ve genel bakış seviyelerine dönüştür
+
+    Her seviye, döşemeleri diskte ardışık duran bir .npy dosyasıdır; her
+    seviye bir öncekinin yarısıdır ve en küçüğü tek döşemeye sığar. Kaynak
+    (desteklenen modlarda) diske çözülüp döşeme satırı yüksekliğindeki
+    şeritlerle okunur; genel bakış seviyeleri de önceki seviyeden şerit şerit
+    oluşturulur, böylece görüntünün tamamı hiçbir zaman bellekte tutulmaz.
+    Başarılıysa (yükseklik, genişlik), hata olursa None döndürür.
+    """
+    tmp_path = dst_path + ".tmp"
+    try:
+        with _convert_lock:
+            if os.path.exists(tmp_path):
+                shutil.rmtree(tmp_path)
+            os.makedirs(tmp_path)
+
+            # Tam çözünürlüklü seviye
+            buffer_path = os.path.join(tmp_path, SOURCE_BUFFER_FILE)
+            image = _open_source(src_path, buffer_path)
+            height, width = image.shape[:2]
+            level = _create_level(tmp_path, 0, height, width, tile_size)
+            for ty in range(level.shape[0]):
+                _write_rows(level, ty, image[ty * tile_size:(ty + 1) * tile_size])
+            # Eşleme kapatılmadan geçici dosya silinemez (Windows)
+            del image
+            if os.path.exists(buffer_path):
+                os.remove(buffer_path)
+
+            # Genel bakış seviyeleri: iki döşeme satırı yarıya küçültülerek bir satır olur
+            sizes = [(height, width)]
+            while max(sizes[-1]) > tile_size:
+                prev_h, prev_w = sizes[-1]
+                new_h, new_w = _tile_count(prev_h, 2), _tile_count(prev_w, 2)
+                new_level = _create_level(tmp_path, len(sizes), new_h, new_w, tile_size)
+                for ty in range(new_level.shape[0]):
+                    y0 = 2 * ty * tile_size
+                    y1 = min(prev_h, y0 + 2 * tile_size)
+                    rows = _read_rows(level, 2 * ty, 2 * ty + 2)[:y1 - y0, :prev_w]
+                    small = cv2.resize(rows, (new_w, _tile_count(y1 - y0, 2)), interpolation=cv2.INTER_AREA)
+                    _write_rows(new_level, ty, small)
+                level.flush()
+                level = new_level
+                sizes.append((new_h, new_w))
+            level.flush()
+            # Windows'ta eşlenmiş dosyalar açıkken klasör taşınamaz
+            level = new_level = None
+
+            info = {
+                "width": width,
+                "height": height,
+                "tile_size": tile_size,
+                "levels": sizes,
+                "source": os.path.abspath(src_path)
+            }
+            with open(os.path.join(tmp_path, TILED_INFO_FILE), "w") as f:
+                json.dump(info, f)
+
+            # Yarım kalmış bir dönüştürme hiçbir zaman geçerli görünmesin
+            if os.path.exists(dst_path):
+                shutil.rmtree(dst_path)
+            os.replace(tmp_path, dst_path)
+
+        print(f"Döşemeli görüntü oluşturuldu: {dst_path} ({width}x{height}, {len(sizes)} seviye)")
+        return height, width
+    except Exception as e:
+        print(f"Görüntü döşemeli biçime dönüştürülemedi: {src_path} - {e}")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        return None
+
+class TiledLevel:
+    """Döşemeli görüntünün bir seviyesi; dilimlendiğinde sadece gereken döşemeler okunur"""
+
+    def __init__(self, image, index, height, width):
+        self.image = image
+        self.index = index
+        self.height = height
+        self.width = width
+
+    @property
+    def shape(self):
+        return (self.height, self.width, 3)
+
+    def __getitem__(self, key):
+        """level[y0:y1, x0:x1] bölgesini döşemelerden birleştirip döndür"""
+        rows, cols = key
+        y0, y1, _ = rows.indices(self.height)
+        x0, x1, _ = cols.indices(self.width)
+        region = np.empty((max(0, y1 - y0), max(0, x1 - x0), 3), np.uint8)
+        if region.size == 0:
+            return region
+
+        tile_size = self.image.tile_size
+        for ty in range(y0 // tile_size, (y1 - 1) // tile_size + 1):
+            top = ty * tile_size
+            ry0, ry1 = max(y0, top), min(y1, top + tile_size)
+            for tx in range(x0 // tile_size, (x1 - 1) // tile_size + 1):
+                left = tx * tile_size
+                rx0, rx1 = max(x0, left), min(x1, left + tile_size)
+                tile = self.image.get_tile(self.index, ty, tx)
+                region[ry0 - y0:ry1 - y0, rx0 - x0:rx1 - x0] = tile[ry0 - top:ry1 - top, rx0 - left:rx1 - left]
+        return region
+
+class TiledImage:
+    """Disk üzerinde döşemeli ve bellek eşlemeli, genel bakış seviyeli görüntü
+
+    ImagePyramid ile aynı arayüzü sunar (shape, levels, level_for_scale);
+    seviyeler dilimlendiğinde sadece görünür bölgenin döşemeleri okunur ve
+    verilen döşeme önbelleğinde (get/put arayüzlü LRU) tutulur.
+    """
+
+    def __init__(self, path, tile_cache=None):
+        info = read_tiled_info(path)
+        self.path = path
+        self.tile_size = info["tile_size"]
+        self.tile_cache = tile_cache
+        self._arrays = [np.load(_level_path(path, i), mmap_mode="r")
+                        for i in range(len(info["levels"]))]
+        self.levels = [TiledLevel(self, i, height, width)
+                       for i, (height, width) in enumerate(info["levels"])]
+
+    @property
+    def shape(self):
+        return self.levels[0].shape
+
+    @property
+    def nbytes(self):
+        # Pikseller döşeme önbelleğinde tutulur, burada sadece eşlemeler var
+        return 0
+
+    @property
+    def frame(self):
+        """Tam çözünürlüklü görüntü (tüm döşemeler okunur, büyük görüntülerde pahalıdır)"""
+        return self.levels[0][:, :]
+
+    def level_for_scale(self, scale):
+        """scale oranında çizim için kullanılacak en küçük yeterli seviyeyi döndür"""
+        full_w = self.levels[0].width
+        for level in reversed(self.levels):
+            if level.width >= full_w * scale:
+                return level
+        return self.levels[0]
+
+    def get_tile(self, index, ty, tx):
+        """Bir döşemeyi önbellekten veya diskten döndür"""
+        key = (self.path, index, ty, tx)
+        if self.tile_cache is not None:
+            tile = self.tile_cache.get(key)
+            if tile is not None:
+                return tile
+
+        tile = np.array(self._arrays[index][ty, tx])
+        if self.tile_cache is not None:
+            self.tile_cache.put(key, tile)
+        return tile
+
+def open_tiled_image(path, tile_cache=None):
+    """Döşemeli görüntüyü aç, hata olursa None döndür"""
+    try:
+        return TiledImage(path, tile_cache)
+    except Exception as e:
+        print(f"Döşemeli görüntü açılamadı: {path} - {e}")
+        return None
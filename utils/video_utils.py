@@ -0,0 +1,720 @@
+import os
+import json
+import time
+import random
+from bisect import bisect_left
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import cv2
+import numpy as np
+
+from utils.frame_store import FrameStore, VideoFrameStore, read_video_frame, nearest_keyframe
+from utils.frame_writer import FrameWriterPool
+
+# Bu aralıktan büyük örneklemelerde seek ile çıkarma denenir
+SEEK_INTERVAL_THRESHOLD = 100
+
+# Videonun keyframe konumlarını ve zaman damgalarını tutan indeks dosyası
+KEYFRAME_INDEX_FILE = "keyframe_index.json"
+
+# Frame çıkarmadan etiketleme oturumunun kalıcı indeks dosyası
+VIDEO_INDEX_FILE = "video_frames.json"
+
+# Paralel çıkarmada segment başına en az frame sayısı (süreç açma maliyetini karşılamak için)
+MIN_FRAMES_PER_SEGMENT = 3000
+
+def get_video_info(video_path):
+    """Video dosyasının frame sayısı, fps ve boyut bilgilerini döndür"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"Video açılamadı: {video_path}")
+        return None
+
+    info = {
+        "frame_count": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        "fps": cap.get(cv2.CAP_PROP_FPS) or 0.0,
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    }
+    cap.release()
+    return info
+
+def _video_signature(video_path):
+    """Videonun değişip değişmediğini anlamak için boyut ve değiştirilme zamanı"""
+    stat = os.stat(video_path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+def build_keyframe_index(video_path):
+    """Videoyu bir kez tarayarak keyframe konumlarını ve zaman damgalarını çıkar
+
+    Ham paket modunda grab() frameleri çözmeden sadece paketleri okur, bu
+    yüzden tarama uzun videolarda bile hızlıdır. Paketler çözme sırasında
+    geldiği için keyframe konumları gösterim sırasındakinden büyük olamaz;
+    bu da o konumdan ileri okumayı her zaman güvenli kılar.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"Video açılamadı: {video_path}")
+        return None
+
+    index = {
+        "video_path": os.path.abspath(video_path),
+        "signature": _video_signature(video_path),
+        "frame_count": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        "fps": cap.get(cv2.CAP_PROP_FPS) or 0.0,
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "keyframes": None,
+        "timestamps": None
+    }
+
+    try:
+        if not cap.set(cv2.CAP_PROP_FORMAT, -1):
+            print("Video arka ucu ham paket okumayı desteklemiyor, keyframe indeksi oluşturulamadı.")
+            return index
+
+        keyframes = []
+        timestamps = []
+        while cap.grab():
+            if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                keyframes.append(len(timestamps))
+            timestamps.append(round(cap.get(cv2.CAP_PROP_POS_MSEC), 3))
+
+        if timestamps and keyframes and keyframes[0] == 0:
+            index["frame_count"] = len(timestamps)
+            index["keyframes"] = keyframes
+            index["timestamps"] = sorted(timestamps)
+        else:
+            print("Videoda keyframe bilgisi bulunamadı.")
+        return index
+    except Exception as e:
+        print(f"Keyframe indeksi oluşturulurken hata oluştu: {e}")
+        return index
+    finally:
+        cap.release()
+
+def load_keyframe_index(video_path, output_dir):
+    """output_dir'de kayıtlı ve video ile uyumlu keyframe indeksini döndür, yoksa None
+
+    İndeks oluşturmaz; video dosyasının boyutu veya değiştirilme zamanı
+    değişmişse kayıtlı indeks geçersiz sayılır.
+    """
+    index_path = os.path.join(output_dir, KEYFRAME_INDEX_FILE) if output_dir else None
+    if not index_path or not os.path.exists(index_path):
+        return None
+
+    try:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+        if (index.get("video_path") == os.path.abspath(video_path)
+                and index.get("signature") == _video_signature(video_path)):
+            return index
+    except Exception as e:
+        print(f"Keyframe indeksi yüklenemedi: {e}")
+    return None
+
+def get_keyframe_index(video_path, output_dir=None):
+    """Keyframe indeksini output_dir'den yükle, yoksa veya geçersizse oluşturup kaydet"""
+    index = load_keyframe_index(video_path, output_dir)
+    if index:
+        return index
+
+    index_path = os.path.join(output_dir, KEYFRAME_INDEX_FILE) if output_dir else None
+    index = build_keyframe_index(video_path)
+    if index and index_path:
+        try:
+            with open(index_path, "w") as f:
+                json.dump(index, f)
+        except Exception as e:
+            print(f"Keyframe indeksi kaydedilemedi: {e}")
+    return index
+
+def timestamp_to_frame(seconds, fps, timestamps=None):
+    """Saniyeyi frame numarasına çevir (zaman damgaları varsa değişken fps'e uygun)"""
+    if not timestamps:
+        return int(round(seconds * fps))
+
+    # Zaman damgası hedefe en yakın frame
+    pos = bisect_left(timestamps, seconds * 1000.0)
+    if pos > 0 and (pos == len(timestamps)
+                    or seconds * 1000.0 - timestamps[pos - 1] <= timestamps[pos] - seconds * 1000.0):
+        pos -= 1
+    return pos
+
+def parse_frame_spec(text, fps, timestamps=None):
+    """Virgülle ayrılmış frame numaralarını ve zaman damgalarını ayrıştır
+
+    "120" frame numarası, "12.5s" saniye, "1:02.5" dakika:saniye olarak yorumlanır.
+    timestamps (milisaniye) verilirse zamanlar bunlara göre frame'e çevrilir.
+    """
+    indices = []
+    for part in text.replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if ":" in part:
+                seconds = 0.0
+                for piece in part.split(":"):
+                    seconds = seconds * 60 + float(piece)
+                indices.append(timestamp_to_frame(seconds, fps, timestamps))
+            elif part.lower().endswith("s"):
+                indices.append(timestamp_to_frame(float(part[:-1]), fps, timestamps))
+            else:
+                indices.append(int(part))
+        except ValueError:
+            print(f"Frame tanımı ayrıştırılamadı: {part}")
+    return indices
+
+def select_frame_indices(frame_count, interval=None, indices=None, count=None,
+                         random_sample=False, seed=None):
+    """Çıkarılacak frame numaralarını sıralı ve tekrarsız olarak belirle
+
+    interval: her interval frame'de bir, indices: açık frame listesi,
+    count: eşit aralıklı (veya random_sample ise rastgele) count adet frame.
+    """
+    if frame_count <= 0:
+        return []
+
+    if indices is not None:
+        selected = [i for i in indices if 0 <= i < frame_count]
+    elif count:
+        count = min(count, frame_count)
+        if random_sample:
+            selected = random.Random(seed).sample(range(frame_count), count)
+        else:
+            selected = np.linspace(0, frame_count - 1, count).round().astype(int).tolist()
+    else:
+        selected = list(range(0, frame_count, max(1, interval or 1)))
+
+    return sorted(set(selected))
+
+def _frames_match(frame_a, frame_b):
+    """İki frame'in (küçük çözme farkları hariç) aynı olup olmadığını kontrol et"""
+    if frame_a is None or frame_b is None or frame_a.shape != frame_b.shape:
+        return False
+    return np.mean(cv2.absdiff(frame_a, frame_b)) < 1.0
+
+def _read_at(cap, frame_idx):
+    """Belirtilen frame'e atla ve oku"""
+    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+    return cap.read()
+
+def probe_seek(cap, targets, grab_samples=30):
+    """Seek'in bu kodek için doğru ve sıralı okumadan hızlı olup olmadığını ölç"""
+    probes = [t for t in targets if t > 0][:2]
+    if not probes:
+        return False
+
+    seek_times = []
+    for target in probes:
+        start = time.perf_counter()
+        ok, frame = _read_at(cap, target)
+        seek_times.append(time.perf_counter() - start)
+        if not ok:
+            return False
+
+        # Bir önceki frame'e atlayıp ileri okuyarak tutarlılığı doğrula
+        ok, _ = _read_at(cap, target - 1)
+        ok_next, next_frame = cap.read()
+        if not ok or not ok_next or not _frames_match(frame, next_frame):
+            print("Seek bu video için hatalı sonuç veriyor, sıralı okumaya geçiliyor.")
+            return False
+
+    # Sıralı ilerlemenin frame başına maliyetini ölç
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    start = time.perf_counter()
+    grabbed = 0
+    for _ in range(grab_samples):
+        if not cap.grab():
+            break
+        grabbed += 1
+    grab_cost = (time.perf_counter() - start) / max(1, grabbed)
+
+    # Hedefler arasındaki ortalama boşluk kadar grab, bir seek'ten pahalı mı?
+    gaps = np.diff([0] + list(targets))
+    avg_gap = float(np.mean(gaps)) if len(gaps) else 1.0
+    seek_cost = float(np.mean(seek_times))
+
+    return seek_cost < avg_gap * grab_cost
+
+def sample_frame_path(frames_dir, sample_no):
+    """Örnek numarasındaki frame'in dosya yolu
+
+    Tüm çıkarma yolları (seri, paralel, seyrek) aynı adlandırmayı kullanır:
+    aralıkla çıkarmada örnek numarası frame_no // interval, seyrek
+    çıkarmada hedef listesindeki sıradır.
+    """
+    return os.path.join(frames_dir, f"frame_{sample_no:06d}.jpg")
+
+def _is_cancelled(cancel_event):
+    """İptal istenip istenmediğini kontrol et"""
+    return cancel_event is not None and cancel_event.is_set()
+
+def _extract_by_seek(cap, frames_dir, targets, writer, progress_callback=None,
+                     cancel_event=None, keyframes=None):
+    """Her hedef frame'e doğrudan atlayarak çöz ve yazıcı havuzuna gönder
+
+    keyframes verilirse hedefe en yakın keyframe'den itibaren çözülür.
+    """
+    next_pos = None
+    for i, target in enumerate(targets):
+        if _is_cancelled(cancel_event):
+            print("Frame çıkarma iptal edildi.")
+            break
+
+        decode_start = time.perf_counter()
+        if keyframes:
+            frame, next_pos = read_video_frame(cap, target, next_pos, keyframes=keyframes)
+            ok = frame is not None
+        else:
+            ok, frame = _read_at(cap, target)
+        writer.add_decode_time(time.perf_counter() - decode_start)
+
+        if not ok:
+            print(f"Frame okunamadı: {target}")
+        else:
+            writer.submit(frame, sample_frame_path(frames_dir, i), i)
+
+        if progress_callback:
+            progress_callback(i + 1, len(targets))
+
+def _extract_sequential(cap, frames_dir, targets, writer, progress_callback=None,
+                        cancel_event=None):
+    """Videoyu baştan okuyarak sadece hedef frameleri çöz ve yazıcı havuzuna gönder"""
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    target_index = {target: i for i, target in enumerate(targets)}
+    last_target = targets[-1]
+    frame_count = 0
+    processed = 0
+
+    while frame_count <= last_target:
+        if _is_cancelled(cancel_event):
+            print("Frame çıkarma iptal edildi.")
+            break
+
+        decode_start = time.perf_counter()
+        if not cap.grab():
+            break
+
+        if frame_count in target_index:
+            ret, frame = cap.retrieve()
+            if ret:
+                writer.submit(frame, sample_frame_path(frames_dir, target_index[frame_count]),
+                              target_index[frame_count])
+            processed += 1
+            if progress_callback:
+                progress_callback(processed, len(targets))
+        writer.add_decode_time(time.perf_counter() - decode_start)
+
+        frame_count += 1
+
+def extract_frames_sparse(video_path, output_dir, interval=None, frame_indices=None,
+                          count=None, random_sample=False, seed=None, use_seek=None,
+                          progress_callback=None, frame_callback=None, cancel_event=None):
+    """Seyrek frame çıkarma: hedef konumlara seek ile atlayarak çıkar
+
+    Seek'in hatalı veya sıralı okumadan yavaş olduğu videolarda otomatik olarak
+    sıralı okumaya geri döner. use_seek ile bu karar zorlanabilir. Seek
+    yapılırken output_dir'deki keyframe indeksi kullanılır (yoksa oluşturulur).
+    """
+    frames = FrameStore()
+
+    if not video_path or not output_dir:
+        print("Video yolu veya çıktı klasörü belirtilmemiş.")
+        return frames
+
+    try:
+        frames_dir = os.path.join(output_dir, "frames")
+        os.makedirs(frames_dir, exist_ok=True)
+
+        index = get_keyframe_index(video_path, output_dir)
+        if not index:
+            return frames
+
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            print(f"Video açılamadı: {video_path}")
+            return frames
+
+        targets = select_frame_indices(index["frame_count"], interval, frame_indices, count,
+                                       random_sample, seed)
+        if not targets:
+            print("Çıkarılacak frame bulunamadı.")
+            cap.release()
+            return frames
+
+        if use_seek is None:
+            use_seek = probe_seek(cap, targets)
+
+        # Çözme bu iş parçacığında, JPEG kodlama ve yazma havuzda yapılır
+        writer = FrameWriterPool(on_written=frame_callback)
+        try:
+            if use_seek:
+                _extract_by_seek(cap, frames_dir, targets, writer, progress_callback,
+                                 cancel_event, index["keyframes"])
+            else:
+                _extract_sequential(cap, frames_dir, targets, writer, progress_callback,
+                                    cancel_event)
+        finally:
+            cap.release()
+            written = writer.close()
+
+        for frame_path, size in written:
+            frames.append(frame_path, size)
+
+        if not frames:
+            print("Hiç frame çıkarılamadı.")
+        else:
+            mode = "seek" if use_seek else "sıralı"
+            print(f"{len(frames)} frame çıkarıldı ({mode} okuma).")
+            print(writer.format_stats())
+
+        return frames
+    except Exception as e:
+        print(f"Frame çıkarma işlemi sırasında hata oluştu: {e}")
+        return frames
+
+def save_video_index(output_dir, video_path, frame_numbers, video_info, use_seek):
+    """Sanal frame listesini ve seek bilgisini çıktı klasörüne kaydet"""
+    index = {
+        "video_path": os.path.abspath(video_path),
+        "signature": _video_signature(video_path),
+        "frame_count": video_info["frame_count"],
+        "fps": video_info["fps"],
+        "frame_size": [video_info["height"], video_info["width"]],
+        "use_seek": use_seek,
+        "frame_numbers": list(frame_numbers)
+    }
+    try:
+        with open(os.path.join(output_dir, VIDEO_INDEX_FILE), "w") as f:
+            json.dump(index, f)
+        return True
+    except Exception as e:
+        print(f"Video indeksi kaydedilemedi: {e}")
+        return False
+
+def load_video_index(output_dir):
+    """Video indeksini yükle; video bulunamaz veya değişmişse None döndür"""
+    index_path = os.path.join(output_dir, VIDEO_INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+
+    try:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+
+        video_path = index["video_path"]
+        if not os.path.exists(video_path):
+            print(f"İndeksteki video bulunamadı: {video_path}")
+            return None
+        if _video_signature(video_path) != index.get("signature"):
+            print(f"Video indeks oluşturulduktan sonra değişmiş: {video_path}")
+            return None
+        return index
+    except Exception as e:
+        print(f"Video indeksi yüklenemedi: {e}")
+        return None
+
+def remove_video_index(output_dir):
+    """Frameler diske çıkarıldığında video indeksini kaldır"""
+    if not output_dir:
+        return
+    index_path = os.path.join(output_dir, VIDEO_INDEX_FILE)
+    try:
+        if os.path.exists(index_path):
+            os.remove(index_path)
+    except Exception as e:
+        print(f"Video indeksi silinemedi: {e}")
+
+def open_video_frames(video_path, output_dir, interval=30, frame_indices=None, count=None,
+                      random_sample=False, seed=None, use_seek=None):
+    """Frameleri diske yazmadan videodan doğrudan etiketleme için depo oluştur
+
+    Seçilen frame numaraları ve seek'in güvenilirliği output_dir'deki
+    indeks dosyasına kaydedilir, böylece oturuma devam ederken yeniden
+    hesaplanmaz.
+    """
+    video_info = get_keyframe_index(video_path, output_dir)
+    if not video_info:
+        return None
+
+    targets = select_frame_indices(video_info["frame_count"], interval, frame_indices, count,
+                                   random_sample, seed)
+    if not targets:
+        print("Etiketlenecek frame bulunamadı.")
+        return None
+
+    if use_seek is None:
+        cap = cv2.VideoCapture(video_path)
+        use_seek = probe_seek(cap, targets)
+        cap.release()
+
+    save_video_index(output_dir, video_path, targets, video_info, use_seek)
+    print(f"{len(targets)} frame videodan doğrudan açıldı ({'seek' if use_seek else 'sıralı'} okuma).")
+    return VideoFrameStore(video_path, targets, os.path.join(output_dir, "frames"),
+                           (video_info["height"], video_info["width"]), use_seek,
+                           video_info["keyframes"])
+
+def load_video_frames(output_dir):
+    """Kayıtlı video indeksinden depoyu yeniden oluştur (indeks yoksa None)"""
+    index = load_video_index(output_dir)
+    if not index:
+        return None
+
+    keyframe_index = get_keyframe_index(index["video_path"], output_dir) or {}
+    return VideoFrameStore(index["video_path"], index["frame_numbers"],
+                           os.path.join(output_dir, "frames"), index["frame_size"],
+                           index.get("use_seek", True), keyframe_index.get("keyframes"))
+
+def _init_segment_worker():
+    """Alt süreç başlangıcı: süreç başına tek OpenCV iş parçacığı kullan"""
+    # Çekirdekler zaten süreçlerle paylaşılıyor
+    cv2.setNumThreads(1)
+
+def _extract_segment(video_path, frames_dir, start, end, interval, cancel_event=None,
+                     frame_callback=None, progress_callback=None, total_frames=0,
+                     seek_from=None, writer_workers=None):
+    """[start, end) aralığındaki örnek frameleri çıkar
+
+    end None ise video sonuna kadar okunur. Dosya adları seri çıkarma ile aynı
+    numaralandırmayı kullanır (frame_no // interval). seek_from verilirse
+    (start'tan önceki keyframe) oraya atlanıp segment başına grab ile gelinir;
+    verilmezse doğrudan start'a seek yapılır (arka uç en yakın keyframe'den
+    çözer).
+    JPEG kodlama ve yazma writer_workers iş parçacıklı FrameWriterPool'da
+    yapılır. Geri çağırmalar sadece süreç içi çalıştırmada kullanılır.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"Video açılamadı: {video_path}")
+        return []
+
+    # Çözme bu iş parçacığında, kodlama ve yazma havuzda yapılır
+    writer = FrameWriterPool(workers=writer_workers, on_written=frame_callback)
+    frame_numbers = {}
+    try:
+        if start > 0:
+            seek_to = start if seek_from is None else seek_from
+            cap.set(cv2.CAP_PROP_POS_FRAMES, seek_to)
+            # Seek konumu doğru değilse baştan ilerleyerek segment başına gel
+            if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != seek_to:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                seek_to = 0
+            for _ in range(start - seek_to):
+                if not cap.grab():
+                    return []
+
+        frame_no = start
+        while end is None or frame_no < end:
+            if _is_cancelled(cancel_event):
+                break
+
+            if not cap.grab():
+                break
+
+            if frame_no % interval == 0:
+                ret, frame = cap.retrieve()
+                if ret:
+                    frame_path = sample_frame_path(frames_dir, frame_no // interval)
+                    frame_numbers[frame_path] = frame_no
+                    writer.submit(frame, frame_path, frame_no)
+
+            frame_no += 1
+
+            if progress_callback and frame_no % 25 == 0:
+                progress_callback(frame_no, total_frames)
+    finally:
+        cap.release()
+        written = writer.close()
+
+    return [(frame_numbers[frame_path], frame_path, size) for frame_path, size in written]
+
+def split_segments(frame_count, interval, segment_count):
+    """Frame aralığını interval katlarına hizalı segmentlere böl
+
+    Son segmentin sonu None'dır; böylece frame sayısı yanlış raporlansa bile
+    video sonuna kadar okunur.
+    """
+    sample_count = (frame_count + interval - 1) // interval
+    segment_count = max(1, min(segment_count, frame_count // MIN_FRAMES_PER_SEGMENT, sample_count))
+    samples_per_segment = (sample_count + segment_count - 1) // segment_count
+
+    segments = []
+    start = 0
+    for i in range(segment_count):
+        end = None if i == segment_count - 1 else start + samples_per_segment * interval
+        segments.append((start, end))
+        if end is None:
+            break
+        start = end
+    return segments
+
+def extract_frames_parallel(video_path, output_dir, interval=30, workers=None,
+                            progress_callback=None, frame_callback=None, cancel_event=None):
+    """Videoyu segmentlere bölüp her segmenti ayrı bir süreçte çıkar
+
+    Her süreç kendi VideoCapture nesnesini açar. Çıktı dosya adları ve sıralaması
+    seri extract_frames_from_video ile aynıdır. Segmentler başlıktaki frame
+    sayısına göre bölünür; keyframe indeksi sadece kayıtlıysa kullanılır, seri
+    bir ön tarama yapılmaz. Frameler segment sırasıyla
+    frame_callback ile bildirilir; cancel_event tüm süreçleri durdurur. İptal
+    veya hata durumunda kesintiden sonraki segmentlerin yazdığı dosyalar
+    silinir, böylece frames/ klasöründe sadece bildirilen frameler kalır.
+    """
+    frames = FrameStore()
+
+    if not video_path or not output_dir:
+        print("Video yolu veya çıktı klasörü belirtilmemiş.")
+        return frames
+
+    frames_dir = os.path.join(output_dir, "frames")
+    os.makedirs(frames_dir, exist_ok=True)
+
+    # Keyframe indeksi oluşturmak videonun seri taranmasını gerektirir; sadece
+    # kayıtlıysa kullanılır, yoksa her süreç segment başına kendisi seek yapar
+    info = load_keyframe_index(video_path, output_dir) or get_video_info(video_path)
+    if not info:
+        return frames
+
+    workers = workers or os.cpu_count() or 1
+    total_frames = info["frame_count"]
+
+    # Yük dengesi için süreç sayısından fazla segment oluştur
+    segments = split_segments(total_frames, interval, workers * 2)
+
+    try:
+        if len(segments) == 1 or workers == 1:
+            results = _extract_segment(video_path, frames_dir, 0, None, interval, cancel_event,
+                                       frame_callback, progress_callback, total_frames)
+        else:
+            results = _run_segments(video_path, frames_dir, interval, segments, workers,
+                                    total_frames, progress_callback, frame_callback,
+                                    cancel_event, info.get("keyframes"))
+    except Exception as e:
+        print(f"Paralel frame çıkarma sırasında hata oluştu: {e}")
+        return frames
+
+    if progress_callback:
+        progress_callback(total_frames, total_frames)
+
+    for _, frame_path, size in sorted(results):
+        frames.append(frame_path, size)
+
+    if not frames:
+        print("Hiç frame çıkarılamadı.")
+    else:
+        print(f"{len(frames)} frame çıkarıldı ({len(segments)} segment, {workers} süreç).")
+
+    return frames
+
+def _run_segments(video_path, frames_dir, interval, segments, workers, total_frames,
+                  progress_callback, frame_callback, cancel_event, keyframes=None):
+    """Segmentleri süreç havuzunda çalıştır, sonuçları segment sırasıyla topla"""
+    # Fork yerine spawn: ana süreçteki iş parçacıkları alt süreçlere taşınmaz
+    context = multiprocessing.get_context("spawn")
+
+    # İptal bayrağı alt süreçlere ancak yönetici üzerinden taşınabilir
+    manager = context.Manager() if cancel_event is not None else None
+    shared_cancel = manager.Event() if manager else None
+
+    # Frameler dosya adı sırasıyla kullanıldığı için çıktı kesintisiz olmalı:
+    # yarım kalan (iptal) veya hata veren segmentten sonraki segmentler atılır
+    results = []
+    discarded = []
+    truncated = False
+    processed = 0
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(segments)), mp_context=context,
+                                 initializer=_init_segment_worker) as executor:
+            # Çekirdekler süreçlere dağıtıldığı için süreç başına az sayıda yazıcı yeterli
+            writer_workers = max(1, (os.cpu_count() or 1) // workers)
+            futures = [executor.submit(_extract_segment, video_path, frames_dir,
+                                       start, end, interval, shared_cancel,
+                                       seek_from=nearest_keyframe(keyframes, start) if keyframes else None,
+                                       writer_workers=writer_workers)
+                       for start, end in segments]
+
+            for (start, end), future in zip(segments, futures):
+                # Sonucu beklerken iptal isteğini alt süreçlere ilet
+                while True:
+                    try:
+                        segment_results = future.result(timeout=0.2)
+                        break
+                    except FutureTimeoutError:
+                        if _is_cancelled(cancel_event) and not shared_cancel.is_set():
+                            print("Frame çıkarma iptal edildi.")
+                            shared_cancel.set()
+                            for pending in futures:
+                                pending.cancel()
+                    except CancelledError:
+                        segment_results = []
+                        break
+                    except Exception as e:
+                        print(f"Segment çıkarılamadı ({start}-{end}): {e}")
+                        segment_results = None
+                        break
+
+                if truncated or segment_results is None:
+                    discarded.append((start, end))
+                    if not truncated:
+                        # Sonraki segmentlerin çıktısı zaten atılacak, süreçleri durdur
+                        truncated = True
+                        if shared_cancel is not None:
+                            shared_cancel.set()
+                        for pending in futures:
+                            pending.cancel()
+                    continue
+
+                results.extend(segment_results)
+                if frame_callback:
+                    for _, frame_path, size in segment_results:
+                        frame_callback(frame_path, size)
+
+                # İptal edilen segmentin yazılan başı korunur, sonrakiler atılır
+                expected = None if end is None else (end - start) // interval
+                if _is_cancelled(cancel_event) and (expected is None or len(segment_results) < expected):
+                    truncated = True
+
+                processed = total_frames if end is None else end
+                if progress_callback:
+                    progress_callback(processed, total_frames)
+    finally:
+        if manager:
+            manager.shutdown()
+
+    removed = _remove_segment_frames(frames_dir, interval, discarded)
+    if removed:
+        print(f"Atılan segmentlerin {removed} frame dosyası silindi.")
+
+    return results
+
+def _remove_segment_frames(frames_dir, interval, segments):
+    """Atılan [start, end) segmentlerinin diske yazılmış frame dosyalarını sil"""
+    if not segments:
+        return 0
+
+    ranges = [(start // interval, None if end is None else end // interval) for start, end in segments]
+    removed = 0
+    try:
+        entries = list(os.scandir(frames_dir))
+    except OSError as e:
+        print(f"Frames klasörü okunamadı: {e}")
+        return 0
+
+    for entry in entries:
+        name = entry.name
+        if not (name.startswith("frame_") and name.endswith(".jpg")):
+            continue
+        try:
+            number = int(name[len("frame_"):-len(".jpg")])
+        except ValueError:
+            continue
+        if any(number >= first and (last is None or number < last) for first, last in ranges):
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError as e:
+                print(f"Frame dosyası silinemedi: {entry.path} - {e}")
+    return removed